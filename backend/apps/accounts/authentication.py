@@ -0,0 +1,37 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from .constants import AccountsMessages
+from .tokens import (
+    IS_ACTIVE_CLAIM,
+    TOKEN_VERSION_CLAIM,
+    USER_CLAIMS,
+    claims_user,
+    get_token_version,
+)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without a user query per request: request.user is
+    built from the role and status claimed by the access token.
+
+    Revoked tokens are refused by comparing their version claim with the
+    user's token version, read from the cache. Tokens issued without the
+    claims load the user from the database as before.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        user = claims_user(validated_token)
+        if not validated_token[IS_ACTIVE_CLAIM]:
+            raise AuthenticationFailed(AccountsMessages.INACTIVE, code="user_inactive")
+
+        if validated_token[TOKEN_VERSION_CLAIM] != get_token_version(user.pk):
+            raise AuthenticationFailed(
+                AccountsMessages.TOKEN_REVOKED, code="token_revoked"
+            )
+
+        return user
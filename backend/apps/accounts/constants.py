@@ -12,6 +12,8 @@ class PasswordMessasges:
 class AccountsMessages:
     DEACTIVATED = "Account deactivated successfully."
     ALREADY_INACTIVE = "Account is already inactive."
+    INACTIVE = "User is inactive."
+    TOKEN_REVOKED = "Token has been revoked, log in again."
 
 
 # Email
@@ -7,6 +7,8 @@ from apps.common.choices import UserRole
 class User(AbstractUser):
     email = models.EmailField(unique=True, blank=False, null=False)
     role = models.CharField(max_length=10, choices=UserRole)
+    # Claimed by the user's tokens, bumped to revoke them all
+    token_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.username
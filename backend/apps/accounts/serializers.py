@@ -8,11 +8,19 @@ from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 
 from .constants import (
     PASSWORD_RESET_SUBJECT,
+    AccountsMessages,
     PasswordMessasges,
 )
+from .tokens import TOKEN_VERSION_CLAIM, add_user_claims, revoke_tokens
 
 User = get_user_model()
 
@@ -136,6 +144,8 @@ class ChangePasswordSerializer(serializers.Serializer):
         # At this point, Pylane understands self.validated_data is a dict.
         user.set_password(self.validated_data["new_password1"])
         user.save()
+        # Tokens issued with the old password stop working
+        revoke_tokens(user)
         return user
 
 
@@ -258,4 +268,40 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         user = self.context["user"]
         user.set_password(self.validated_data["new_password1"])
         user.save()
+        # Tokens issued with the old password stop working
+        revoke_tokens(user)
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login issuing tokens that claim the user's role, status and token
+    version, read by ClaimsJWTAuthentication.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh refusing revoked refresh tokens. The new access token claims the
+    user's current role and status, read here from the database.
+    Refresh tokens are not rotated (ROTATE_REFRESH_TOKENS is off).
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        # Tokens issued before the claims existed have version 0
+        if refresh.get(TOKEN_VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(AccountsMessages.TOKEN_REVOKED, "token_revoked")
+
+        return {"access": str(add_user_claims(refresh.access_token, user))}
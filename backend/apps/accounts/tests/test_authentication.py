@@ -0,0 +1,221 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.accounts.constants import AccountsMessages
+from apps.accounts.tests.test_simplejwt import (
+    CHANGE_PASSWORD_URL,
+    LOGIN_URL,
+    REFRESH_TOKEN_URL,
+    USER_PROFILE_URL,
+)
+from apps.accounts.tokens import add_user_claims, claims_user, token_version_key
+from apps.common.choices import UserRole
+
+DEACTIVATE_URL = reverse_lazy("accounts:deactivate_account")
+MY_BOOKINGS_URL = reverse_lazy("bookings:my-bookings")
+PASSWORD = "TestPassword123!"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def attendee(attendee_factory):
+    user = attendee_factory()
+    user.set_password(PASSWORD)
+    user.save()
+    return user
+
+
+def login(client, user, password=PASSWORD):
+    response = client.post(
+        LOGIN_URL, {"username": user.username, "password": password}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def bearer(client, access):
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return client
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries if "accounts_user" in query["sql"]
+    ]
+
+
+def test_tokens_claim_role_status_and_version(api_client, attendee):
+    tokens = login(api_client, attendee)
+
+    for token in (AccessToken(tokens["access"]), RefreshToken(tokens["refresh"])):
+        assert token["role"] == UserRole.ATTENDEE
+        assert token["is_active"] is True
+        assert token["ver"] == 0
+
+
+def test_request_user_comes_from_claims(api_client, attendee):
+    bearer(api_client, login(api_client, attendee)["access"])
+    # Token version cached by a previous request
+    api_client.get(MY_BOOKINGS_URL)
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(MY_BOOKINGS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert user_queries(context) == []
+
+
+def test_claims_user_loads_other_fields_on_access(attendee):
+    user = claims_user(add_user_claims(AccessToken.for_user(attendee), attendee))
+    assert user == attendee
+    assert user.get_deferred_fields() >= {"username", "email", "password"}
+    assert user.username == attendee.username
+
+
+def test_token_without_claims_loads_user(api_client, attendee):
+    bearer(api_client, AccessToken.for_user(attendee))
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(MY_BOOKINGS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(user_queries(context)) == 1
+
+
+def test_role_claim_is_checked(api_client, organizer_factory):
+    organizer = organizer_factory()
+    organizer.set_password(PASSWORD)
+    organizer.save()
+    bearer(api_client, login(api_client, organizer)["access"])
+
+    response = api_client.get(MY_BOOKINGS_URL)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_profile_loads_the_whole_user(api_client, attendee):
+    bearer(api_client, login(api_client, attendee)["access"])
+
+    response = api_client.get(USER_PROFILE_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["email"] == attendee.email
+
+
+@pytest.mark.parametrize(
+    "method, url, data",
+    [
+        ("patch", USER_PROFILE_URL, {"email": "new@example.com"}),
+        (
+            "post",
+            CHANGE_PASSWORD_URL,
+            {
+                "old_password": PASSWORD,
+                "new_password1": "NewPassword456!",
+                "new_password2": "NewPassword456!",
+            },
+        ),
+    ],
+)
+def test_saving_the_user_keeps_changes_since_the_token(
+    api_client, attendee, method, url, data
+):
+    """
+    The role and status claims of the access token aren't written back.
+    """
+    bearer(api_client, login(api_client, attendee)["access"])
+    attendee.role = UserRole.ORGANIZER
+    attendee.save(update_fields=["role"])
+
+    response = getattr(api_client, method)(url, data, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    attendee.refresh_from_db()
+    assert attendee.role == UserRole.ORGANIZER
+
+
+def test_deactivation_revokes_every_token(
+    api_client, api_client_factory, attendee, django_capture_on_commit_callbacks
+):
+    other = login(api_client_factory(), attendee)
+    bearer(api_client, login(api_client, attendee)["access"])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(DEACTIVATE_URL)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert cache.get(token_version_key(attendee.pk)) == 1
+
+    response = bearer(api_client_factory(), other["access"]).get(MY_BOOKINGS_URL)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data["detail"] == AccountsMessages.TOKEN_REVOKED
+
+    response = api_client_factory().post(
+        REFRESH_TOKEN_URL, {"refresh": other["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_password_change_revokes_tokens(api_client, api_client_factory, attendee):
+    old = login(api_client, attendee)
+    bearer(api_client, old["access"])
+
+    response = api_client.post(
+        CHANGE_PASSWORD_URL,
+        {
+            "old_password": PASSWORD,
+            "new_password1": "NewPassword456!",
+            "new_password2": "NewPassword456!",
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = api_client.get(MY_BOOKINGS_URL)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = api_client_factory().post(
+        REFRESH_TOKEN_URL, {"refresh": old["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data["detail"] == AccountsMessages.TOKEN_REVOKED
+
+    new = login(api_client_factory(), attendee, "NewPassword456!")
+    response = bearer(api_client_factory(), new["access"]).get(MY_BOOKINGS_URL)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_refresh_claims_current_role(api_client, attendee):
+    tokens = login(api_client, attendee)
+    attendee.role = UserRole.ORGANIZER
+    attendee.save()
+
+    response = api_client.post(
+        REFRESH_TOKEN_URL, {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert AccessToken(response.data["access"])["role"] == UserRole.ORGANIZER
+
+
+def test_refresh_of_deleted_user(api_client, attendee):
+    tokens = login(api_client, attendee)
+    attendee.delete()
+
+    response = api_client.post(
+        REFRESH_TOKEN_URL, {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_claims_user_owns_its_events(api_client, organizer_factory, event_factory):
+    organizer = organizer_factory()
+    organizer.set_password(PASSWORD)
+    organizer.save()
+    event = event_factory(organizer=organizer)
+    bearer(api_client, login(api_client, organizer)["access"])
+
+    response = api_client.get(reverse("events:event-stats", kwargs={"pk": event.id}))
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import F
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Claims added to the user id in every token, see claims_user()
+ROLE_CLAIM = "role"
+IS_ACTIVE_CLAIM = "is_active"
+TOKEN_VERSION_CLAIM = "ver"
+USER_CLAIMS = (ROLE_CLAIM, IS_ACTIVE_CLAIM, TOKEN_VERSION_CLAIM)
+
+
+def token_version_key(user_id):
+    return f"accounts:{user_id}:token_version"
+
+
+def add_user_claims(token, user):
+    """
+    Claim the user's role, status and token version in token, and in the
+    access tokens made from it.
+    """
+    token[ROLE_CLAIM] = user.role
+    token[IS_ACTIVE_CLAIM] = user.is_active
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def claims_user(token):
+    """
+    User of a token built from its claims, without a query. Its other fields
+    are deferred: reading one loads it from the database.
+    """
+    # The id claim is a string
+    id_field = User._meta.get_field(api_settings.USER_ID_FIELD)
+    claims = {
+        id_field.attname: id_field.to_python(token[api_settings.USER_ID_CLAIM]),
+        "role": token[ROLE_CLAIM],
+        "is_active": token[IS_ACTIVE_CLAIM],
+    }
+    # from_db() takes the loaded values in field order
+    field_names = [
+        field.attname for field in User._meta.concrete_fields if field.attname in claims
+    ]
+    return User.from_db(
+        router.db_for_read(User), field_names, [claims[name] for name in field_names]
+    )
+
+
+def load_user(user):
+    """
+    Reload every field of a claims user, for views reading or saving the
+    whole row. The role and status claims can be an access token lifetime
+    old, saving them would undo a later change.
+    """
+    user.refresh_from_db()
+    return user
+
+
+def get_token_version(user_id):
+    """
+    Current token version of a user, from the cache or else the database.
+    None when the user doesn't exist.
+    """
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            # add() so a read racing a revocation can't overwrite its version
+            cache.add(key, version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def revoke_tokens(user):
+    """
+    Revoke every token issued to user so far, by bumping its token version.
+    The cached version is dropped now, so reads fall back to the database,
+    and set to the new one once the transaction commits.
+    """
+    User.objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+    user.refresh_from_db(fields=["token_version"])
+
+    key = token_version_key(user.pk)
+    version = user.token_version
+    cache.delete(key)
+    transaction.on_commit(
+        lambda: cache.set(key, version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    )
@@ -15,6 +15,7 @@ from .serializers import (
     RegisterSerializer,
     UserSerializer,
 )
+from .tokens import load_user, revoke_tokens
 
 User = get_user_model()
 
@@ -39,7 +40,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         """
         Returns the authenticated user instance.
         """
-        return self.request.user
+        return load_user(self.request.user)
 
 
 class ChangePasswordView(APIView):
@@ -52,6 +53,8 @@ class ChangePasswordView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        # Checking and setting the password needs the whole user row
+        load_user(request.user)
         serializer = ChangePasswordSerializer(
             data=request.data, context={"request": request}
         )
@@ -123,7 +126,7 @@ class UserDeactivateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def delete(self, request, *args, **kwargs):
-        user = request.user
+        user = load_user(request.user)
         if not user.is_active:
             return Response(
                 {"detail": AccountsMessages.ALREADY_INACTIVE},
@@ -131,6 +134,8 @@ class UserDeactivateView(APIView):
             )
         user.is_active = False
         user.save()
+        # Its access tokens are refused from the next request
+        revoke_tokens(user)
 
         return Response(
             {"detail": AccountsMessages.DEACTIVATED},
@@ -0,0 +1,188 @@
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking, BookingItem, IdempotencyKey
+from apps.bookings.reservations import claim_event_capacity, update_ticket_counts
+from apps.common.choices import BookingStatus
+from apps.events.models import Event, TicketType, TicketTypeShard
+from apps.events.rollups import record_booked
+from apps.events.sharding import claim_shard_stock
+
+
+class StockChanged(Exception):
+    """
+    Stock was taken outside the batch between loading and writing it.
+    """
+
+
+@dataclass
+class BookingRequest:
+    user: object
+    items: list
+    idempotency_key: dict | None = None
+    future: Future = field(default_factory=Future)
+
+
+class BookingBatch:
+    """
+    Many booking requests for one event, decided in order against stock
+    loaded once and written with bulk INSERTs.
+
+    The stock UPDATEs stay guarded, so concurrent writers in other processes
+    and other reservation engines can't oversell either.
+
+    Bookings are written with status: pending holds by default, confirmed
+    for orders that have no one to confirm them (bulk box office orders).
+    """
+
+    def __init__(self, event_id, status=BookingStatus.PENDING):
+        self.event_id = event_id
+        self.status = status
+
+    def load_stock(self, lock):
+        """
+        Return the event, its ticket types by id and the stock of each.
+        Sharded ticket types count the stock left in their shards.
+        """
+        events = Event.objects.with_tickets_sold().filter(pk=self.event_id)
+        ticket_types = TicketType.objects.filter(event_id=self.event_id).order_by("pk")
+        shards = TicketTypeShard.objects.filter(
+            ticket_type__event_id=self.event_id
+        ).order_by("ticket_type_id", "index")
+        if lock:
+            # Same lock order as the other engines: event, then ticket types
+            events = events.select_for_update()
+            ticket_types = ticket_types.select_for_update()
+            shards = shards.select_for_update(of=("self",))
+
+        event = events.get()
+        ticket_map = {tt.pk: tt for tt in ticket_types}
+        stock = {tt.pk: tt.quantity_available for tt in ticket_map.values()}
+        for shard in shards:
+            stock[shard.ticket_type_id] += shard.quantity_available
+        return event, ticket_map, stock
+
+    def write(self, batch, lock):
+        """
+        Decide the requests in order and write the accepted ones.
+        Must be called inside transaction.atomic().
+        Return the booking or the ValidationError of each request.
+        """
+        event, ticket_map, stock = self.load_stock(lock)
+        remaining = event.tickets_remaining
+
+        results, accepted = [], []
+        for request in batch:
+            try:
+                remaining = self.reserve(request.items, ticket_map, stock, remaining)
+            except serializers.ValidationError as exc:
+                results.append(exc)
+            else:
+                booking = self.build_booking(request, event, ticket_map)
+                results.append(booking)
+                accepted.append((booking, request))
+
+        if accepted:
+            self.take_stock(event, accepted, ticket_map)
+            self.write_bookings(accepted, ticket_map)
+
+        return results
+
+    def reserve(self, items, ticket_map, stock, remaining):
+        """
+        Take a request's tickets from the in-memory stock.
+        Return the event capacity left after it.
+        """
+        # Event capacity first, like the other engines
+        total_requested = sum(item["quantity"] for item in items)
+        if total_requested > remaining:
+            raise serializers.ValidationError(BookingMessages.QUANTITY_EXCEED_CAPACITY)
+
+        for item in items:
+            tt = ticket_map[item["ticket_type_id"]]
+            if stock[tt.pk] < item["quantity"]:
+                raise serializers.ValidationError(f"Not enough tickets for: {tt.name}.")
+            elif not tt.is_active:
+                raise serializers.ValidationError(BookingMessages.INACTIVE_TICKET_TYPE)
+
+        for item in items:
+            stock[item["ticket_type_id"]] -= item["quantity"]
+        return remaining - total_requested
+
+    def build_booking(self, request, event, ticket_map):
+        return Booking(
+            user=request.user,
+            event=event,
+            status=self.status,
+            expires_at=(
+                timezone.now() + settings.BOOKING_HOLD_DURATION
+                if self.status == BookingStatus.PENDING
+                else None
+            ),
+            total_price=sum(
+                item["quantity"] * ticket_map[item["ticket_type_id"]].price
+                for item in request.items
+            ),
+        )
+
+    def take_stock(self, event, accepted, ticket_map):
+        """
+        Take the stock of the whole batch with one guarded UPDATE per table.
+        """
+        totals = Counter()
+        for _, request in accepted:
+            for item in request.items:
+                totals[item["ticket_type_id"]] += item["quantity"]
+
+        try:
+            claim_event_capacity(event, sum(totals.values()))
+        except serializers.ValidationError as exc:
+            raise StockChanged from exc
+
+        plain = [
+            {"ticket_type_id": pk, "quantity": quantity}
+            for pk, quantity in totals.items()
+            if not ticket_map[pk].shard_count
+        ]
+        if plain:
+            enough_stock = Q()
+            for item in plain:
+                enough_stock |= Q(
+                    pk=item["ticket_type_id"], quantity_available__gte=item["quantity"]
+                )
+            updated = update_ticket_counts(plain, enough_stock, Q(is_active=True))
+            if updated != len(plain):
+                raise StockChanged
+
+        for pk, quantity in totals.items():
+            if ticket_map[pk].shard_count:
+                if not claim_shard_stock(ticket_map[pk], quantity):
+                    raise StockChanged
+
+    def write_bookings(self, accepted, ticket_map):
+        bookings = Booking.objects.bulk_create(booking for booking, _ in accepted)
+        booking_items = BookingItem.objects.bulk_create(
+            BookingItem(
+                booking=booking,
+                ticket_type=ticket_map[item["ticket_type_id"]],
+                quantity=item["quantity"],
+                price_at_booking=ticket_map[item["ticket_type_id"]].price,
+            )
+            for booking, (_, request) in zip(bookings, accepted, strict=True)
+            for item in request.items
+        )
+        record_booked(booking_items)
+        IdempotencyKey.objects.bulk_create(
+            IdempotencyKey(
+                user=request.user, booking=booking, **request.idempotency_key
+            )
+            for booking, (_, request) in zip(bookings, accepted, strict=True)
+            if request.idempotency_key
+        )
@@ -1,5 +1,16 @@
 class BookingMessages:
     INVALID_TICKET_TYPE = "One or more ticket types are invalid."
+    INVALID_EVENT = "Event does not exist."
     INVALID_BOOK_FOR_EVENTS = "All ticket types must belong to the same event."
     QUANTITY_EXCEED_CAPACITY = "Booking exceeds event capacity or ticket availability."
     INACTIVE_TICKET_TYPE = "The ticket type is not available."
+    HOLD_NOT_CONFIRMABLE = "Booking is not pending or its hold has expired."
+    QUEUE_TOKEN_REQUIRED = "This event has a waiting room. Join the queue first."
+    INVALID_QUEUE_TOKEN = "Invalid or expired queue token."
+    QUEUE_TOKEN_USED = "The queue token was already used. Join the queue again."
+    QUEUE_NOT_ADMITTED = "You are still in the queue."
+    WAITING_ROOM_DISABLED = "This event has no waiting room."
+    IDEMPOTENCY_KEY_REUSED = (
+        "Idempotency-Key was already used with a different request."
+    )
+    IDEMPOTENCY_KEY_TOO_LONG = "Idempotency-Key must be at most 255 characters."
@@ -0,0 +1,80 @@
+from itertools import batched
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from apps.bookings.models import BookingItem
+
+# Export column -> BookingItem lookup, one row per booking item
+EXPORT_COLUMNS = {
+    "booking_reference": "booking__booking_reference",
+    "status": "booking__status",
+    "attendee": "booking__user__username",
+    "created_at": "booking__created_at",
+    "cancelled_at": "booking__cancelled_at",
+    "ticket_type": "ticket_type__name",
+    "quantity": "quantity",
+    "price_at_booking": "price_at_booking",
+    "booking_total_price": "booking__total_price",
+}
+
+
+def export_rows(event):
+    """
+    Tuples of the booking items of an event, in EXPORT_COLUMNS order,
+    grouped by booking.
+    """
+    return (
+        BookingItem.objects.filter(booking__event=event)
+        .order_by("booking_id", "id")
+        .values_list(*EXPORT_COLUMNS.values())
+    )
+
+
+def export_chunks(event):
+    """
+    Tuples of export rows, read from a server-side cursor
+    BOOKING_EXPORT_CHUNK_SIZE rows at a time.
+
+    The transaction keeps the cursor open without WITH HOLD, which would
+    have PostgreSQL materialize every row before sending the first one.
+    """
+    chunk_size = settings.BOOKING_EXPORT_CHUNK_SIZE
+    with transaction.atomic():
+        rows = export_rows(event).iterator(chunk_size=chunk_size)
+        yield from batched(rows, chunk_size, strict=False)
+
+
+def stream_export(event, renderer):
+    """
+    Rendered chunks of the export of an event, see export_chunks().
+    """
+    columns = list(EXPORT_COLUMNS)
+
+    yield renderer.render_header(columns)
+    for chunk in export_chunks(event):
+        yield renderer.render_rows(columns, chunk)
+
+
+async def astream_export(event, renderer):
+    """
+    stream_export for ASGI, which would read a synchronous iterator whole
+    before sending it. Like every query of the async ORM, the cursor is read
+    in a worker thread: export_chunks() is stepped with thread-sensitive
+    sync_to_async calls, which all run in the same thread, so its transaction
+    and connection stay open between the awaits.
+    """
+    columns = list(EXPORT_COLUMNS)
+
+    # Lazy, the query runs on the first next_chunk()
+    chunks = export_chunks(event)
+    next_chunk = sync_to_async(next)
+
+    yield renderer.render_header(columns)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield renderer.render_rows(columns, chunk)
+    finally:
+        # Ends the transaction when the client goes away mid-export
+        await sync_to_async(chunks.close)()
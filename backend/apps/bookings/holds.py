@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingItem
+from apps.bookings.reservations import release_booked_tickets
+from apps.common import metrics
+from apps.common.choices import BookingStatus
+from apps.common.transactions import atomic_with_retry
+
+
+def expire_holds_batch(now, batch_size):
+    """
+    Expire up to batch_size lapsed holds and release their tickets.
+    Must be called inside transaction.atomic().
+    Return the number of bookings expired.
+    """
+    # Served by the (status, expires_at) index. Holds locked by a concurrent
+    # confirm or cancel are skipped and picked up by the next pass.
+    booking_ids = list(
+        Booking.objects.filter(status=BookingStatus.PENDING, expires_at__lte=now)
+        .order_by("expires_at")
+        .select_for_update(skip_locked=True)
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not booking_ids:
+        return 0
+
+    Booking.objects.filter(pk__in=booking_ids).update(
+        status=BookingStatus.EXPIRED, updated_at=now
+    )
+    release_booked_tickets(BookingItem.objects.filter(booking_id__in=booking_ids), now)
+
+    return len(booking_ids)
+
+
+def release_expired_holds(batch_size=None):
+    """
+    Expire all lapsed holds, one transaction per batch. A batch deadlocking
+    with bookings being confirmed or cancelled is retried.
+    Return the number of bookings expired.
+    """
+    batch_size = batch_size or settings.BOOKING_HOLD_SWEEP_BATCH_SIZE
+    expired = 0
+
+    while True:
+        count = atomic_with_retry(
+            expire_holds_batch,
+            timezone.now(),
+            batch_size,
+            metric="bookings.holds.sweep",
+        )
+        expired += count
+        if count < batch_size:
+            break
+
+    metrics.increment("bookings.holds.expired", expired)
+    return expired
@@ -0,0 +1,117 @@
+import hashlib
+import json
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = BookingMessages.IDEMPOTENCY_KEY_REUSED
+    default_code = "idempotency_key_reused"
+
+
+def request_fingerprint(data):
+    """
+    SHA-256 of the request body, independent of key order.
+    """
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def find_booking(user, key, fingerprint):
+    """
+    Return the booking created by an earlier request with this key, if any.
+    Raise when the key was used with a different request body.
+    """
+    record = key_records(user, key).first()
+    return replayed_booking(record, fingerprint)
+
+
+async def afind_booking(user, key, fingerprint):
+    """
+    Async version of find_booking.
+    """
+    record = await key_records(user, key).afirst()
+    return replayed_booking(record, fingerprint)
+
+
+def find_booking_for_update(user, key, fingerprint):
+    """
+    find_booking for the holder of idempotency_lock(user, key). A lapsed
+    record is deleted, so the key can be stored again with the new booking.
+    """
+    record = key_records(user, key).first()
+    if record is not None and lapsed(record):
+        record.delete()
+        return None
+    return replayed_booking(record, fingerprint)
+
+
+def key_records(user, key):
+    return IdempotencyKey.objects.select_related("booking").filter(user=user, key=key)
+
+
+def retention_cutoff(now=None):
+    """
+    Keys created at or before this time are no longer replayed.
+    """
+    return (now or timezone.now()) - settings.IDEMPOTENCY_KEY_RETENTION
+
+
+def lapsed(record):
+    return record.created_at <= retention_cutoff()
+
+
+def replayed_booking(record, fingerprint):
+    # Lapsed keys are new again, even before purge_idempotency_keys runs
+    if record is None or lapsed(record):
+        return None
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return record.booking
+
+
+@contextmanager
+def idempotency_lock(user, key):
+    """
+    Hold a PostgreSQL advisory lock on (user, key) for the duration of the
+    block, so concurrent duplicates wait for the first request to finish.
+    The lock is held by the session and does not open a transaction.
+    """
+    digest = hashlib.sha256(f"{user.pk}:{key}".encode()).digest()
+    lock_id = int.from_bytes(digest[:8], "big", signed=True)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+
+
+def purge_lapsed_keys(batch_size=None):
+    """
+    Delete the keys past IDEMPOTENCY_KEY_RETENTION, one statement per batch.
+    Return the number of keys deleted.
+    """
+    batch_size = batch_size or settings.IDEMPOTENCY_KEY_PURGE_BATCH_SIZE
+    cutoff = retention_cutoff()
+    purged = 0
+
+    while True:
+        key_ids = IdempotencyKey.objects.filter(created_at__lte=cutoff).values("pk")
+        count, _ = IdempotencyKey.objects.filter(pk__in=key_ids[:batch_size]).delete()
+        purged += count
+        if count < batch_size:
+            return purged
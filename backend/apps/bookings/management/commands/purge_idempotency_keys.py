@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.bookings.idempotency import purge_lapsed_keys
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than IDEMPOTENCY_KEY_RETENTION."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Keys deleted per statement (default: IDEMPOTENCY_KEY_PURGE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_lapsed_keys(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} idempotency key(s)."))
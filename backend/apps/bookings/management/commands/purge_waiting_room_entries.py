@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.bookings.waiting_room import purge_expired_entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete waiting room entries of queue tokens past WAITING_ROOM_TOKEN_MAX_AGE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Entries deleted per statement (default: WAITING_ROOM_PURGE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_expired_entries(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} waiting room entry(ies).")
+        )
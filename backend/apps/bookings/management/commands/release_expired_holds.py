@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.bookings.holds import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Expire pending bookings whose hold has lapsed and release their tickets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Holds expired per transaction (default: BOOKING_HOLD_SWEEP_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        expired = release_expired_holds(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} hold(s)."))
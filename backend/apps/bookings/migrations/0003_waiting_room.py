@@ -0,0 +1,71 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0002_booking_cancelled_at"),
+        ("events", "0006_waiting_room"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitingRoom",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("issued", models.PositiveIntegerField(default=0)),
+                ("admitted", models.FloatField(default=0)),
+                ("advanced_at", models.FloatField(default=0)),
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waiting_room",
+                        to="events.event",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="WaitingRoomEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField()),
+                ("used_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "waiting_room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="bookings.waitingroom",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("waiting_room", "position"),
+                        name="unique_position_per_waiting_room",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0005_booking_holds"),
+        ("events", "0008_event_start_time_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="booking_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0006_booking_user_created_idx"),
+        ("events", "0010_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "confirmed"])),
+                fields=["event", "id"],
+                name="booking_event_holding_idx",
+            ),
+        ),
+    ]
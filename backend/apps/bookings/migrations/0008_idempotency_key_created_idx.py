@@ -0,0 +1,20 @@
+# Generated by Django 6.1.2 on 2026-10-17 20:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0007_booking_event_holding_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="idempotencykey",
+            index=models.Index(
+                fields=["created_at"], name="idempotency_key_created_idx"
+            ),
+        ),
+    ]
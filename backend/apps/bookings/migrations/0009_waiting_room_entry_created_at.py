@@ -0,0 +1,31 @@
+# Generated by Django 6.1.2 on 2026-10-17 21:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0008_idempotency_key_created_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="waitingroomentry",
+            name="used_at",
+        ),
+        migrations.AddField(
+            model_name="waitingroomentry",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="waitingroomentry",
+            index=models.Index(
+                fields=["created_at"], name="waiting_room_entry_created_idx"
+            ),
+        ),
+    ]
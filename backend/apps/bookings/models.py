@@ -4,7 +4,7 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
 from django.db import models
 
-from apps.common.choices import BookingStatus
+from apps.common.choices import HOLDING_BOOKING_STATUSES, BookingStatus
 from apps.events.models import Event, TicketType
 
 User = get_user_model()
@@ -27,9 +27,27 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     cancelled_at = models.DateTimeField(null=True, blank=True)
+    # End of the hold of a pending booking
+    expires_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]  # Most recent booking first
+        indexes = [
+            # Expiry sweeper: status = 'pending' AND expires_at <= now
+            models.Index(
+                fields=["status", "expires_at"], name="booking_status_expires_idx"
+            ),
+            # Keyset pages of a user's bookings: ORDER BY created_at DESC, id DESC
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="booking_user_created_idx"
+            ),
+            # Bookings holding tickets of an event: cancellation chunks walk it by id
+            models.Index(
+                fields=["event", "id"],
+                condition=models.Q(status__in=HOLDING_BOOKING_STATUSES),
+                name="booking_event_holding_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -60,3 +78,74 @@ class BookingItem(models.Model):
             f"{self.quantity} x {self.ticket_type.name} for "
             f"Booking {self.booking.booking_reference}"
         )
+
+
+class WaitingRoom(models.Model):
+    """Queue state of an event's waiting room for DatabaseQueueStore."""
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, related_name="waiting_room"
+    )
+    # Last position handed out
+    issued = models.PositiveIntegerField(default=0)
+    # Positions up to this one may attempt a booking
+    admitted = models.FloatField(default=0)
+    # Unix time of the last admission update
+    advanced_at = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"Waiting room for {self.event.name}"
+
+
+class WaitingRoomEntry(models.Model):
+    """Queue position handed out to a client."""
+
+    waiting_room = models.ForeignKey(
+        WaitingRoom, on_delete=models.CASCADE, related_name="entries"
+    )
+    position = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("waiting_room", "position"),
+                name="unique_position_per_waiting_room",
+            )
+        ]
+        indexes = [
+            # Entries of expired tokens deleted by purge_waiting_room_entries
+            models.Index(fields=["created_at"], name="waiting_room_entry_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Position {self.position} in {self.waiting_room}"
+
+
+class IdempotencyKey(models.Model):
+    """Idempotency-Key of a booking request and the booking it created."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request body the key was first used with
+    fingerprint = models.CharField(max_length=64)
+    booking = models.ForeignKey(
+        Booking, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("user", "key"), name="unique_idempotency_key_per_user"
+            )
+        ]
+        indexes = [
+            # Lapsed keys deleted by purge_idempotency_keys
+            models.Index(fields=["created_at"], name="idempotency_key_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of {self.user.username}"
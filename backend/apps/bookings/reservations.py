@@ -0,0 +1,315 @@
+from django.conf import settings
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.bookings.constants import BookingMessages
+from apps.events.cache import invalidate_event
+from apps.events.models import Event, TicketType, TicketTypeShard, shard_tickets_sold
+from apps.events.rollups import record_released
+from apps.events.sharding import (
+    claim_shard_stock,
+    count_tickets_sold,
+    release_shard_stock,
+    uncount_tickets_sold,
+)
+
+
+def check_ticket_availability(items, ticket_map):
+    """
+    Validate requested quantities against the given ticket type rows.
+    Stock of sharded ticket types is checked when claiming from the shards.
+    """
+    for item in items:
+        tt = ticket_map[item["ticket_type_id"]]
+        quantity = item["quantity"]
+
+        if not tt.shard_count and tt.quantity_available < quantity:
+            raise serializers.ValidationError(f"Not enough tickets for: {tt.name}.")
+        elif not tt.is_active:
+            raise serializers.ValidationError(BookingMessages.INACTIVE_TICKET_TYPE)
+
+
+def capacity_check_required(event):
+    """
+    Return True when the ticket stock of the event, sold or not, is more than
+    its capacity.
+
+    Stock only changes when an organizer edits ticket types, so while it fits
+    in total_capacity no booking can oversell the event.
+    """
+    shard_stock = (
+        TicketTypeShard.objects.filter(ticket_type__event_id=event.pk)
+        .order_by()
+        .values("ticket_type__event_id")
+        .annotate(total=Sum(F("quantity_available") + F("quantity_sold")))
+        .values("total")
+    )
+    stock = TicketType.objects.filter(event_id=event.pk).aggregate(
+        total=Coalesce(Sum(F("quantity_available") + F("quantity_sold")), 0)
+        + Coalesce(Subquery(shard_stock), 0)
+    )["total"]
+    return stock > event.total_capacity
+
+
+def claim_event_capacity(event, total_requested):
+    """
+    Count total_requested tickets as sold for the event.
+
+    When its ticket stock can exceed its capacity, claim the capacity on the
+    event row with one guarded UPDATE:
+
+        UPDATE ... SET tickets_sold = tickets_sold + n
+        WHERE id = ? AND tickets_sold + <counter shards> <= total_capacity - n
+
+    Otherwise the stock updates keep the booking within capacity, and the
+    tickets are counted on a counter shard so concurrent bookings don't queue
+    on the event row.
+    """
+    if capacity_check_required(event):
+        updated = Event.objects.filter(
+            pk=event.pk,
+            tickets_sold__lte=F("total_capacity")
+            - total_requested
+            - shard_tickets_sold(),
+        ).update(
+            tickets_sold=F("tickets_sold") + total_requested,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            raise serializers.ValidationError(BookingMessages.QUANTITY_EXCEED_CAPACITY)
+    else:
+        count_tickets_sold(event.pk, total_requested)
+
+    # Cached availability is dropped when the booking commits
+    invalidate_event(event.pk)
+
+
+def quantity_case(items):
+    """
+    CASE expression mapping each ticket type id to its requested quantity.
+    """
+    return Case(
+        *[
+            When(pk=item["ticket_type_id"], then=Value(item["quantity"]))
+            for item in items
+        ],
+        output_field=IntegerField(),
+    )
+
+
+def update_ticket_counts(items, *guards):
+    """
+    Move stock from available to sold for all items in one UPDATE ... CASE.
+    Return the number of ticket type rows updated.
+    """
+    quantity = quantity_case(items)
+    return TicketType.objects.filter(
+        *guards, pk__in=[item["ticket_type_id"] for item in items]
+    ).update(
+        quantity_available=F("quantity_available") - quantity,
+        quantity_sold=F("quantity_sold") + quantity,
+        updated_at=timezone.now(),
+    )
+
+
+def split_sharded(items, ticket_map):
+    """
+    Split items into (plain, sharded) by how their ticket type keeps stock.
+    """
+    plain, sharded = [], []
+    for item in items:
+        if ticket_map[item["ticket_type_id"]].shard_count:
+            sharded.append(item)
+        else:
+            plain.append(item)
+    return plain, sharded
+
+
+def claim_sharded_items(items, ticket_map):
+    """
+    Take the stock of sharded ticket types from their shard rows.
+    """
+    for item in items:
+        tt = ticket_map[item["ticket_type_id"]]
+        if claim_shard_stock(tt, item["quantity"]):
+            continue
+        # Deactivated since the ticket types were read
+        if not TicketType.objects.filter(pk=tt.pk, is_active=True).exists():
+            raise serializers.ValidationError(BookingMessages.INACTIVE_TICKET_TYPE)
+        raise serializers.ValidationError(f"Not enough tickets for: {tt.name}.")
+
+
+def returned_quantity(booking_items, field):
+    """
+    Correlated subquery summing the quantity of booking_items whose field
+    matches the primary key of the row being updated.
+    """
+    return Subquery(
+        booking_items.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+
+
+def release_booked_tickets(booking_items, now=None):
+    """
+    Give the tickets of a queryset of booking items back to their events
+    and ticket types. The tickets returned to each event are read first,
+    taken off its counter shards and the rest off the event row with one
+    UPDATE. Ticket types are updated with one correlated UPDATE, sharded
+    ones give their tickets back to the shards.
+    The items are counted as cancelled at now in the sales rollups, pass the
+    time the bookings were cancelled or expired.
+    """
+    now = now or timezone.now()
+    returned = (
+        booking_items.order_by("booking__event_id")
+        .values_list("booking__event_id")
+        .annotate(quantity=Sum("quantity"))
+    )
+
+    # Events first, same lock order as booking creation
+    on_event_rows = {}
+    for event_id, quantity in returned:
+        remainder = uncount_tickets_sold(event_id, quantity)
+        if remainder:
+            on_event_rows[event_id] = remainder
+        invalidate_event(event_id)
+    if on_event_rows:
+        Event.objects.filter(pk__in=on_event_rows).update(
+            tickets_sold=F("tickets_sold")
+            - Case(
+                *[When(pk=pk, then=Value(n)) for pk, n in on_event_rows.items()],
+                output_field=IntegerField(),
+            ),
+            updated_at=now,
+        )
+
+    quantity = returned_quantity(booking_items, "ticket_type")
+    TicketType.objects.filter(
+        pk__in=booking_items.values("ticket_type_id"), shard_count=0
+    ).update(
+        quantity_available=F("quantity_available") + quantity,
+        quantity_sold=F("quantity_sold") - quantity,
+        updated_at=now,
+    )
+
+    sharded = (
+        booking_items.filter(ticket_type__shard_count__gt=0)
+        .values("ticket_type_id")
+        .annotate(quantity=Sum("quantity"))
+        .order_by("ticket_type_id")
+    )
+    if sharded:
+        ticket_map = TicketType.objects.in_bulk(
+            [row["ticket_type_id"] for row in sharded]
+        )
+        for row in sharded:
+            release_shard_stock(ticket_map[row["ticket_type_id"]], row["quantity"])
+
+    record_released(booking_items, now)
+
+
+def reserve_with_locks(event, items, ticket_types):
+    """
+    Pessimistic engine.
+    Claim the event capacity, then lock every requested ticket type, then
+    update ticket counts.
+    Must be called inside transaction.atomic().
+
+    Locks are always taken in the same order (event or its counter shard
+    first, then ticket types by primary key) so concurrent multi-item orders
+    cannot deadlock.
+    """
+    ticket_map = {tt.pk: tt for tt in ticket_types}
+    plain, sharded = split_sharded(items, ticket_map)
+    total_requested = sum(item["quantity"] for item in items)
+
+    # Claim capacity, locking the event row when the stock can exceed it
+    claim_event_capacity(event, total_requested)
+
+    # Lock all ticket types, except sharded ones whose shards are claimed below
+    locked_ticket_types = (
+        TicketType.objects.select_for_update()
+        .filter(id__in=[item["ticket_type_id"] for item in plain])
+        .order_by("pk")
+    )
+
+    # Make mapping of ticket type id to its data
+    ticket_map.update({tt.pk: tt for tt in locked_ticket_types})
+
+    # Validate ticket availability and status
+    check_ticket_availability(items, ticket_map)
+
+    if plain:
+        update_ticket_counts(plain)
+    claim_sharded_items(sharded, ticket_map)
+
+    return ticket_map
+
+
+def reserve_with_conditional_update(event, items, ticket_types):
+    """
+    Lock-free engine.
+    Decrement stock of all ticket types with one guarded UPDATE:
+
+        UPDATE ... SET quantity_available = quantity_available - CASE ...
+        WHERE ((id = ? AND quantity_available >= n) OR ...) AND is_active
+
+    Event capacity is claimed with claim_event_capacity(), before the ticket
+    types, to keep the lock order of the locking engine.
+    Must be called inside transaction.atomic().
+    """
+    ticket_map = {tt.pk: tt for tt in ticket_types}
+    plain, sharded = split_sharded(items, ticket_map)
+    total_requested = sum(item["quantity"] for item in items)
+
+    # Fail fast on the snapshot read during validation
+    check_ticket_availability(items, ticket_map)
+
+    claim_event_capacity(event, total_requested)
+
+    if plain:
+        enough_stock = Q()
+        for item in plain:
+            enough_stock |= Q(
+                pk=item["ticket_type_id"], quantity_available__gte=item["quantity"]
+            )
+
+        updated = update_ticket_counts(plain, enough_stock, Q(is_active=True))
+
+        # Another booking took the stock after our snapshot was read.
+        # Raising rolls back the rows that were updated.
+        if updated != len(plain):
+            raise serializers.ValidationError(BookingMessages.QUANTITY_EXCEED_CAPACITY)
+
+    claim_sharded_items(sharded, ticket_map)
+
+    return ticket_map
+
+
+RESERVATION_ENGINES = {
+    "locking": reserve_with_locks,
+    "conditional": reserve_with_conditional_update,
+}
+
+
+def get_reservation_engine():
+    """
+    Return the reservation function set by BOOKING_RESERVATION_ENGINE.
+    """
+    return RESERVATION_ENGINES[settings.BOOKING_RESERVATION_ENGINE]
@@ -1,12 +1,18 @@
-from django.db import transaction
-from django.db.models import F
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
+from apps.bookings.batches import BookingBatch, BookingRequest
 from apps.bookings.constants import BookingMessages
+from apps.bookings.reservations import get_reservation_engine
+from apps.bookings.writer import submit_booking
 from apps.common.choices import BookingStatus
+from apps.common.fieldsets import SparseFieldsetSerializerMixin
+from apps.common.transactions import atomic_with_retry
 from apps.events.models import Event, TicketType
+from apps.events.rollups import record_booked
 
-from .models import Booking, BookingItem
+from .models import Booking, BookingItem, IdempotencyKey
 
 
 class BookingItemInputSerializer(serializers.Serializer):
@@ -54,6 +60,7 @@ class BookingSerializer(serializers.Serializer):
                 )
 
         data["ticket_type_ids"] = ticket_type_ids
+        data["ticket_types"] = list(ticket_types)
         data["event"] = ticket_types[0].event
 
         return data
@@ -62,81 +69,142 @@ class BookingSerializer(serializers.Serializer):
         """
         Called after object validation.
         """
+        if settings.BOOKING_RESERVATION_ENGINE == "single_writer":
+            # The event's writer reserves and writes the booking in its next batch
+            return submit_booking(
+                self.context["request"].user,
+                validated_data["event"],
+                validated_data["items"],
+                idempotency_key=validated_data.get("idempotency_key"),
+            )
+
+        # Complete successfully or do nothing (atomicity)
+        # Deadlocks and serialization failures are retried with jitter
+        return atomic_with_retry(
+            self.create_booking, validated_data, metric="bookings.create"
+        )
+
+    def create_booking(self, validated_data):
+        """
+        Reserve the tickets and write the booking.
+        Must be called inside transaction.atomic().
+        """
         user = self.context["request"].user
         items = validated_data["items"]
-        ticket_type_ids = validated_data["ticket_type_ids"]
+        ticket_types = validated_data["ticket_types"]
         event = validated_data["event"]
 
-        total_requested = sum(item["quantity"] for item in items)
+        reserve = get_reservation_engine()
 
-        # Complete successfully or do nothing (atomicity)
-        with transaction.atomic():
-            # Row locking for concurrency (pessimistic lock)
-            # Prevents race conditions
+        # Check availability and capacity, then take the stock
+        ticket_map = reserve(event, items, ticket_types)
+
+        # Calculate total price first
+        total_price = sum(
+            item["quantity"] * ticket_map[item["ticket_type_id"]].price
+            for item in items
+        )
+
+        # Create booking, holding the tickets until it is confirmed
+        booking = Booking.objects.create(
+            user=user,
+            event=event,
+            status=BookingStatus.PENDING,
+            expires_at=timezone.now() + settings.BOOKING_HOLD_DURATION,
+            total_price=total_price,
+        )
 
-            # Lock all ticket types
-            locked_ticket_types = TicketType.objects.select_for_update().filter(
-                id__in=ticket_type_ids
+        # Create all items in one INSERT
+        booking_items = BookingItem.objects.bulk_create(
+            BookingItem(
+                booking=booking,
+                ticket_type=ticket_map[item["ticket_type_id"]],
+                quantity=item["quantity"],
+                # Snapshot current price
+                price_at_booking=ticket_map[item["ticket_type_id"]].price,
             )
+            for item in items
+        )
+        record_booked(booking_items)
 
-            # Make mapping of ticket type id to its data
-            ticket_map = {tt.pk: tt for tt in locked_ticket_types}
+        # Stored in the same transaction, so a retry never misses a booking
+        if idempotency_key := validated_data.get("idempotency_key"):
+            IdempotencyKey.objects.create(user=user, booking=booking, **idempotency_key)
 
-            # Refresh event from DB with up-to-date ticket counts
-            event = Event.objects.select_for_update().get(pk=event.pk)
-            total_sold = event.total_tickets_sold
+        return booking
 
-            # Make sure total quantity requested don't exceed event capacity
-            if total_sold + total_requested > event.total_capacity:
-                raise serializers.ValidationError(
-                    BookingMessages.QUANTITY_EXCEED_CAPACITY
-                )
 
-            # Validate ticket availability and status
-            for item in items:
-                tt = ticket_map[item["ticket_type_id"]]
-                quantity = item["quantity"]
-
-                if tt.quantity_available < quantity:
-                    raise serializers.ValidationError(
-                        f"Not enough tickets for: {tt.name}."
-                    )
-                elif not tt.is_active:
-                    raise serializers.ValidationError(
-                        BookingMessages.INACTIVE_TICKET_TYPE
-                    )
-
-            # Calculate total price first
-            total_price = sum(
-                item["quantity"] * ticket_map[item["ticket_type_id"]].price
-                for item in items
-            )
+class BookingOrderSerializer(serializers.Serializer):
+    items = BookingItemInputSerializer(many=True, allow_empty=False)
 
-            # Create booking
-            booking = Booking.objects.create(
-                user=user,
-                event=event,
-                status=BookingStatus.CONFIRMED,
-                total_price=total_price,
-            )
 
-            # Create items & update ticket counts
-            for item in items:
-                tt = ticket_map[item["ticket_type_id"]]
-                quantity = item["quantity"]
+class BulkBookingSerializer(serializers.Serializer):
+    """
+    Create many bookings for one event in one transaction.
+    Each order succeeds or fails on its own.
+    """
 
-                BookingItem.objects.create(
-                    booking=booking,
-                    ticket_type=tt,
-                    quantity=quantity,
-                    price_at_booking=tt.price,  # Snapshot current price
-                )
+    event_id = serializers.IntegerField()
+    orders = BookingOrderSerializer(
+        many=True, allow_empty=False, max_length=settings.BULK_BOOKING_MAX_ORDERS
+    )
+
+    def validate(self, data):
+        """
+        Fetch the event and the ticket types of all orders at once.
+        """
+        data["event"] = Event.objects.filter(pk=data["event_id"]).first()
+        if data["event"] is None:
+            raise serializers.ValidationError(BookingMessages.INVALID_EVENT)
+
+        ticket_type_ids = {
+            item["ticket_type_id"]
+            for order in data["orders"]
+            for item in order["items"]
+        }
+        data["valid_ticket_type_ids"] = set(
+            TicketType.objects.filter(
+                event_id=data["event_id"], id__in=ticket_type_ids
+            ).values_list("id", flat=True)
+        )
+        return data
 
-                tt.quantity_available = F("quantity_available") - quantity
-                tt.quantity_sold = F("quantity_sold") + quantity
-                tt.save()
+    def create(self, validated_data):
+        """
+        Return the booking or the ValidationError of each order.
+        """
+        user = self.context["request"].user
+        valid_ids = validated_data["valid_ticket_type_ids"]
+
+        results = [None] * len(validated_data["orders"])
+        pending = []
+        for index, order in enumerate(validated_data["orders"]):
+            ids = [item["ticket_type_id"] for item in order["items"]]
+            # Unknown, other event's or repeated ticket types
+            if len(set(ids)) != len(ids) or not valid_ids.issuperset(ids):
+                results[index] = serializers.ValidationError(
+                    BookingMessages.INVALID_TICKET_TYPE
+                )
+            else:
+                pending.append((index, BookingRequest(user=user, items=order["items"])))
+
+        if pending:
+            # Lock the event's inventory once for all orders
+            # Confirmed right away: the organizer can't confirm holds, which
+            # the sweeper would expire
+            batch = BookingBatch(
+                validated_data["event"].pk, status=BookingStatus.CONFIRMED
+            )
+            written = atomic_with_retry(
+                batch.write,
+                [request for _, request in pending],
+                lock=True,
+                metric="bookings.bulk_create",
+            )
+            for (index, _), result in zip(pending, written, strict=True):
+                results[index] = result
 
-        return booking
+        return results
 
 
 class BookingItemSerializer(serializers.ModelSerializer):
@@ -151,7 +219,9 @@ class BookingItemSerializer(serializers.ModelSerializer):
         fields = ["id", "ticket_type_name", "quantity", "price_at_booking"]
 
 
-class BookingDetailSerializer(serializers.ModelSerializer):
+class BookingDetailSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Define response format for each booking."""
 
     # Get booking items where parent is current booking - booking.items.all()
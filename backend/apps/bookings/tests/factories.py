@@ -1,6 +1,7 @@
 from decimal import Decimal
 from uuid import uuid4
 
+from django.db.models import F
 from factory import (
     Faker,
     LazyFunction,
@@ -12,7 +13,8 @@ from factory import (
 
 from apps.accounts.tests.factories import UserFactory
 from apps.bookings.models import Booking, BookingItem
-from apps.common.choices import BookingStatus
+from apps.common.choices import HOLDING_BOOKING_STATUSES, BookingStatus
+from apps.events.models import Event
 from apps.events.tests.factories import EventFactory, TicketTypeFactory
 
 
@@ -68,3 +70,14 @@ class BookingItemFactory(django.DjangoModelFactory):
         if obj.ticket_type.event != obj.booking.event:
             obj.ticket_type.event = obj.booking.event
             obj.ticket_type.save()
+
+    @post_generation
+    def count_tickets_sold(obj, create, extracted, **kwargs):
+        """
+        Keep the event's denormalized sold counter in line with the item.
+        """
+        if not create or obj.booking.status not in HOLDING_BOOKING_STATUSES:
+            return
+        Event.objects.filter(pk=obj.booking.event_id).update(
+            tickets_sold=F("tickets_sold") + obj.quantity
+        )
@@ -1,8 +1,14 @@
+import threading
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework import status
 
+from apps.bookings.models import Booking
 from apps.common.choices import BookingStatus
+from apps.events.models import Event
 
 LIST_URL = reverse_lazy("bookings:my-bookings")
 RETRIEVE_BASE = "bookings:booking-detail"
@@ -20,6 +26,28 @@ def test_user_get_result_list(attendee_client, booking_factory):
     assert len(response.data["results"]) == 2
 
 
+@pytest.mark.django_db
+def test_list_pages_most_recent_first(
+    attendee_client, booking_factory, django_assert_num_queries
+):
+    bookings = [booking_factory(user=attendee_client.user) for _ in range(12)]
+    # Same creation time, ordered by id
+    Booking.objects.update(created_at=bookings[0].created_at)
+
+    # ETag validators, page and prefetched items, no COUNT(*)
+    with django_assert_num_queries(3):
+        response = attendee_client.get(LIST_URL)
+    second = attendee_client.get(response.data["next"])
+
+    references = [
+        result["booking_reference"]
+        for page in (response, second)
+        for result in page.data["results"]
+    ]
+    assert references == [str(booking.booking_reference) for booking in bookings[::-1]]
+    assert second.data["next"] is None
+
+
 @pytest.mark.django_db
 def test_user_with_no_booking_get_empty_result(attendee_client):
     response = attendee_client.get(LIST_URL)
@@ -56,6 +84,79 @@ def test_user_with_no_booking_get_404(attendee_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+# === Test ?fields= and ?omit= ===
+@pytest.mark.django_db
+def test_booking_list_fields_skip_items(attendee_client, booking_factory):
+    booking_factory(user=attendee_client.user, with_items=2)
+
+    # ETag validators and the page, the items aren't prefetched
+    with CaptureQueriesContext(connection) as context:
+        response = attendee_client.get(LIST_URL, {"fields": "booking_reference,status"})
+    assert len(context.captured_queries) == 2
+    assert response.data["results"][0].keys() == {"booking_reference", "status"}
+    assert "JOIN" not in context.captured_queries[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_booking_detail_omit_items(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user, with_items=2)
+    url = reverse_lazy(
+        RETRIEVE_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+
+    response = attendee_client.get(url, {"omit": "items"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "items" not in response.data
+    assert response.data["event_name"] == booking.event.name
+
+
+# === Test conditional GETs ===
+@pytest.mark.django_db
+def test_booking_list_revalidates_until_cancel(
+    attendee_client, booking_factory, django_assert_num_queries
+):
+    booking = booking_factory(user=attendee_client.user, status=BookingStatus.CONFIRMED)
+    response = attendee_client.get(LIST_URL)
+    etag = response["ETag"]
+    assert etag.startswith("W/")
+
+    with django_assert_num_queries(1):
+        revalidated = attendee_client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    attendee_client.put(cancel_url(booking))
+
+    revalidated = attendee_client.get(LIST_URL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == status.HTTP_200_OK
+    assert revalidated.data["results"][0]["status"] == BookingStatus.CANCELLED
+
+
+@pytest.mark.django_db
+def test_booking_etag_is_per_user(attendee_client, attendee_factory, booking_factory):
+    response = attendee_client.get(LIST_URL)
+
+    attendee_client.force_authenticate(attendee_factory())
+    revalidated = attendee_client.get(
+        LIST_URL, headers={"If-None-Match": response["ETag"]}
+    )
+    assert revalidated.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_booking_detail_revalidates_by_last_modified(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user)
+    url = reverse_lazy(
+        RETRIEVE_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+    response = attendee_client.get(url)
+
+    revalidated = attendee_client.get(
+        url, headers={"If-Modified-Since": response["Last-Modified"]}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert revalidated["ETag"] == response["ETag"]
+
+
 # === Test Cancel Booking ===
 @pytest.mark.django_db
 def test_user_cancel_booking(attendee_client, booking_factory):
@@ -91,3 +192,93 @@ def test_user_cancel_will_update_ticket_availability(
     ticket_type.refresh_from_db()
     assert ticket_type.quantity_available == 12  # 10 + 2 from booking item
     assert ticket_type.quantity_sold == 3  # 5 - 2 from booking item
+
+
+def cancel_url(booking):
+    return reverse_lazy(
+        CANCEL_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+
+
+@pytest.fixture
+def booked_ticket_types(event_factory, ticket_type_factory):
+    event = event_factory(total_capacity=100)
+    return [
+        ticket_type_factory(event=event, quantity_available=10, quantity_sold=10)
+        for _ in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_cancel_already_cancelled_booking(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user, status=BookingStatus.CANCELLED)
+
+    response = attendee_client.put(cancel_url(booking))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_cancel_query_count_does_not_grow_with_items(
+    attendee_client, booking_factory, booking_item_factory, booked_ticket_types
+):
+    """
+    The booking is cancelled with one guarded UPDATE and the tickets are
+    given back with set-based statements, without loading the items.
+    """
+
+    def cancel_queries(item_count):
+        booking = booking_factory(
+            user=attendee_client.user, event=booked_ticket_types[0].event
+        )
+        for ticket_type in booked_ticket_types[:item_count]:
+            booking_item_factory(booking=booking, ticket_type=ticket_type, quantity=1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = attendee_client.put(cancel_url(booking))
+        assert response.status_code == status.HTTP_200_OK
+        return len(context.captured_queries)
+
+    assert cancel_queries(1) == cancel_queries(5)
+
+    for ticket_type in booked_ticket_types:
+        ticket_type.refresh_from_db()
+    assert [t.quantity_available for t in booked_ticket_types] == [12, 11, 11, 11, 11]
+    assert Event.objects.get(pk=booked_ticket_types[0].event_id).total_tickets_sold == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_cancels_restock_once(
+    attendee_factory, booking_factory, booking_item_factory, api_client_factory
+):
+    user = attendee_factory()
+    booking = booking_factory(user=user, event__total_capacity=100)
+    item = booking_item_factory(
+        booking=booking,
+        ticket_type__quantity_available=10,
+        ticket_type__quantity_sold=10,
+        quantity=3,
+    )
+
+    responses = []
+
+    def cancel():
+        client = api_client_factory()
+        client.force_authenticate(user=user)
+        responses.append(client.put(cancel_url(booking)))
+
+    threads = [threading.Thread(target=cancel) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(r.status_code for r in responses) == [
+        status.HTTP_200_OK,
+        *[status.HTTP_400_BAD_REQUEST] * 3,
+    ]
+    assert Booking.objects.get().status == BookingStatus.CANCELLED
+
+    item.ticket_type.refresh_from_db()
+    assert item.ticket_type.quantity_available == 13
+    assert item.ticket_type.quantity_sold == 7
+    assert Event.objects.get(pk=booking.event_id).total_tickets_sold == 0
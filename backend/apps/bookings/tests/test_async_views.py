@@ -0,0 +1,191 @@
+from inspect import iscoroutinefunction
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from apps.bookings.models import Booking
+
+# Resolved per test, the async_views fixture reloads the URL conf
+LIST_URL = "bookings:my-bookings"
+CREATE_URL = "bookings:booking-create"
+RETRIEVE_BASE = "bookings:booking-detail"
+
+pytestmark = pytest.mark.usefixtures("async_views")
+
+
+def detail_url(booking):
+    return reverse(
+        RETRIEVE_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+
+
+def test_booking_views_are_async():
+    for name in (LIST_URL, CREATE_URL):
+        assert iscoroutinefunction(resolve(reverse(name)).func)
+
+
+# === List and detail ===
+@pytest.mark.django_db
+def test_list_bookings(attendee_client, booking_factory):
+    bookings = [
+        booking_factory(user=attendee_client.user, with_items=2) for _ in range(12)
+    ]
+    booking_factory(with_items=1)
+
+    response = attendee_client.get(reverse(LIST_URL))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 10
+    assert len(response.data["results"][0]["items"]) == 2
+    assert response.data["previous"] is None
+
+    response = attendee_client.get(response.data["next"])
+    assert [result["booking_reference"] for result in response.data["results"]] == [
+        str(booking.booking_reference) for booking in bookings[1::-1]
+    ]
+    assert response.data["next"] is None
+    assert response.data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_list_bookings_invalid_cursor(attendee_client):
+    response = attendee_client.get(reverse(LIST_URL), {"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_bookings_filtered(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user)
+    booking_factory(user=attendee_client.user)
+
+    response = attendee_client.get(reverse(LIST_URL), {"event": booking.event_id})
+    assert [result["booking_reference"] for result in response.data["results"]] == [
+        str(booking.booking_reference)
+    ]
+
+
+@pytest.mark.django_db
+def test_get_booking_detail(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user, with_items=3)
+
+    response = attendee_client.get(detail_url(booking))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["booking_reference"] == str(booking.booking_reference)
+    assert response.data["event_name"] == booking.event.name
+    assert len(response.data["items"]) == 3
+
+
+@pytest.mark.django_db
+def test_conditional_get(attendee_client, booking_factory):
+    booking = booking_factory(user=attendee_client.user)
+
+    for url in (reverse(LIST_URL), detail_url(booking)):
+        response = attendee_client.get(url)
+        revalidated = attendee_client.get(
+            url, headers={"If-None-Match": response["ETag"]}
+        )
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_other_users_booking_returns_404(attendee_client, booking_factory):
+    booking = booking_factory()
+
+    response = attendee_client.get(detail_url(booking))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_anonymous_user_cannot_list(api_client):
+    response = api_client.get(reverse(LIST_URL))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# === Create ===
+@pytest.fixture
+def payload(event_factory):
+    event = event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+    ticket = event.ticket_types.get()
+    return {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 2}],
+    }
+
+
+@pytest.mark.django_db
+def test_create_booking(attendee_client, payload):
+    response = attendee_client.post(reverse(CREATE_URL), payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    booking = Booking.objects.get()
+    assert response.data == {"booking_reference": booking.booking_reference}
+    assert booking.items.get().ticket_type.quantity_available == 8
+
+
+@pytest.mark.django_db
+def test_create_booking_rejects_invalid_payload(attendee_client, payload):
+    payload["items"][0]["quantity"] = 20
+
+    response = attendee_client.post(reverse(CREATE_URL), payload, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Booking.objects.exists()
+
+
+@pytest.mark.django_db
+def test_create_booking_replays_idempotent_retry(
+    attendee_client, payload, django_assert_num_queries
+):
+    headers = {"Idempotency-Key": "order-1"}
+    first = attendee_client.post(
+        reverse(CREATE_URL), payload, format="json", headers=headers
+    )
+
+    with django_assert_num_queries(1):
+        retry = attendee_client.post(
+            reverse(CREATE_URL), payload, format="json", headers=headers
+        )
+
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.data == first.data
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Booking.objects.count() == 1
+
+
+# === Export ===
+async def read_streaming(response):
+    return b"".join([part async for part in response.streaming_content])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_streams_from_async_generator(
+    settings, organizer_client, event_factory, booking_factory
+):
+    settings.BOOKING_EXPORT_CHUNK_SIZE = 2
+    event = event_factory(organizer=organizer_client.user, total_capacity=100)
+    for _ in range(3):
+        booking_factory(event=event, with_items=1)
+    url = reverse("bookings:booking-export", kwargs={"event_id": event.id})
+
+    response = organizer_client.get(url, {"format": "ndjson"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.is_async
+    # Chunks are fetched in the thread-sensitive worker, here the test thread
+    with CaptureQueriesContext(connection) as context:
+        body = async_to_sync(read_streaming)(response)
+    assert len(body.splitlines()) == 3
+
+    # One cursor in a transaction, not a materialized WITH HOLD one
+    (declare,) = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("DECLARE")
+    ]
+    assert "WITH HOLD" not in declare
+
+    other = reverse("bookings:booking-export", kwargs={"event_id": event.id + 1})
+    assert organizer_client.get(other).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,210 @@
+import threading
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.holds import expire_holds_batch
+from apps.bookings.models import Booking, BookingItem
+from apps.bookings.tests.utils import api_booking_attempt
+from apps.common.choices import BookingStatus
+from apps.events.constants import EventMessages
+from apps.events.models import Event, TicketType
+
+BULK_URL = reverse_lazy("bookings:booking-bulk")
+
+
+@pytest.fixture
+def event(organizer_client, event_factory):
+    return event_factory(
+        organizer=organizer_client.user,
+        total_capacity=100,
+        with_ticket_types=[{"quantity_available": 10}, {"quantity_available": 10}],
+    )
+
+
+def order(*items):
+    return {
+        "items": [
+            {"ticket_type_id": ticket_type.id, "quantity": quantity}
+            for ticket_type, quantity in items
+        ]
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_creates_all_orders(organizer_client, event):
+    standard, vip = event.ticket_types.order_by("pk")
+    payload = {
+        "event_id": event.id,
+        "orders": [
+            order((standard, 2)),
+            order((vip, 1)),
+            order((standard, 1), (vip, 3)),
+        ],
+    }
+
+    response = organizer_client.post(BULK_URL, payload, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    references = [result["booking_reference"] for result in response.data["results"]]
+    assert Booking.objects.filter(booking_reference__in=references).count() == 3
+    assert BookingItem.objects.count() == 4
+
+    standard.refresh_from_db()
+    vip.refresh_from_db()
+    assert (standard.quantity_available, vip.quantity_available) == (7, 6)
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 7
+
+
+@pytest.mark.django_db
+def test_bulk_bookings_are_confirmed_and_survive_the_sweep(
+    settings, organizer_client, event
+):
+    standard, _ = event.ticket_types.order_by("pk")
+    payload = {"event_id": event.id, "orders": [order((standard, 2))]}
+
+    response = organizer_client.post(BULK_URL, payload, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    booking = Booking.objects.get()
+    assert (booking.status, booking.expires_at) == (BookingStatus.CONFIRMED, None)
+
+    # A sweep after any hold would have lapsed
+    later = timezone.now() + settings.BOOKING_HOLD_DURATION * 2
+    assert expire_holds_batch(later, 10) == 0
+
+    booking.refresh_from_db()
+    assert booking.status == BookingStatus.CONFIRMED
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 2
+
+
+@pytest.mark.django_db
+def test_bulk_reports_failure_per_order(organizer_client, event, ticket_type_factory):
+    standard, _ = event.ticket_types.order_by("pk")
+    other_events_ticket = ticket_type_factory()
+    payload = {
+        "event_id": event.id,
+        "orders": [
+            order((standard, 6)),
+            order((standard, 6)),
+            order((other_events_ticket, 1)),
+            order((standard, 4)),
+        ],
+    }
+
+    response = organizer_client.post(BULK_URL, payload, format="json")
+    results = response.data["results"]
+
+    assert "booking_reference" in results[0]
+    assert results[1]["errors"] == [f"Not enough tickets for: {standard.name}."]
+    assert results[2]["errors"] == [BookingMessages.INVALID_TICKET_TYPE]
+    assert "booking_reference" in results[3]
+
+    standard.refresh_from_db()
+    assert standard.quantity_available == 0
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_repeated_ticket_type_in_order(organizer_client, event):
+    standard, _ = event.ticket_types.order_by("pk")
+    payload = {"event_id": event.id, "orders": [order((standard, 1), (standard, 2))]}
+
+    response = organizer_client.post(BULK_URL, payload, format="json")
+    assert response.data["results"] == [
+        {"errors": [BookingMessages.INVALID_TICKET_TYPE]}
+    ]
+    assert not Booking.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_only_for_own_events(organizer_client, event_factory):
+    event = event_factory(with_ticket_types=[{"quantity_available": 10}])
+    payload = {"event_id": event.id, "orders": [order((event.ticket_types.get(), 1))]}
+
+    response = organizer_client.post(BULK_URL, payload, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["detail"] == EventMessages.NOT_EVENT_OWNER
+
+
+@pytest.mark.django_db
+def test_attendee_cannot_bulk_book(attendee_client, event_factory):
+    event = event_factory(with_ticket_types=[{"quantity_available": 10}])
+    payload = {"event_id": event.id, "orders": [order((event.ticket_types.get(), 1))]}
+
+    response = attendee_client.post(BULK_URL, payload, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_bulk_unknown_event(organizer_client):
+    response = organizer_client.post(
+        BULK_URL, {"event_id": 999999, "orders": [{"items": []}]}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_bulk_query_count_does_not_grow_with_orders(organizer_client, event):
+    standard, vip = event.ticket_types.order_by("pk")
+    TicketType.objects.filter(event=event).update(quantity_available=1000)
+    Event.objects.filter(pk=event.pk).update(total_capacity=1000)
+
+    def bulk_queries(count):
+        payload = {
+            "event_id": event.id,
+            "orders": [order((standard, 1), (vip, 1)) for _ in range(count)],
+        }
+        with CaptureQueriesContext(connection) as context:
+            organizer_client.post(BULK_URL, payload, format="json")
+        return len(context.captured_queries)
+
+    assert bulk_queries(2) == bulk_queries(50)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_and_single_bookings_never_oversell(
+    organizer_factory, attendee_factory, event_factory, api_client_factory
+):
+    organizer = organizer_factory()
+    event = event_factory(
+        organizer=organizer,
+        total_capacity=100,
+        with_ticket_types=[{"quantity_available": 10}],
+    )
+    ticket_type = event.ticket_types.get()
+
+    box_office = api_client_factory()
+    box_office.force_authenticate(user=organizer)
+    attendees = []
+    for _ in range(4):
+        client = api_client_factory()
+        client.force_authenticate(user=attendee_factory())
+        attendees.append(client)
+
+    payload = {"event_id": event.id, "orders": [order((ticket_type, 2))] * 4}
+    threads = [
+        threading.Thread(
+            target=lambda: box_office.post(BULK_URL, payload, format="json")
+        ),
+        *[
+            threading.Thread(
+                target=api_booking_attempt, args=(c, event.id, ticket_type.id, 2)
+            )
+            for c in attendees
+        ],
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ticket_type.refresh_from_db()
+    booked = sum(item.quantity for item in BookingItem.objects.all())
+    assert booked == ticket_type.quantity_sold == 10
+    assert ticket_type.quantity_available == 0
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 10
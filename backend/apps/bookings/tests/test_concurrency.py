@@ -3,9 +3,11 @@ import threading
 import pytest
 from django.urls import reverse_lazy
 
-from apps.bookings.models import Booking
+from apps.bookings.models import Booking, BookingItem
 from apps.bookings.tests.utils import api_booking_attempt, threaded_booking
+from apps.bookings.writer import shutdown_writers
 from apps.common.choices import BookingStatus
+from apps.events.models import TicketType
 
 # Normally django_db use transaction rollback
 # Allow real DB commit to enable select_for_update()
@@ -14,11 +16,32 @@ pytestmark = pytest.mark.django_db(transaction=True)
 CREATE_URL = reverse_lazy("bookings:booking-create")
 
 
+@pytest.fixture(autouse=True, params=["locking", "conditional", "single_writer"])
+def reservation_engine(request, settings):
+    """
+    Run every concurrency test against each reservation engine.
+    """
+    settings.BOOKING_RESERVATION_ENGINE = request.param
+    settings.BOOKING_WRITER_IDLE_TIMEOUT = 0.1
+    yield request.param
+    # Writer threads hold their own DB connection until they stop
+    shutdown_writers()
+
+
+def run_concurrently(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
 def test_concurrent_booking_edge_case(
     attendee_factory, ticket_type_factory, event_factory, api_client_factory
 ):
+    # More tickets than capacity, so the event capacity turns one away
     event = event_factory(total_capacity=5)
-    ticket_type = ticket_type_factory(event=event, quantity_available=5)
+    ticket_type = ticket_type_factory(event=event, quantity_available=10)
 
     # Create new clients
     user1 = attendee_factory.create()
@@ -201,7 +224,7 @@ def test_concurrent_booking_after_cancellation(
 
     assert results["cancel"] == "done"
     assert results["book"] == "success"
-    assert Booking.objects.filter(status=BookingStatus.CONFIRMED).count() == 1
+    assert Booking.objects.filter(status=BookingStatus.PENDING).count() == 1
 
 
 def test_simultaneous_booking_only_one_succeeds(
@@ -237,4 +260,47 @@ def test_simultaneous_booking_only_one_succeeds(
     thread2.join()
 
     assert sorted(results.values()) == ["failed", "success"]
-    assert Booking.objects.filter(status=BookingStatus.CONFIRMED).count() == 1
+    assert Booking.objects.filter(status=BookingStatus.PENDING).count() == 1
+
+
+def test_many_concurrent_bookings_never_oversell(
+    attendee_factory, ticket_type_factory, event_factory, api_client_factory
+):
+    """
+    More concurrent requests than tickets: exactly the stock is sold and
+    every counter agrees with the booking items.
+    """
+    event = event_factory(total_capacity=8)
+    standard = ticket_type_factory(event=event, quantity_available=5)
+    vip = ticket_type_factory(event=event, quantity_available=5)
+
+    clients = []
+    for _ in range(12):
+        client = api_client_factory()
+        client.force_authenticate(user=attendee_factory())
+        clients.append(client)
+
+    results = [None] * len(clients)
+
+    def book(index):
+        ticket_type = (standard, vip)[index % 2]
+        results[index] = api_booking_attempt(
+            clients[index], event.id, ticket_type.id, 1
+        ).status_code
+
+    run_concurrently(*[lambda i=i: book(i) for i in range(len(clients))])
+
+    assert results.count(201) == 8
+    assert results.count(400) == 4
+
+    event.refresh_from_db()
+    sold = sum(item.quantity for item in BookingItem.objects.all())
+    assert event.total_tickets_sold == sold == 8
+
+    for ticket_type in TicketType.objects.filter(event=event):
+        booked = sum(
+            item.quantity
+            for item in BookingItem.objects.filter(ticket_type=ticket_type)
+        )
+        assert ticket_type.quantity_sold == booked
+        assert ticket_type.quantity_available == 5 - booked
@@ -181,3 +181,51 @@ def test_create_calcurate_total_price(attendee_client, event_factory):
 
     booking = Booking.objects.get(booking_reference=reference)
     assert booking.total_price == total_price
+
+
+# === Test set-based write path ===
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "engine, num_queries",
+    [
+        # SELECT waiting room, SELECT ticket types, SAVEPOINT, SELECT ticket
+        # stock, upsert of an event counter shard, SELECT ... FOR UPDATE,
+        # UPDATE ticket types, INSERT booking, INSERT items, 3 upserts of the
+        # sales rollups, RELEASE SAVEPOINT
+        ("locking", 13),
+        # Same without the SELECT ... FOR UPDATE
+        ("conditional", 12),
+    ],
+)
+def test_create_query_count_does_not_grow_with_items(
+    engine,
+    num_queries,
+    settings,
+    attendee_client,
+    event_factory,
+    django_assert_num_queries,
+):
+    """
+    Items are written with one bulk INSERT and ticket counts with one UPDATE,
+    so a 5-line order costs the same number of queries as a 1-line order.
+    """
+    settings.BOOKING_RESERVATION_ENGINE = engine
+    event = event_factory(
+        total_capacity=500,
+        with_ticket_types=[{"quantity_available": 20} for _ in range(5)],
+    )
+    tickets = event.ticket_types.all()
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 2} for ticket in tickets],
+    }
+
+    with django_assert_num_queries(num_queries):
+        response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    for ticket in tickets:
+        ticket.refresh_from_db()
+        assert ticket.quantity_available == 18
+        assert ticket.quantity_sold == 2
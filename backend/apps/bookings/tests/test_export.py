@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.bookings.export import EXPORT_COLUMNS
+from apps.common.choices import BookingStatus
+
+EXPORT_URL = "bookings:booking-export"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def event(event_factory, organizer_client):
+    return event_factory(organizer=organizer_client.user, total_capacity=1000)
+
+
+def export_url(event):
+    return reverse(EXPORT_URL, kwargs={"event_id": event.id})
+
+
+def content(response):
+    assert response.status_code == status.HTTP_200_OK
+    return b"".join(response.streaming_content).decode()
+
+
+def test_export_csv(organizer_client, event, booking_factory):
+    booking = booking_factory(event=event, with_items=2)
+    booking_factory(event=event, with_items=1, status=BookingStatus.CANCELLED)
+    # Another event's booking
+    booking_factory(with_items=1)
+
+    response = organizer_client.get(export_url(event))
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert (
+        response["Content-Disposition"]
+        == f'attachment; filename="event-{event.id}-bookings.csv"'
+    )
+
+    rows = list(csv.DictReader(io.StringIO(content(response))))
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert len(rows) == 3
+    assert [row["status"] for row in rows] == [
+        BookingStatus.CONFIRMED,
+        BookingStatus.CONFIRMED,
+        BookingStatus.CANCELLED,
+    ]
+
+    item = booking.items.order_by("id").first()
+    assert rows[0]["booking_reference"] == str(booking.booking_reference)
+    assert rows[0]["attendee"] == booking.user.username
+    assert rows[0]["ticket_type"] == item.ticket_type.name
+    assert rows[0]["price_at_booking"] == str(item.price_at_booking)
+    assert rows[0]["created_at"] == booking.created_at.isoformat().replace(
+        "+00:00", "Z"
+    )
+    assert rows[0]["cancelled_at"] == ""
+
+
+def test_export_ndjson(organizer_client, event, booking_factory):
+    booking = booking_factory(event=event, with_items=1)
+
+    response = organizer_client.get(export_url(event), {"format": "ndjson"})
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    (line,) = content(response).splitlines()
+    row = json.loads(line)
+    assert row["booking_reference"] == str(booking.booking_reference)
+    assert row["booking_total_price"] == str(booking.total_price)
+    assert row["cancelled_at"] is None
+
+
+def test_export_streams_in_chunks(settings, organizer_client, event, booking_factory):
+    settings.BOOKING_EXPORT_CHUNK_SIZE = 2
+    for _ in range(5):
+        booking_factory(event=event, with_items=1)
+
+    response = organizer_client.get(export_url(event))
+    with CaptureQueriesContext(connection) as context:
+        chunks = list(response.streaming_content)
+
+    # One server-side cursor, in a transaction so it isn't materialized
+    (declare,) = [
+        query["sql"]
+        for query in context.captured_queries
+        if "SAVEPOINT" not in query["sql"]
+    ]
+    assert declare.startswith("DECLARE")
+    assert "WITH HOLD" not in declare
+
+    # Header, then 3 chunks of at most 2 rows
+    assert len(chunks) == 4
+    assert all(chunk.count(b"\n") <= 2 for chunk in chunks[1:])
+
+
+def test_export_of_event_without_bookings(organizer_client, event):
+    assert content(organizer_client.get(export_url(event))).splitlines() == [
+        ",".join(EXPORT_COLUMNS)
+    ]
+
+
+def test_other_organizer_cannot_export(organizer_client, event_factory):
+    response = organizer_client.get(export_url(event_factory()))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_attendee_cannot_export(api_client_factory, attendee_factory, event):
+    client = api_client_factory()
+    client.force_authenticate(attendee_factory())
+
+    response = client.get(export_url(event))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_export_of_missing_event(organizer_client):
+    response = organizer_client.get(
+        reverse(EXPORT_URL, kwargs={"event_id": 1_000_000}),
+        {"format": "ndjson"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "detail" in json.loads(response.content)
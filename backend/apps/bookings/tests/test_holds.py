@@ -0,0 +1,244 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from psycopg import errors
+from rest_framework import status
+
+from apps.bookings import holds
+from apps.bookings.constants import BookingMessages
+from apps.bookings.holds import release_expired_holds
+from apps.bookings.models import Booking
+from apps.common import metrics
+from apps.common.choices import BookingStatus
+from apps.events.models import Event
+from apps.events.sharding import enable_sharding
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+CONFIRM_BASE = "bookings:booking-confirm"
+CANCEL_BASE = "bookings:booking-cancel"
+
+
+def confirm_url(booking):
+    return reverse(
+        CONFIRM_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+
+
+@pytest.fixture
+def hold_factory(booking_factory, booking_item_factory):
+    """
+    Create a pending booking of quantity tickets that took its stock.
+    """
+
+    def _create(ticket_type, quantity=2, expires_in=timedelta(minutes=5), **kwargs):
+        booking = booking_factory(
+            event=ticket_type.event,
+            status=BookingStatus.PENDING,
+            expires_at=timezone.now() + expires_in,
+            **kwargs,
+        )
+        booking_item_factory(
+            booking=booking, ticket_type=ticket_type, quantity=quantity
+        )
+        return booking
+
+    return _create
+
+
+@pytest.fixture
+def ticket_type(ticket_type_factory, event_factory):
+    event = event_factory(total_capacity=100)
+    return ticket_type_factory(event=event, quantity_available=10, quantity_sold=10)
+
+
+# === Hold creation ===
+@pytest.mark.django_db
+def test_booking_is_created_as_hold(settings, attendee_client, event_factory):
+    event = event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+    ticket = event.ticket_types.all()[0]
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 2}],
+    }
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    booking = Booking.objects.get()
+    assert booking.status == BookingStatus.PENDING
+    expected = timezone.now() + settings.BOOKING_HOLD_DURATION
+    assert abs(booking.expires_at - expected) < timedelta(seconds=5)
+
+    # Stock is taken at hold time
+    ticket.refresh_from_db()
+    assert ticket.quantity_available == 8
+
+
+# === Confirm ===
+@pytest.mark.django_db
+def test_confirm_hold(attendee_client, hold_factory, ticket_type):
+    booking = hold_factory(ticket_type, user=attendee_client.user)
+
+    response = attendee_client.put(confirm_url(booking))
+    assert response.status_code == status.HTTP_200_OK
+
+    booking.refresh_from_db()
+    assert booking.status == BookingStatus.CONFIRMED
+    assert booking.expires_at is None
+
+
+@pytest.mark.django_db
+def test_confirm_lapsed_hold_fails(attendee_client, hold_factory, ticket_type):
+    booking = hold_factory(
+        ticket_type, user=attendee_client.user, expires_in=timedelta(seconds=-1)
+    )
+
+    response = attendee_client.put(confirm_url(booking))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.HOLD_NOT_CONFIRMABLE in response.data
+
+    booking.refresh_from_db()
+    assert booking.status == BookingStatus.PENDING
+
+
+@pytest.mark.django_db
+def test_confirm_other_users_hold_returns_404(
+    attendee_client, hold_factory, ticket_type
+):
+    booking = hold_factory(ticket_type)
+
+    response = attendee_client.put(confirm_url(booking))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_cancel_hold_releases_stock(attendee_client, hold_factory, ticket_type):
+    booking = hold_factory(ticket_type, user=attendee_client.user, quantity=3)
+
+    url = reverse(CANCEL_BASE, kwargs={"booking_reference": booking.booking_reference})
+    response = attendee_client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 13
+    assert Event.objects.get(pk=ticket_type.event_id).total_tickets_sold == 0
+
+
+# === Expiry sweeper ===
+@pytest.mark.django_db
+def test_sweeper_releases_only_lapsed_holds(hold_factory, ticket_type):
+    lapsed = hold_factory(ticket_type, quantity=2, expires_in=timedelta(seconds=-1))
+    active = hold_factory(ticket_type, quantity=3)
+
+    assert release_expired_holds() == 1
+
+    lapsed.refresh_from_db()
+    active.refresh_from_db()
+    assert lapsed.status == BookingStatus.EXPIRED
+    assert active.status == BookingStatus.PENDING
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 12
+    assert ticket_type.quantity_sold == 8
+    assert Event.objects.get(pk=ticket_type.event_id).total_tickets_sold == 3
+
+
+@pytest.mark.django_db
+def test_sweeper_ignores_confirmed_bookings(booking_item_factory, ticket_type):
+    booking_item_factory(
+        booking__event=ticket_type.event,
+        booking__expires_at=timezone.now() - timedelta(days=1),
+        ticket_type=ticket_type,
+    )
+
+    assert release_expired_holds() == 0
+
+
+@pytest.mark.django_db
+def test_sweeper_releases_sharded_stock(hold_factory, ticket_type):
+    enable_sharding(ticket_type, 2)
+    ticket_type.refresh_from_db()
+    ticket_type.shards.update(quantity_sold=1)
+
+    hold_factory(ticket_type, quantity=2, expires_in=timedelta(seconds=-1))
+    release_expired_holds()
+
+    assert sum(shard.quantity_available for shard in ticket_type.shards.all()) == 12
+
+
+@pytest.mark.django_db
+def test_sweeper_works_in_batches(hold_factory, ticket_type):
+    for _ in range(5):
+        hold_factory(ticket_type, quantity=1, expires_in=timedelta(seconds=-1))
+
+    assert release_expired_holds(batch_size=2) == 5
+    assert not Booking.objects.filter(status=BookingStatus.PENDING).exists()
+
+
+@pytest.mark.django_db
+def test_sweeper_query_count_does_not_grow_with_holds(
+    hold_factory, ticket_type_factory, ticket_type
+):
+    """
+    Releasing a batch is set-based: the same statements for 1 or 6 holds.
+    """
+
+    def sweep_queries(holds):
+        for index in range(holds):
+            other = ticket_type_factory(event=ticket_type.event, quantity_sold=5)
+            hold_factory((ticket_type, other)[index % 2], quantity=1)
+        Booking.objects.filter(status=BookingStatus.PENDING).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        with CaptureQueriesContext(connection) as context:
+            release_expired_holds()
+        return len(context.captured_queries)
+
+    assert sweep_queries(1) == sweep_queries(6)
+
+
+# Retries only happen when the sweep opens the outermost transaction
+@pytest.mark.django_db(transaction=True)
+def test_sweeper_retries_deadlocked_batch(mocker, settings, hold_factory, ticket_type):
+    settings.TRANSACTION_RETRY_BASE_DELAY = 0
+    metrics.reset()
+    hold = hold_factory(ticket_type, expires_in=timedelta(seconds=-1))
+
+    deadlock = OperationalError("conflict")
+    deadlock.__cause__ = errors.DeadlockDetected()
+    release = holds.release_booked_tickets
+    attempts = []
+
+    def flaky_release(*args):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise deadlock
+        return release(*args)
+
+    mocker.patch("apps.bookings.holds.release_booked_tickets", flaky_release)
+
+    assert release_expired_holds() == 1
+    assert len(attempts) == 2
+    assert metrics.get_count("bookings.holds.sweep.retry.deadlock_detected") == 1
+
+    hold.refresh_from_db()
+    assert hold.status == BookingStatus.EXPIRED
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_sold == 8
+
+
+@pytest.mark.django_db
+def test_release_expired_holds_command(hold_factory, ticket_type):
+    hold_factory(ticket_type, expires_in=timedelta(seconds=-1))
+
+    out = StringIO()
+    call_command("release_expired_holds", stdout=out)
+    assert "Expired 1 hold(s)." in out.getvalue()
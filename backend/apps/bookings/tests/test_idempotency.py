@@ -0,0 +1,182 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking, IdempotencyKey
+from apps.bookings.writer import shutdown_writers
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+
+
+@pytest.fixture
+def event(event_factory):
+    return event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+
+
+def booking_payload(event, quantity=2):
+    ticket = event.ticket_types.all()[0]
+    return {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": quantity}],
+    }
+
+
+def post_with_key(client, payload, key="order-1"):
+    return client.post(
+        CREATE_URL, payload, format="json", headers={"Idempotency-Key": key}
+    )
+
+
+@pytest.mark.django_db
+def test_retry_returns_original_booking(attendee_client, event):
+    payload = booking_payload(event)
+
+    first = post_with_key(attendee_client, payload)
+    retry = post_with_key(attendee_client, payload)
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.data == first.data
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Booking.objects.count() == 1
+
+    ticket = event.ticket_types.all()[0]
+    assert ticket.quantity_sold == 2
+
+
+@pytest.mark.django_db
+def test_retry_does_not_touch_inventory(
+    attendee_client, event, django_assert_num_queries
+):
+    payload = booking_payload(event)
+    post_with_key(attendee_client, payload)
+
+    # Only the indexed lookup of the stored key
+    with django_assert_num_queries(1):
+        response = post_with_key(attendee_client, payload)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_key_reused_with_different_request(attendee_client, event):
+    post_with_key(attendee_client, booking_payload(event, quantity=2))
+
+    response = post_with_key(attendee_client, booking_payload(event, quantity=3))
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.data["detail"] == BookingMessages.IDEMPOTENCY_KEY_REUSED
+    assert Booking.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_keys_are_scoped_per_user(attendee_client, attendee_factory, event):
+    payload = booking_payload(event)
+    post_with_key(attendee_client, payload)
+
+    attendee_client.force_authenticate(user=attendee_factory())
+    post_with_key(attendee_client, payload)
+
+    assert Booking.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_rejected_request_is_not_stored(attendee_client, event):
+    """
+    A request that booked nothing can be retried with the same key.
+    """
+    payload = booking_payload(event, quantity=20)
+
+    response = post_with_key(attendee_client, payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not IdempotencyKey.objects.exists()
+
+    event.ticket_types.update(quantity_available=30)
+    response = post_with_key(attendee_client, payload)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_key_longer_than_255_characters(attendee_client, event):
+    response = post_with_key(attendee_client, booking_payload(event), key="k" * 256)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.IDEMPOTENCY_KEY_TOO_LONG in response.data
+
+
+def lapse(keys, settings):
+    keys.update(
+        created_at=timezone.now()
+        - settings.IDEMPOTENCY_KEY_RETENTION
+        - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+def test_lapsed_key_books_again(settings, attendee_client, event):
+    payload = booking_payload(event)
+    first = post_with_key(attendee_client, payload)
+    lapse(IdempotencyKey.objects.all(), settings)
+
+    response = post_with_key(attendee_client, payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in response
+    assert response.data != first.data
+
+    # The lapsed record made way for the new booking's
+    key = IdempotencyKey.objects.get()
+    assert str(key.booking.booking_reference) == str(response.data["booking_reference"])
+
+
+@pytest.mark.django_db
+def test_purge_deletes_lapsed_keys(settings, attendee_client, attendee_factory, event):
+    for key in ("order-1", "order-2", "order-3"):
+        post_with_key(attendee_client, booking_payload(event, quantity=1), key=key)
+    lapse(IdempotencyKey.objects.exclude(key="order-3"), settings)
+
+    out = StringIO()
+    call_command("purge_idempotency_keys", "--batch-size=1", stdout=out)
+
+    assert "Purged 2 idempotency key(s)." in out.getvalue()
+    assert list(IdempotencyKey.objects.values_list("key", flat=True)) == ["order-3"]
+    # Bookings are kept
+    assert Booking.objects.count() == 3
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("engine", ["locking", "single_writer"])
+def test_concurrent_duplicates_wait_for_first(
+    engine, settings, attendee_factory, event_factory, api_client_factory
+):
+    settings.BOOKING_RESERVATION_ENGINE = engine
+    settings.BOOKING_WRITER_IDLE_TIMEOUT = 0.1
+
+    event = event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+    payload = booking_payload(event)
+    user = attendee_factory()
+
+    responses = []
+
+    def book():
+        client = api_client_factory()
+        client.force_authenticate(user=user)
+        responses.append(post_with_key(client, payload))
+
+    threads = [threading.Thread(target=book) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    shutdown_writers()
+
+    assert [r.status_code for r in responses] == [status.HTTP_201_CREATED] * 4
+    assert len({r.data["booking_reference"] for r in responses}) == 1
+    assert Booking.objects.count() == 1
+    assert IdempotencyKey.objects.get().booking == Booking.objects.get()
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.holds import expire_holds_batch
+from apps.bookings.models import Booking
+from apps.bookings.tests.utils import authenticated_client
+from apps.common.choices import BookingStatus
+
+LIST_URL = "bookings:my-bookings"
+RETRIEVE_BASE = "bookings:booking-detail"
+CANCEL_BASE = "bookings:booking-cancel"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client(production_volumes):
+    return authenticated_client(production_volumes["attendee"])
+
+
+@pytest.fixture
+def booking(production_volumes):
+    return Booking.objects.filter(
+        user=production_volumes["attendee"], status=BookingStatus.CONFIRMED
+    ).first()
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"status": BookingStatus.CONFIRMED},
+        {"event": 1},
+        {"created_at__gte": timezone.now() - timedelta(days=3)},
+    ],
+    ids=["default", "status", "event", "created-range"],
+)
+def test_booking_list_uses_indexes(client, explain_queries, params):
+    with CaptureQueriesContext(connection) as context:
+        client.get(reverse(LIST_URL), params)
+
+    assert "booking_user_created_idx" in explain_queries(context.captured_queries)
+
+
+def test_booking_list_next_page_uses_indexes(client, explain_queries):
+    first = client.get(reverse(LIST_URL))
+
+    with CaptureQueriesContext(connection) as context:
+        client.get(first.data["next"])
+
+    assert "booking_user_created_idx" in explain_queries(context.captured_queries)
+
+
+def test_booking_detail_uses_indexes(client, booking, explain_queries):
+    url = reverse(
+        RETRIEVE_BASE, kwargs={"booking_reference": booking.booking_reference}
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+
+    explain_queries(context.captured_queries)
+
+
+def test_booking_cancel_uses_indexes(client, booking, explain_queries):
+    url = reverse(CANCEL_BASE, kwargs={"booking_reference": booking.booking_reference})
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    explain_queries(context.captured_queries)
+
+
+def test_hold_expiry_uses_indexes(production_volumes, explain_queries):
+    with CaptureQueriesContext(connection) as context:
+        with transaction.atomic():
+            assert expire_holds_batch(timezone.now(), 100) == 100
+
+    plans = explain_queries(context.captured_queries)
+    assert "booking_status_expires_idx" in plans
+    assert "ticket_type_sharded_idx" in plans
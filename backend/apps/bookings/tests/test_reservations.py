@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from django.db import transaction
+from django.urls import reverse_lazy
+from rest_framework import serializers, status
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking
+from apps.bookings.reservations import reserve_with_conditional_update
+from apps.bookings.tests.utils import threaded_booking
+from apps.common.choices import BookingStatus
+from apps.events.models import TicketType
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+
+
+@pytest.fixture
+def conditional_engine(settings):
+    settings.BOOKING_RESERVATION_ENGINE = "conditional"
+
+
+# === Conditional UPDATE engine ===
+@pytest.mark.django_db
+def test_conditional_booking_updates_ticket_type_quantity(
+    conditional_engine, attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=100)
+    ticket = ticket_type_factory(event=event, quantity_available=20, quantity_sold=0)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 3}],
+    }
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    ticket.refresh_from_db()
+    assert ticket.quantity_available == 17
+    assert ticket.quantity_sold == 3
+
+
+@pytest.mark.django_db
+def test_conditional_rejects_inactive_ticket_type(
+    conditional_engine, attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=100)
+    ticket = ticket_type_factory(event=event, quantity_available=20, is_active=False)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 1}],
+    }
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.INACTIVE_TICKET_TYPE in response.data
+
+
+@pytest.mark.django_db
+def test_conditional_rejects_booking_over_event_capacity(
+    conditional_engine, attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=5)
+    ticket = ticket_type_factory(event=event, quantity_available=10)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 6}],
+    }
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.QUANTITY_EXCEED_CAPACITY in response.data
+
+    ticket.refresh_from_db()
+    event.refresh_from_db()
+    assert ticket.quantity_available == 10
+    assert event.tickets_sold == 0
+
+
+@pytest.mark.django_db
+def test_conditional_guard_rolls_back_whole_order(event_factory, ticket_type_factory):
+    """
+    When one ticket type lost its stock after the snapshot was read,
+    none of the ticket types in the order are decremented.
+    """
+    event = event_factory(total_capacity=100)
+    standard = ticket_type_factory(event=event, quantity_available=10)
+    vip = ticket_type_factory(event=event, quantity_available=10)
+
+    # Stale snapshot: VIP was sold out by another booking meanwhile
+    TicketType.objects.filter(pk=vip.pk).update(quantity_available=0)
+
+    items = [
+        {"ticket_type_id": standard.id, "quantity": 2},
+        {"ticket_type_id": vip.id, "quantity": 2},
+    ]
+
+    with pytest.raises(serializers.ValidationError):
+        with transaction.atomic():
+            reserve_with_conditional_update(event, items, [standard, vip])
+
+    standard.refresh_from_db()
+    event.refresh_from_db()
+    assert standard.quantity_available == 10
+    assert event.tickets_sold == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conditional_concurrent_last_tickets(
+    conditional_engine, attendee_factory, event_factory, ticket_type_factory, api_client
+):
+    """
+    Only one of two concurrent bookings for the last tickets succeeds
+    without select_for_update().
+    """
+    event = event_factory(total_capacity=10)
+    ticket_type = ticket_type_factory(event=event, quantity_available=2)
+
+    data = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 2}],
+    }
+
+    results = {}
+    threads = [
+        threading.Thread(
+            target=threaded_booking,
+            args=(attendee_factory(), data, f"user{i}", results, api_client),
+        )
+        for i in range(2)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results.values()) == ["failed", "success"]
+    assert Booking.objects.filter(status=BookingStatus.PENDING).count() == 1
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 0
+    assert ticket_type.quantity_sold == 2
@@ -0,0 +1,109 @@
+import pytest
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from psycopg import errors
+from rest_framework import status
+
+from apps.bookings import reservations
+from apps.bookings.models import Booking
+from apps.common import metrics
+
+# Retries only happen when the booking opens the outermost transaction
+pytestmark = pytest.mark.django_db(transaction=True)
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+
+
+def conflict(error_class):
+    exc = OperationalError("conflict")
+    exc.__cause__ = error_class()
+    return exc
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(settings):
+    settings.TRANSACTION_RETRY_BASE_DELAY = 0
+    metrics.reset()
+
+
+@pytest.fixture
+def payload(event_factory, ticket_type_factory):
+    event = event_factory(total_capacity=10)
+    ticket = ticket_type_factory(event=event, quantity_available=10)
+    return {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 2}],
+    }
+
+
+def flaky_engine(mocker, failures):
+    """
+    Patch the reservation engine to raise the given errors before succeeding.
+    """
+    errors_left = iter(failures)
+
+    def reserve(*args):
+        error = next(errors_left, None)
+        if error is not None:
+            raise error
+        return reservations.reserve_with_locks(*args)
+
+    mocker.patch(
+        "apps.bookings.serializers.get_reservation_engine", return_value=reserve
+    )
+
+
+def test_deadlock_is_retried(mocker, attendee_client, payload):
+    flaky_engine(mocker, [conflict(errors.DeadlockDetected)])
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert Booking.objects.count() == 1
+    assert metrics.get_count("bookings.create.retry.deadlock_detected") == 1
+
+
+def test_exhausted_retries_return_503(mocker, settings, attendee_client, payload):
+    settings.TRANSACTION_RETRY_ATTEMPTS = 2
+    flaky_engine(
+        mocker,
+        [conflict(errors.SerializationFailure), conflict(errors.SerializationFailure)],
+    )
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert Booking.objects.count() == 0
+    assert metrics.get_count("bookings.create.retry.serialization_failure") == 2
+    assert metrics.get_count("bookings.create.conflict") == 1
+
+
+def test_locks_event_before_ticket_types_in_pk_order(
+    attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=10)
+    # Higher pk but lower price, so default ordering would lock it first
+    first = ticket_type_factory(event=event, price=50)
+    second = ticket_type_factory(event=event, price=10)
+
+    payload = {
+        "event_id": event.id,
+        "items": [
+            {"ticket_type_id": second.id, "quantity": 1},
+            {"ticket_type_id": first.id, "quantity": 1},
+        ],
+    }
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    sqls = [query["sql"] for query in ctx.captured_queries]
+    event_update = next(
+        i for i, sql in enumerate(sqls) if "UPDATE" in sql and "events_event" in sql
+    )
+    ticket_lock = next(i for i, sql in enumerate(sqls) if "FOR UPDATE" in sql)
+
+    assert event_update < ticket_lock
+    assert 'ORDER BY "events_tickettype"."id" ASC' in sqls[ticket_lock]
@@ -0,0 +1,271 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking, WaitingRoomEntry
+from apps.bookings.waiting_room import (
+    BaseQueueStore,
+    DatabaseQueueStore,
+    InMemoryQueueStore,
+    get_queue_store,
+)
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def queue_store():
+    get_queue_store.cache_clear()
+    yield
+    get_queue_store.cache_clear()
+
+
+@pytest.fixture
+def clock(mocker):
+    """
+    Freeze the waiting room clock, advance it with clock.return_value += n.
+    """
+    return mocker.patch("apps.bookings.waiting_room.time.time", return_value=NOW)
+
+
+@pytest.fixture
+def queued_event(event_factory):
+    return event_factory(
+        total_capacity=100,
+        admission_rate=2,
+        with_ticket_types=[{"quantity_available": 50}],
+    )
+
+
+def booking_payload(event):
+    ticket = event.ticket_types.all()[0]
+    return {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket.id, "quantity": 1}],
+    }
+
+
+def join(client, event):
+    url = reverse("bookings:booking-queue", kwargs={"event_id": event.id})
+    response = client.post(url)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.data
+
+
+# === Admission rate ===
+@pytest.mark.parametrize("store_class", [InMemoryQueueStore, DatabaseQueueStore])
+@pytest.mark.django_db
+def test_store_admits_rate_positions_per_second(store_class, event_factory):
+    event = event_factory()
+    store = store_class()
+
+    positions = [store.enqueue(event.id, 2, NOW) for _ in range(5)]
+    assert positions == [1, 2, 3, 4, 5]
+    assert store.admitted(event.id, 2, NOW) == 0
+    assert store.admitted(event.id, 2, NOW + 1) == 2
+    assert store.admitted(event.id, 2, NOW + 2) == 4
+
+
+@pytest.mark.parametrize("store_class", [InMemoryQueueStore, DatabaseQueueStore])
+@pytest.mark.django_db
+def test_store_does_not_bank_admissions_while_idle(store_class, event_factory):
+    """
+    After a quiet hour, a burst is still admitted at the configured rate.
+    """
+    event = event_factory()
+    store = store_class()
+
+    store.enqueue(event.id, 2, NOW)
+    later = NOW + 3600
+    burst = [store.enqueue(event.id, 2, later) for _ in range(10)]
+
+    assert store.admitted(event.id, 2, later) == 1
+    assert store.admitted(event.id, 2, later + 1) == 3
+    assert burst[-1] == 11
+
+
+@pytest.mark.parametrize("store_class", [InMemoryQueueStore, DatabaseQueueStore])
+@pytest.mark.django_db
+def test_store_consumes_position_once(store_class, event_factory):
+    event = event_factory()
+    store = store_class()
+    position = store.enqueue(event.id, 2, NOW)
+
+    assert store.consume(event.id, position) is True
+    assert store.consume(event.id, position) is False
+
+
+@pytest.mark.django_db
+def test_database_store_is_shared_by_workers(event_factory):
+    """
+    A position handed out by one worker is admitted and used up in all.
+    """
+    event = event_factory()
+    issuer, other = DatabaseQueueStore(), DatabaseQueueStore()
+
+    issuer.enqueue(event.id, 2, NOW)
+    position = issuer.enqueue(event.id, 2, NOW)
+    assert other.admitted(event.id, 2, NOW + 1) == position
+
+    assert other.consume(event.id, position) is True
+    assert issuer.consume(event.id, position) is False
+
+
+@pytest.mark.django_db
+def test_database_store_admission_check_only_reads(
+    event_factory, django_assert_num_queries
+):
+    event = event_factory()
+    store = DatabaseQueueStore()
+    assert store.admitted(event.id, 2, NOW) == 0
+    store.enqueue(event.id, 2, NOW)
+
+    with django_assert_num_queries(1) as context:
+        assert store.admitted(event.id, 2, NOW + 1) == 1
+    assert context.captured_queries[0]["sql"].startswith("SELECT")
+    assert "FOR UPDATE" not in context.captured_queries[0]["sql"]
+
+
+def test_store_must_implement_every_method():
+    class IncompleteQueueStore(BaseQueueStore):
+        def enqueue(self, event_id, rate, now):
+            return 1
+
+    with pytest.raises(TypeError):
+        IncompleteQueueStore()
+
+
+@pytest.mark.django_db
+def test_database_store_deletes_used_and_expired_entries(settings, event_factory):
+    event = event_factory()
+    store = DatabaseQueueStore()
+    used, expired, waiting = (store.enqueue(event.id, 2, NOW) for _ in range(3))
+
+    assert store.consume(event.id, used) is True
+    WaitingRoomEntry.objects.filter(position=expired).update(
+        created_at=timezone.now()
+        - timedelta(seconds=settings.WAITING_ROOM_TOKEN_MAX_AGE + 1)
+    )
+
+    out = StringIO()
+    call_command("purge_waiting_room_entries", stdout=out)
+
+    assert "Purged 1 waiting room entry(ies)." in out.getvalue()
+    assert list(WaitingRoomEntry.objects.values_list("position", flat=True)) == [
+        waiting
+    ]
+
+
+# === Booking through the waiting room ===
+@pytest.mark.django_db
+def test_booking_without_waiting_room_needs_no_token(attendee_client, event_factory):
+    event = event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+
+    response = attendee_client.post(CREATE_URL, booking_payload(event), format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_booking_requires_queue_token(clock, attendee_client, queued_event):
+    response = attendee_client.post(
+        CREATE_URL, booking_payload(queued_event), format="json"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["detail"] == BookingMessages.QUEUE_TOKEN_REQUIRED
+
+
+@pytest.mark.django_db
+def test_booking_is_throttled_until_admitted(clock, attendee_client, queued_event):
+    ahead = join(attendee_client, queued_event)
+    queued = join(attendee_client, queued_event)
+    last = join(attendee_client, queued_event)
+    assert (queued["position"], queued["admitted"]) == (2, False)
+
+    response = attendee_client.post(
+        CREATE_URL,
+        booking_payload(queued_event),
+        format="json",
+        headers={"X-Queue-Token": last["token"]},
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response["Retry-After"] == "2"
+    assert not Booking.objects.exists()
+
+    clock.return_value += 1
+    for data in (ahead, queued):
+        response = attendee_client.post(
+            CREATE_URL,
+            booking_payload(queued_event),
+            format="json",
+            headers={"X-Queue-Token": data["token"]},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    assert Booking.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_queue_token_admits_one_attempt(clock, attendee_client, queued_event):
+    token = join(attendee_client, queued_event)["token"]
+    clock.return_value += 1
+
+    headers = {"X-Queue-Token": token}
+    payload = booking_payload(queued_event)
+    first = attendee_client.post(CREATE_URL, payload, format="json", headers=headers)
+    second = attendee_client.post(CREATE_URL, payload, format="json", headers=headers)
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_403_FORBIDDEN
+    assert second.data["detail"] == BookingMessages.QUEUE_TOKEN_USED
+
+
+@pytest.mark.django_db
+def test_queue_token_is_bound_to_event(
+    clock, attendee_client, queued_event, event_factory
+):
+    other_event = event_factory(admission_rate=2)
+    token = join(attendee_client, other_event)["token"]
+    clock.return_value += 1
+
+    response = attendee_client.post(
+        CREATE_URL,
+        booking_payload(queued_event),
+        format="json",
+        headers={"X-Queue-Token": token},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["detail"] == BookingMessages.INVALID_QUEUE_TOKEN
+
+
+# === Queue status ===
+@pytest.mark.django_db
+def test_queue_status_reports_admission(clock, attendee_client, queued_event):
+    token = join(attendee_client, queued_event)["token"]
+    url = reverse("bookings:booking-queue", kwargs={"event_id": queued_event.id})
+
+    response = attendee_client.get(url, headers={"X-Queue-Token": token})
+    assert response.data == {"position": 1, "admitted": False, "estimated_wait": 1}
+
+    clock.return_value += 1
+    response = attendee_client.get(url, headers={"X-Queue-Token": token})
+    assert response.data == {"position": 1, "admitted": True, "estimated_wait": 0}
+
+
+@pytest.mark.django_db
+def test_joining_queue_of_event_without_waiting_room(attendee_client, event_factory):
+    event = event_factory()
+    url = reverse("bookings:booking-queue", kwargs={"event_id": event.id})
+
+    response = attendee_client.post(url)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.WAITING_ROOM_DISABLED in response.data
@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+from rest_framework import serializers
+
+from apps.bookings.batches import BookingRequest
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking
+from apps.bookings.tests.utils import api_booking_attempt
+from apps.bookings.writer import EventWriter, shutdown_writers
+from apps.common import metrics
+from apps.common.choices import BookingStatus
+from apps.events.models import Event
+
+
+@pytest.fixture
+def single_writer(settings):
+    settings.BOOKING_RESERVATION_ENGINE = "single_writer"
+    settings.BOOKING_WRITER_IDLE_TIMEOUT = 0.1
+    metrics.reset()
+    yield
+    shutdown_writers()
+
+
+def request_for(user, ticket_type, quantity):
+    return BookingRequest(
+        user=user, items=[{"ticket_type_id": ticket_type.id, "quantity": quantity}]
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_bookings_are_committed_in_batches(
+    single_writer,
+    settings,
+    attendee_factory,
+    ticket_type_factory,
+    event_factory,
+    api_client_factory,
+):
+    settings.BOOKING_WRITER_BATCH_WINDOW = 0.2
+
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=100)
+
+    clients = []
+    for _ in range(6):
+        client = api_client_factory()
+        client.force_authenticate(user=attendee_factory())
+        clients.append(client)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda c=client: results.append(
+                api_booking_attempt(c, event.id, ticket_type.id, 2).status_code
+            )
+        )
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [201] * 6
+    assert metrics.get_count("bookings.writer.requests") == 6
+    assert metrics.get_count("bookings.writer.batches") < 6
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 12
+
+
+@pytest.mark.django_db
+def test_batch_is_decided_in_arrival_order(
+    attendee_factory, ticket_type_factory, event_factory
+):
+    event = event_factory(total_capacity=10)
+    ticket_type = ticket_type_factory(event=event, quantity_available=3)
+    batch = [request_for(attendee_factory(), ticket_type, 2) for _ in range(3)]
+
+    results = EventWriter(event.id).write_batch(batch)
+
+    assert isinstance(results[0], Booking)
+    assert results[0].status == BookingStatus.PENDING
+    assert all(isinstance(r, serializers.ValidationError) for r in results[1:])
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 1
+    assert ticket_type.quantity_sold == 2
+
+
+@pytest.mark.django_db
+def test_batch_is_decided_again_when_stock_changed(
+    mocker, attendee_factory, ticket_type_factory, event_factory
+):
+    """
+    Stock taken outside the writer after the batch was loaded makes the
+    guarded UPDATE fail; the batch is then decided again on locked rows.
+    """
+    event = event_factory(total_capacity=10)
+    ticket_type = ticket_type_factory(event=event, quantity_available=1)
+    writer = EventWriter(event.id)
+    load_stock = writer.load_stock
+
+    def stale_load_stock(lock):
+        event, ticket_map, stock = load_stock(lock)
+        if not lock:
+            # Stock as it was before another process sold two tickets
+            stock[ticket_type.pk] = 3
+        return event, ticket_map, stock
+
+    mocker.patch.object(writer, "load_stock", side_effect=stale_load_stock)
+
+    results = writer.write_batch([request_for(attendee_factory(), ticket_type, 2)])
+
+    assert isinstance(results[0], serializers.ValidationError)
+    assert writer.load_stock.call_count == 2
+    assert not Booking.objects.exists()
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 0
+
+
+@pytest.mark.django_db
+def test_batch_rejects_inactive_ticket_type(
+    attendee_factory, ticket_type_factory, event_factory
+):
+    event = event_factory(total_capacity=10)
+    ticket_type = ticket_type_factory(event=event, is_active=False)
+
+    results = EventWriter(event.id).write_batch(
+        [request_for(attendee_factory(), ticket_type, 1)]
+    )
+
+    assert BookingMessages.INACTIVE_TICKET_TYPE in results[0].detail
@@ -1,23 +1,64 @@
+from django.conf import settings
 from django.urls import path
 
 from apps.bookings.views.cancel import BookingCancelView
 
-from .views import BookingCreateView, BookingDetailView, BookingListView
+from .views import (
+    AsyncBookingCreateView,
+    AsyncBookingDetailView,
+    AsyncBookingExportView,
+    AsyncBookingListView,
+    BookingConfirmView,
+    BookingCreateView,
+    BookingDetailView,
+    BookingExportView,
+    BookingListView,
+    BulkBookingCreateView,
+    WaitingRoomView,
+)
 
 url_prefix = "bookings/"
 app_name = "bookings"
 
+# Views that don't tie up a worker under ASGI
+if settings.ASYNC_VIEWS:
+    create_view = AsyncBookingCreateView
+    list_view = AsyncBookingListView
+    detail_view = AsyncBookingDetailView
+    export_view = AsyncBookingExportView
+else:
+    create_view = BookingCreateView
+    list_view = BookingListView
+    detail_view = BookingDetailView
+    export_view = BookingExportView
+
 urlpatterns = [
-    path("users/me/bookings", BookingListView.as_view(), name="my-bookings"),
+    path("users/me/bookings", list_view.as_view(), name="my-bookings"),
+    path(f"{url_prefix}bulk", BulkBookingCreateView.as_view(), name="booking-bulk"),
+    path(
+        f"{url_prefix}queue/<int:event_id>",
+        WaitingRoomView.as_view(),
+        name="booking-queue",
+    ),
+    path(
+        f"{url_prefix}export/<int:event_id>",
+        export_view.as_view(),
+        name="booking-export",
+    ),
     path(
         f"{url_prefix}<str:booking_reference>",
-        BookingDetailView.as_view(),
+        detail_view.as_view(),
         name="booking-detail",
     ),
-    path(f"{url_prefix}", BookingCreateView.as_view(), name="booking-create"),
+    path(f"{url_prefix}", create_view.as_view(), name="booking-create"),
     path(
         f"{url_prefix}<str:booking_reference>/cancel",
         BookingCancelView.as_view(),
         name="booking-cancel",
     ),
+    path(
+        f"{url_prefix}<str:booking_reference>/confirm",
+        BookingConfirmView.as_view(),
+        name="booking-confirm",
+    ),
 ]
@@ -1,6 +1,16 @@
+from .async_views import (
+    AsyncBookingCreateView,
+    AsyncBookingDetailView,
+    AsyncBookingExportView,
+    AsyncBookingListView,
+)
+from .bulk import BulkBookingCreateView
 from .cancel import BookingCancelView
+from .confirm import BookingConfirmView
 from .create import BookingCreateView
+from .export import BookingExportView
 from .list import BookingListView
+from .queue import WaitingRoomView
 from .retrieve import BookingDetailView
 
 __all__ = [
@@ -8,4 +18,12 @@ __all__ = [
     "BookingListView",
     "BookingDetailView",
     "BookingCancelView",
+    "BulkBookingCreateView",
+    "BookingConfirmView",
+    "WaitingRoomView",
+    "BookingExportView",
+    "AsyncBookingCreateView",
+    "AsyncBookingListView",
+    "AsyncBookingDetailView",
+    "AsyncBookingExportView",
 ]
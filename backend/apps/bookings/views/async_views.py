@@ -0,0 +1,74 @@
+from adrf.views import APIView
+from asgiref.sync import sync_to_async
+from django.http import Http404
+
+from apps.bookings.export import astream_export
+from apps.bookings.idempotency import afind_booking, request_fingerprint
+from apps.common.conditional import (
+    aggregate_validators,
+    conditional_get,
+    object_rows,
+    page_validators,
+)
+from apps.common.views import AsyncListAPIView, AsyncRetrieveAPIView
+from apps.events.models import Event
+
+from .create import BookingCreateView
+from .export import BookingExportView
+from .list import BookingListView
+from .retrieve import BookingDetailView
+
+
+class AsyncBookingCreateView(BookingCreateView, APIView):
+    """
+    BookingCreateView for the ASGI deployment.
+
+    Replays are answered with the async ORM. Only the reservation runs in a
+    worker thread: validation, waiting room admission and the locked
+    transaction all need one connection and may wait on row locks.
+    """
+
+    async def post(self, request):
+        key = self.get_idempotency_key(request)
+        if key is None:
+            return await sync_to_async(self.create_booking)(request)
+
+        fingerprint = request_fingerprint(request.data)
+
+        booking = await afind_booking(request.user, key, fingerprint)
+        if booking is None:
+            return await sync_to_async(self.create_booking_once)(
+                request, key, fingerprint
+            )
+        return self.booking_replayed(booking)
+
+
+class AsyncBookingListView(AsyncListAPIView, BookingListView):
+    pagination_class = BookingListView.pagination_class
+
+    @conditional_get(page_validators, weak=True)
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
+
+
+class AsyncBookingDetailView(AsyncRetrieveAPIView, BookingDetailView):
+    @conditional_get(aggregate_validators(object_rows), last_modified=True, weak=True)
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
+
+
+class AsyncBookingExportView(BookingExportView, APIView):
+    """
+    BookingExportView for the ASGI deployment, streamed from an async
+    generator: Django would read a synchronous one whole before sending it.
+    """
+
+    async def get(self, request, event_id):
+        try:
+            event = await Event.objects.aget(pk=event_id)
+        except Event.DoesNotExist:
+            raise Http404 from None
+        self.check_event(event)
+        return self.export_response(
+            event, astream_export(event, request.accepted_renderer)
+        )
@@ -0,0 +1,36 @@
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.permissions import IsOrganizer
+from apps.bookings.serializers import BulkBookingSerializer
+from apps.events.constants import EventMessages
+
+
+class BulkBookingCreateView(APIView):
+    """
+    Create many bookings for one of the organizer's events,
+    e.g. box-office and group sales.
+    """
+
+    serializer_class = BulkBookingSerializer
+    permission_classes = [IsAuthenticated, IsOrganizer]
+
+    def post(self, request):
+        serializer = BulkBookingSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        if serializer.validated_data["event"].organizer_id != request.user.pk:
+            raise PermissionDenied(EventMessages.NOT_EVENT_OWNER)
+
+        results = [
+            {"errors": result.detail}
+            if isinstance(result, ValidationError)
+            else {"booking_reference": result.booking_reference}
+            for result in serializer.save()
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -1,6 +1,6 @@
 from django.db import transaction
-from django.db.models import F
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import UpdateAPIView
@@ -9,8 +9,8 @@ from rest_framework.response import Response
 
 from apps.accounts.permissions import IsAttendee
 from apps.bookings.models import Booking, BookingItem
-from apps.common.choices import BookingStatus
-from apps.events.models import TicketType
+from apps.bookings.reservations import release_booked_tickets
+from apps.common.choices import HOLDING_BOOKING_STATUSES, BookingStatus
 
 
 class BookingCancelView(UpdateAPIView):
@@ -19,40 +19,33 @@ class BookingCancelView(UpdateAPIView):
     queryset = Booking.objects.all()
     lookup_field = "booking_reference"  # Optional
 
-    def get_object(self):
-        booking_reference = self.kwargs.get("booking_reference")
-        booking = get_object_or_404(
-            Booking.objects.filter(user=self.request.user).prefetch_related(
-                "items__ticket_type"
-            ),
-            # From URL parameters
-            booking_reference=booking_reference,
-        )
-
-        if booking.status != BookingStatus.CONFIRMED:
-            raise ValidationError("Booking already cancelled or invalid status.")
-
-        return booking
-
     def update(self, request, *args, **kwargs):
         """
         Cancel specified booking.
         """
-        booking = self.get_object()
+        bookings = Booking.objects.filter(
+            user=request.user,
+            # From URL parameters
+            booking_reference=self.kwargs.get("booking_reference"),
+        )
+        now = timezone.now()
 
         with transaction.atomic():
-            # Update booking status
-            booking.status = BookingStatus.CANCELLED
-            booking.save()
-
-            # Get all booking items for a booking
-            items = BookingItem.objects.filter(booking=booking)
-
-            # Update ticket availability for each booking item
-            for item in items:
-                TicketType.objects.filter(pk=item.ticket_type.pk).update(
-                    quantity_available=F("quantity_available") + item.quantity,
-                    quantity_sold=F("quantity_sold") - item.quantity,
+            # One guarded UPDATE: of concurrent cancels (or the expiry sweeper)
+            # only one moves the booking out of a holding status
+            cancelled = bookings.filter(status__in=HOLDING_BOOKING_STATUSES).update(
+                status=BookingStatus.CANCELLED, cancelled_at=now, updated_at=now
+            )
+
+            if cancelled:
+                # Give the tickets back without loading the items
+                release_booked_tickets(
+                    BookingItem.objects.filter(booking__in=bookings), now
                 )
 
+        if not cancelled:
+            if not bookings.exists():
+                raise Http404
+            raise ValidationError("Booking already cancelled or invalid status.")
+
         return Response({"detail": "Booking cancelled."}, status=status.HTTP_200_OK)
@@ -0,0 +1,39 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import UpdateAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.accounts.permissions import IsAttendee
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import Booking
+from apps.common.choices import BookingStatus
+
+
+class BookingConfirmView(UpdateAPIView):
+    serializer_class = None
+    permission_classes = [IsAuthenticated, IsAttendee]
+    queryset = Booking.objects.all()
+    lookup_field = "booking_reference"
+
+    def update(self, request, *args, **kwargs):
+        """
+        Confirm a pending booking while its hold lasts.
+        """
+        booking = get_object_or_404(
+            Booking.objects.filter(user=request.user),
+            booking_reference=self.kwargs.get("booking_reference"),
+        )
+
+        # One guarded UPDATE, so it can't race the expiry sweeper
+        now = timezone.now()
+        confirmed = Booking.objects.filter(
+            pk=booking.pk, status=BookingStatus.PENDING, expires_at__gt=now
+        ).update(status=BookingStatus.CONFIRMED, expires_at=None, updated_at=now)
+
+        if not confirmed:
+            raise ValidationError(BookingMessages.HOLD_NOT_CONFIRMABLE)
+
+        return Response({"detail": "Booking confirmed."}, status=status.HTTP_200_OK)
@@ -1,25 +1,93 @@
 from typing import cast
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.permissions import IsAttendee
-from apps.bookings.models import Booking
+from apps.bookings.constants import BookingMessages
+from apps.bookings.idempotency import (
+    IDEMPOTENCY_HEADER,
+    find_booking,
+    find_booking_for_update,
+    idempotency_lock,
+    request_fingerprint,
+)
+from apps.bookings.models import Booking, IdempotencyKey
 from apps.bookings.serializers import BookingSerializer
+from apps.bookings.waiting_room import admit
+from apps.common import metrics
+from apps.events.models import Event
 
 
 class BookingCreateView(APIView):
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated, IsAttendee]
 
+    def check_waiting_room(self, request):
+        """
+        Hold the request back until its queue token is admitted when the
+        event has a waiting room. Other payload errors are left to the serializer.
+        """
+        try:
+            event = Event.objects.only("id", "admission_rate").get(
+                pk=request.data.get("event_id"), admission_rate__isnull=False
+            )
+        except Event.DoesNotExist, TypeError, ValueError:
+            return
+
+        admit(request.headers.get("X-Queue-Token"), event)
+
     def post(self, request):
+        key = self.get_idempotency_key(request)
+        if key is None:
+            return self.create_booking(request)
+
+        fingerprint = request_fingerprint(request.data)
+
+        # Retries of a finished request are answered without taking any lock
+        booking = find_booking(request.user, key, fingerprint)
+        if booking is None:
+            return self.create_booking_once(request, key, fingerprint)
+        return self.booking_replayed(booking)
+
+    def get_idempotency_key(self, request):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return None
+
+        max_length = IdempotencyKey._meta.get_field("key").max_length
+        if len(key) > max_length:
+            raise ValidationError(BookingMessages.IDEMPOTENCY_KEY_TOO_LONG)
+        return key
+
+    def create_booking_once(self, request, key, fingerprint):
+        # Concurrent duplicates wait here until the first one is done
+        with idempotency_lock(request.user, key):
+            booking = find_booking_for_update(request.user, key, fingerprint)
+            if booking is None:
+                idempotency_key = {"key": key, "fingerprint": fingerprint}
+                return self.create_booking(request, idempotency_key)
+        return self.booking_replayed(booking)
+
+    def create_booking(self, request, idempotency_key=None):
+        self.check_waiting_room(request)
+
         serializer = BookingSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
-            booking = cast(Booking, serializer.save())
-            return Response(
-                {"booking_reference": booking.booking_reference},
-                status=status.HTTP_201_CREATED,
-            )
+            booking = cast(Booking, serializer.save(idempotency_key=idempotency_key))
+            return self.booking_created(booking)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def booking_replayed(self, booking):
+        metrics.increment("bookings.create.idempotent_replay")
+        return self.booking_created(booking, headers={"Idempotent-Replayed": "true"})
+
+    def booking_created(self, booking, headers=None):
+        return Response(
+            {"booking_reference": booking.booking_reference},
+            status=status.HTTP_201_CREATED,
+            headers=headers,
+        )
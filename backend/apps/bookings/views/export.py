@@ -0,0 +1,46 @@
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from apps.accounts.permissions import IsOrganizer
+from apps.bookings.export import stream_export
+from apps.common.renderers import CSVRenderer, NDJSONRenderer
+from apps.events.constants import EventMessages
+from apps.events.models import Event
+
+
+class BookingExportView(APIView):
+    """
+    GET streams every booking item of an event to its organizer, as CSV
+    (?format=csv, the default) or NDJSON (?format=ndjson), in constant
+    memory however many bookings it has.
+    """
+
+    permission_classes = [IsAuthenticated, IsOrganizer]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+
+    def check_event(self, event):
+        if event.organizer_id != self.request.user.pk:
+            raise PermissionDenied(EventMessages.NOT_EVENT_OWNER)
+
+    def export_response(self, event, chunks):
+        renderer = self.request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        filename = f"event-{event.pk}-bookings.{renderer.format}"
+        return StreamingHttpResponse(
+            chunks,
+            content_type=content_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    def get(self, request, event_id):
+        event = get_object_or_404(Event, pk=event_id)
+        self.check_event(event)
+        return self.export_response(
+            event, stream_export(event, request.accepted_renderer)
+        )
@@ -6,13 +6,24 @@ from apps.accounts.permissions import IsAttendee
 from apps.bookings.filters import BookingFilter
 from apps.bookings.models import Booking
 from apps.bookings.serializers import BookingDetailSerializer
+from apps.common.conditional import conditional_get, page_validators
+from apps.common.fieldsets import SparseFieldsetMixin
+from apps.common.pagination import KeysetPagination
 
 
-class BookingListView(ListAPIView):
+class BookingListView(SparseFieldsetMixin, ListAPIView):
     serializer_class = BookingDetailSerializer
     permission_classes = [IsAuthenticated, IsAttendee]
     filter_backends = [DjangoFilterBackend]
     filterset_class = BookingFilter
+    # Most recent first, keyset pages on (user, created_at, id)
+    ordering = "-created_at"
+    pagination_class = KeysetPagination
+
+    # Weak, event and ticket type names aren't covered by the booking rows
+    @conditional_get(page_validators, weak=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
         # For documentation tools
@@ -0,0 +1,36 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.permissions import IsAttendee
+from apps.bookings.constants import BookingMessages
+from apps.bookings.waiting_room import get_queue_status, join_queue
+from apps.events.models import Event
+
+
+class WaitingRoomView(APIView):
+    """
+    POST joins the event's waiting room and returns a queue token.
+    GET returns the queue status of the token in the X-Queue-Token header.
+    """
+
+    permission_classes = [IsAuthenticated, IsAttendee]
+
+    def get_event(self):
+        event = get_object_or_404(Event, pk=self.kwargs["event_id"])
+        if event.admission_rate is None:
+            raise ValidationError(BookingMessages.WAITING_ROOM_DISABLED)
+        return event
+
+    def post(self, request, event_id):
+        token, queue_status = join_queue(self.get_event())
+        return Response(
+            {"token": token, **queue_status}, status=status.HTTP_201_CREATED
+        )
+
+    def get(self, request, event_id):
+        token = request.headers.get("X-Queue-Token", "")
+        return Response(get_queue_status(token, self.get_event()))
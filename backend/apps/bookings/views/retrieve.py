@@ -4,15 +4,26 @@ from rest_framework.permissions import IsAuthenticated
 from apps.accounts.permissions import IsAttendee
 from apps.bookings.models import Booking
 from apps.bookings.serializers import BookingDetailSerializer
+from apps.common.conditional import (
+    aggregate_validators,
+    conditional_get,
+    object_rows,
+)
+from apps.common.fieldsets import SparseFieldsetMixin
 
 
-class BookingDetailView(RetrieveAPIView):
+class BookingDetailView(SparseFieldsetMixin, RetrieveAPIView):
     serializer_class = BookingDetailSerializer
 
     # Avoid returning 403 to attendees - it prove that the given booking id exists
     permission_classes = [IsAuthenticated, IsAttendee]
     lookup_field = "booking_reference"
 
+    # Weak, event and ticket type names aren't covered by the booking row
+    @conditional_get(aggregate_validators(object_rows), last_modified=True, weak=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         """
         Called right after view is initialized, before permission checks.
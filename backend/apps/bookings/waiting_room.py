@@ -0,0 +1,254 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import cache
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import exceptions
+
+from apps.bookings.constants import BookingMessages
+from apps.bookings.models import WaitingRoom, WaitingRoomEntry
+from apps.common import metrics
+
+TOKEN_SALT = "bookings.waiting-room"
+
+
+def advance_admitted(admitted, issued, advanced_at, rate, now):
+    """
+    Let rate positions per second past the admission mark since advanced_at.
+    The mark never runs ahead of the positions handed out, so an idle queue
+    doesn't bank admissions for the next burst.
+    """
+    elapsed = max(now - advanced_at, 0)
+    return min(admitted + elapsed * rate, issued)
+
+
+class BaseQueueStore(ABC):
+    """
+    Keeps the waiting room state per event:
+    the last position handed out, the admission mark and used positions.
+    """
+
+    @abstractmethod
+    def enqueue(self, event_id, rate, now):
+        """
+        Hand out the next position in the event's queue.
+        """
+
+    @abstractmethod
+    def admitted(self, event_id, rate, now):
+        """
+        Return the highest position that may attempt a booking now.
+        Runs on every status poll and booking attempt, so it shouldn't write.
+        """
+
+    @abstractmethod
+    def consume(self, event_id, position):
+        """
+        Mark an admitted position as used. Return False if it already was.
+        """
+
+
+@dataclass
+class _QueueState:
+    issued: int = 0
+    admitted: float = 0
+    advanced_at: float = 0
+    used: set = field(default_factory=set)
+
+
+class InMemoryQueueStore(BaseQueueStore):
+    """
+    Queue state in process memory, for tests and single process runs.
+    Each worker process hands out and admits positions on its own, so a
+    token is only admitted by the worker that issued it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}
+
+    def enqueue(self, event_id, rate, now):
+        with self._lock:
+            state = self._queues.setdefault(event_id, _QueueState(advanced_at=now))
+            state.admitted = advance_admitted(
+                state.admitted, state.issued, state.advanced_at, rate, now
+            )
+            state.advanced_at = now
+            state.issued += 1
+            return state.issued
+
+    def admitted(self, event_id, rate, now):
+        with self._lock:
+            state = self._queues.get(event_id, _QueueState())
+            return math.floor(
+                advance_admitted(
+                    state.admitted, state.issued, state.advanced_at, rate, now
+                )
+            )
+
+    def consume(self, event_id, position):
+        with self._lock:
+            used = self._queues.setdefault(event_id, _QueueState()).used
+            if position in used:
+                return False
+            used.add(position)
+            return True
+
+
+class DatabaseQueueStore(BaseQueueStore):
+    """
+    Queue state in the WaitingRoom and WaitingRoomEntry tables,
+    shared by all worker processes.
+
+    The admission mark only moves when a position is handed out: until the
+    next one, it follows from the stored mark, the last position and the
+    time, so admission checks read the event's WaitingRoom row without
+    locking or writing it.
+
+    An entry is deleted when its position is used, entries never used are
+    deleted by purge_expired_entries once their token has expired.
+    """
+
+    def enqueue(self, event_id, rate, now):
+        with transaction.atomic():
+            WaitingRoom.objects.get_or_create(
+                event_id=event_id, defaults={"advanced_at": now}
+            )
+            room = WaitingRoom.objects.select_for_update().get(event_id=event_id)
+            room.admitted = advance_admitted(
+                room.admitted, room.issued, room.advanced_at, rate, now
+            )
+            room.advanced_at = now
+            room.issued += 1
+            room.save(update_fields=["issued", "admitted", "advanced_at"])
+            WaitingRoomEntry.objects.create(waiting_room=room, position=room.issued)
+            return room.issued
+
+    def admitted(self, event_id, rate, now):
+        room = (
+            WaitingRoom.objects.filter(event_id=event_id)
+            .values("admitted", "issued", "advanced_at")
+            .first()
+        )
+        if room is None:
+            return 0
+        return math.floor(advance_admitted(**room, rate=rate, now=now))
+
+    def consume(self, event_id, position):
+        deleted, _ = WaitingRoomEntry.objects.filter(
+            waiting_room__event_id=event_id, position=position
+        ).delete()
+        return bool(deleted)
+
+
+def purge_expired_entries(batch_size=None):
+    """
+    Delete the WaitingRoomEntry rows of tokens past WAITING_ROOM_TOKEN_MAX_AGE,
+    one statement per batch. Return the number of entries deleted.
+    """
+    batch_size = batch_size or settings.WAITING_ROOM_PURGE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(seconds=settings.WAITING_ROOM_TOKEN_MAX_AGE)
+    purged = 0
+
+    while True:
+        entry_ids = WaitingRoomEntry.objects.filter(created_at__lte=cutoff).values("pk")
+        count, _ = WaitingRoomEntry.objects.filter(
+            pk__in=entry_ids[:batch_size]
+        ).delete()
+        purged += count
+        if count < batch_size:
+            return purged
+
+
+@cache
+def get_queue_store():
+    """
+    Return the store instance set by WAITING_ROOM_STORE.
+    """
+    return import_string(settings.WAITING_ROOM_STORE)()
+
+
+def estimated_wait(position, admitted, rate):
+    """
+    Seconds until position is admitted at rate positions per second.
+    """
+    return max(math.ceil((position - admitted) / rate), 0)
+
+
+def join_queue(event):
+    """
+    Put a client in the event's queue.
+    Return the signed queue token and the queue status.
+    """
+    store = get_queue_store()
+    now = time.time()
+
+    position = store.enqueue(event.pk, event.admission_rate, now)
+    admitted = store.admitted(event.pk, event.admission_rate, now)
+    metrics.increment("waiting_room.enqueued")
+
+    token = signing.dumps({"event": event.pk, "position": position}, salt=TOKEN_SALT)
+    return token, queue_status(position, admitted, event.admission_rate)
+
+
+def read_token(token, event):
+    """
+    Return the queue position of a token issued for event.
+    """
+    try:
+        data = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.WAITING_ROOM_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature as exc:
+        raise exceptions.PermissionDenied(BookingMessages.INVALID_QUEUE_TOKEN) from exc
+
+    if data["event"] != event.pk:
+        raise exceptions.PermissionDenied(BookingMessages.INVALID_QUEUE_TOKEN)
+    return data["position"]
+
+
+def get_queue_status(token, event):
+    position = read_token(token, event)
+    admitted = get_queue_store().admitted(event.pk, event.admission_rate, time.time())
+    return queue_status(position, admitted, event.admission_rate)
+
+
+def queue_status(position, admitted, rate):
+    return {
+        "position": position,
+        "admitted": position <= admitted,
+        "estimated_wait": estimated_wait(position, admitted, rate),
+    }
+
+
+def admit(token, event):
+    """
+    Let a booking attempt for event through, or raise when it has to wait.
+    Each token admits a single attempt.
+    """
+    if not token:
+        raise exceptions.PermissionDenied(BookingMessages.QUEUE_TOKEN_REQUIRED)
+
+    position = read_token(token, event)
+    store = get_queue_store()
+    admitted = store.admitted(event.pk, event.admission_rate, time.time())
+
+    if position > admitted:
+        metrics.increment("waiting_room.throttled")
+        raise exceptions.Throttled(
+            wait=estimated_wait(position, admitted, event.admission_rate),
+            detail=BookingMessages.QUEUE_NOT_ADMITTED,
+        )
+
+    if not store.consume(event.pk, position):
+        raise exceptions.PermissionDenied(BookingMessages.QUEUE_TOKEN_USED)
+
+    metrics.increment("waiting_room.admitted")
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from apps.bookings.batches import BookingBatch, BookingRequest, StockChanged
+from apps.bookings.constants import BookingMessages
+from apps.common import metrics
+from apps.common.transactions import TransactionConflict
+
+
+class EventWriter(BookingBatch):
+    """
+    Single writer of bookings for one event.
+
+    Requests are queued and handled by one thread, which collects them for
+    BOOKING_WRITER_BATCH_WINDOW seconds and writes them as one BookingBatch.
+    """
+
+    def __init__(self, event_id):
+        super().__init__(event_id)
+        self.requests = queue.SimpleQueue()
+        self.thread = threading.Thread(
+            target=self.run, name=f"event-writer-{event_id}", daemon=True
+        )
+
+    def submit(self, request):
+        self.requests.put(request)
+
+    def run(self):
+        try:
+            while (batch := self.collect()) is not None:
+                self.process(batch)
+        finally:
+            connection.close()
+
+    def collect(self):
+        """
+        Wait for the next request, then gather more until the batch window
+        closes or the batch is full. Return None when the writer was idle
+        long enough to stop.
+        """
+        try:
+            first = self.requests.get(timeout=settings.BOOKING_WRITER_IDLE_TIMEOUT)
+        except queue.Empty:
+            return None if stop_writer(self) else []
+
+        batch = [first]
+        deadline = time.monotonic() + settings.BOOKING_WRITER_BATCH_WINDOW
+        while len(batch) < settings.BOOKING_WRITER_MAX_BATCH:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        # Requests whose client gave up are dropped
+        return [
+            request
+            for request in batch
+            if request.future.set_running_or_notify_cancel()
+        ]
+
+    def process(self, batch):
+        if not batch:
+            return
+
+        try:
+            results = self.write_batch(batch)
+        except StockChanged:
+            results = [
+                serializers.ValidationError(BookingMessages.QUANTITY_EXCEED_CAPACITY)
+                for _ in batch
+            ]
+        except Exception as exc:
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+
+        metrics.increment("bookings.writer.batches")
+        metrics.increment("bookings.writer.requests", len(batch))
+
+        # Answer only after the batch is committed
+        for request, result in zip(batch, results, strict=True):
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
+    def write_batch(self, batch):
+        """
+        Decide and write a batch in one transaction.
+        If stock changed under the batch, decide again on locked rows.
+        Return the booking or the ValidationError of each request.
+        """
+        try:
+            with transaction.atomic():
+                return self.write(batch, lock=False)
+        except StockChanged:
+            metrics.increment("bookings.writer.reload")
+
+        with transaction.atomic():
+            return self.write(batch, lock=True)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def stop_writer(writer):
+    """
+    Unregister an idle writer. Return False if requests arrived meanwhile.
+    """
+    with _writers_lock:
+        if not writer.requests.empty():
+            return False
+        del _writers[writer.event_id]
+        return True
+
+
+def submit_booking(user, event, items, idempotency_key=None):
+    """
+    Hand a validated booking request to the event's writer and wait for it.
+    Raise the writer's ValidationError when the booking was rejected.
+    """
+    request = BookingRequest(user=user, items=items, idempotency_key=idempotency_key)
+
+    # Submit under the lock so an idle writer can't stop in between
+    with _writers_lock:
+        writer = _writers.get(event.pk)
+        if writer is None:
+            writer = _writers[event.pk] = EventWriter(event.pk)
+            writer.thread.start()
+        writer.submit(request)
+
+    try:
+        return request.future.result(timeout=settings.BOOKING_WRITER_TIMEOUT)
+    except TimeoutError:
+        if request.future.cancel():
+            metrics.increment("bookings.writer.timeout")
+            raise TransactionConflict() from None
+
+    # Already being written, the batch finishes shortly
+    return request.future.result()
+
+
+def shutdown_writers():
+    """
+    Wait for all writers to drain their queues and stop.
+    """
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.thread.join()
@@ -10,6 +10,11 @@ class BookingStatus(models.TextChoices):
     PENDING = "pending", "Pending"
     CONFIRMED = "confirmed", "Confirmed"
     CANCELLED = "cancelled", "Cancelled"
+    EXPIRED = "expired", "Expired"
+
+
+# Bookings in these statuses hold tickets
+HOLDING_BOOKING_STATUSES = [BookingStatus.PENDING, BookingStatus.CONFIRMED]
 
 
 class EventStatus(models.TextChoices):
@@ -17,3 +22,15 @@ class EventStatus(models.TextChoices):
     CANCELLED = "cancelled", "Cancelled"
     SOLD_OUT = "sold_out", "Sold Out"
     PAST = "past", "Past"
+
+
+class CancellationStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class SalesGranularity(models.TextChoices):
+    HOUR = "hour", "Hour"
+    DAY = "day", "Day"
@@ -0,0 +1,184 @@
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Count, DecimalField, Max, Sum
+from django.db.models.functions import Extract
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+def annotated_validators(view, queryset):
+    """
+    Names of the view's validator_annotations that queryset has: values the
+    body shows that can change without touching the rows' updated_at.
+    """
+    names = getattr(view, "validator_annotations", ())
+    return [name for name in names if name in queryset.query.annotations]
+
+
+def page_validators(view):
+    """
+    Validators of a paginated list: (pk, updated_at) of the rows on the
+    requested page, with their annotated_validators(). They are read like the
+    page itself (filters, ordering, cursor, index), without the other columns
+    and annotations of the serializer.
+    """
+    request = view.request
+    paginator = view.paginator
+    queryset = view.filter_queryset(view.get_queryset()).prefetch_related(None)
+    annotated = annotated_validators(view, queryset)
+
+    # The cursor positions are read from the ordering fields
+    ordering = paginator.get_ordering(request, queryset, view)
+    fields = dict.fromkeys(
+        ["pk", "updated_at", *annotated, *(f.lstrip("-") for f in ordering)]
+    )
+
+    rows = paginator.paginate_queryset(queryset.values(*fields), request, view=view)
+    return {
+        "page": [
+            (row["pk"], row["updated_at"], *(row[name] for name in annotated))
+            for row in rows
+        ]
+    }
+
+
+def object_rows(view):
+    """
+    Rows of a detail view: the object looked up by the URL, if any.
+    """
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    return view.get_queryset().filter(
+        **{view.lookup_field: view.kwargs[lookup_url_kwarg]}
+    )
+
+
+def aggregate_validators(rows, **aggregates):
+    """
+    Validators of the rows(view) queryset, aggregated in one read without
+    loading them. The count changes when rows come or go, the sum of
+    updated_at epochs whenever any row is updated, even one older than the
+    latest. The annotated_validators() are summed, and extra aggregates are
+    added to them.
+    """
+
+    def validators(view):
+        try:
+            queryset = rows(view)
+        except ValueError, ValidationError:
+            # Malformed lookup, answered with 404 by the view
+            return None
+
+        return queryset.order_by().aggregate(
+            **{
+                f"{name}_sum": Sum(name)
+                for name in annotated_validators(view, queryset)
+            },
+            count=Count("pk"),
+            last_modified=Max("updated_at"),
+            # numeric, an integer would drop the microseconds
+            modified_sum=Sum(
+                Extract("updated_at", "epoch"), output_field=DecimalField()
+            ),
+            **aggregates,
+        )
+
+    return validators
+
+
+def make_etag(request, validators, weak):
+    """
+    ETag of the representation of the rows for this URL, media type and user.
+    """
+    parts = [
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        request.user.pk,
+        *validators.values(),
+    ]
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"W/{quote_etag(digest)}" if weak else quote_etag(digest)
+
+
+def not_modified(request, response):
+    """
+    304 for a conditional GET matching the validators of a rendered response,
+    e.g. one served from a cache. None when the response must be sent.
+    """
+    if response.status_code != 200:
+        return None
+
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified")),
+        response=response,
+    )
+
+
+def conditional_get(get_validators, last_modified=False, weak=False):
+    """
+    Answer If-None-Match (and If-Modified-Since with last_modified) on a GET
+    view method with 304 before it serializes anything, and set ETag (and
+    Last-Modified) on its responses.
+
+    get_validators(view) returns a dict of values that change with the
+    response body (see page_validators and aggregate_validators), or None
+    when there's nothing to validate. Set weak when the body also shows
+    fields of related rows the validators don't cover. Last-Modified is
+    validators["last_modified"], use it for single rows only: a list also
+    changes when a row is deleted, and a second is its resolution.
+    """
+
+    def respond(request, validators):
+        """
+        Return (304 or None, ETag, Last-Modified timestamp).
+        """
+        etag = make_etag(request, validators, weak)
+        timestamp = None
+        if last_modified and validators["last_modified"] is not None:
+            timestamp = int(validators["last_modified"].timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        return response, etag, timestamp
+
+    def set_headers(response, etag, timestamp):
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def decorator(method):
+        if iscoroutinefunction(method):
+
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                validators = await sync_to_async(get_validators)(view)
+                if validators is None:
+                    return await method(view, request, *args, **kwargs)
+
+                response, etag, timestamp = respond(request, validators)
+                if response is None:
+                    response = await method(view, request, *args, **kwargs)
+                return set_headers(response, etag, timestamp)
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            validators = get_validators(view)
+            if validators is None:
+                return method(view, request, *args, **kwargs)
+
+            response, etag, timestamp = respond(request, validators)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            return set_headers(response, etag, timestamp)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer
+
+INVALID_FIELDS = "Unknown fields: {names}. Available: {available}."
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """
+    Fields of a response picked by ?fields= (keep only these) and ?omit=
+    (drop these), both comma separated.
+    """
+
+    fields: frozenset | None
+    omit: frozenset
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Return the fieldset of a GET request, None when it asks for all fields.
+        """
+
+        def names(param):
+            value = request.query_params.get(param)
+            if value is None:
+                return None
+            return frozenset(name for name in value.split(",") if name)
+
+        fields, omit = names("fields"), names("omit")
+        if request.method != "GET" or (fields is None and not omit):
+            return None
+        return cls(fields=fields, omit=omit or frozenset())
+
+    def keeps(self, name):
+        return (self.fields is None or name in self.fields) and name not in self.omit
+
+    def validate(self, available):
+        unknown = ((self.fields or frozenset()) | self.omit).difference(available)
+        if unknown:
+            raise ValidationError(
+                {
+                    "fields": INVALID_FIELDS.format(
+                        names=", ".join(sorted(unknown)),
+                        available=", ".join(available),
+                    )
+                }
+            )
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Keep only the fields of the view's fieldset (context["fieldset"]).
+    Applies to the top level serializer, nested ones keep all their fields.
+    """
+
+    # Model fields read by serializer fields that aren't model fields
+    # themselves (properties, to_representation), for SparseFieldsetMixin
+    sparse_dependencies = {}
+
+    @cached_property
+    def fields(self):
+        # After get_fields(), so fields added by its overrides are picked too
+        fields = super().fields
+
+        fieldset = self.context.get("fieldset")
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        if fieldset is None or parent is not None:
+            return fields
+
+        for name in [name for name in fields if not fieldset.keeps(name)]:
+            del fields[name]
+        return fields
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=/?omit= on the GET views of a SparseFieldsetSerializerMixin
+    serializer. The filtered queryset then reads only the columns,
+    select_related rows and prefetches the remaining fields need, and
+    sparse_fields_need() tells get_queryset() which annotations to add.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = Fieldset.from_request(self.request)
+            if self._fieldset is not None:
+                serializer = self.get_serializer_class()(
+                    context=super().get_serializer_context()
+                )
+                self._fieldset.validate(list(serializer.fields))
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
+
+    def sparse_fields_need(self, *names):
+        """
+        Whether the response has any of the named fields.
+        """
+        fieldset = self.get_fieldset()
+        return fieldset is None or any(fieldset.keeps(name) for name in names)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_fieldset() is None:
+            return queryset
+        return self.narrow_queryset(queryset)
+
+    def narrow_queryset(self, queryset):
+        """
+        Defer the columns, and drop the select_related and prefetch_related
+        lookups, that the fields of the fieldset don't read.
+        """
+        serializer = self.get_serializer()
+        model = queryset.model
+
+        # Source paths read by the kept fields, then by the cursor ordering
+        paths = []
+        for name, field in serializer.fields.items():
+            if field.source == "*":
+                # Reads the whole object, nothing to narrow
+                return queryset
+            paths.append(field.source_attrs)
+            paths.extend(
+                [dependency]
+                for dependency in serializer.sparse_dependencies.get(name, ())
+            )
+        ordering = [*self.ordering_fields_of_view(), "pk"]
+        paths.extend([name.lstrip("-")] for name in ordering)
+
+        columns, relations = {"pk"}, set()
+        for attrs in paths:
+            relations.add(attrs[0])
+            try:
+                model_field = model._meta.get_field(attrs[0])
+            except FieldDoesNotExist:
+                # Annotation, property or prefetch to_attr
+                continue
+
+            if model_field.many_to_one or model_field.one_to_one:
+                columns.add(attrs[0])
+                if len(attrs) > 1:
+                    columns.add(f"{attrs[0]}__{attrs[1]}")
+            elif not model_field.is_relation:
+                columns.add(attrs[0])
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            kept = [name for name in select_related if name in relations]
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+
+        prefetches = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if self.prefetch_root(lookup) in relations
+        ]
+        return (
+            queryset.prefetch_related(None).prefetch_related(*prefetches).only(*columns)
+        )
+
+    def ordering_fields_of_view(self):
+        ordering = getattr(self, "ordering", None) or []
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        ordering_fields = getattr(self, "ordering_fields", None) or []
+        return [*ordering, *ordering_fields]
+
+    @staticmethod
+    def prefetch_root(lookup):
+        """
+        First attribute a prefetch_related lookup sets on the objects.
+        """
+        path = getattr(lookup, "prefetch_to", lookup)
+        return path.split("__")[0]
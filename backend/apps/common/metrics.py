@@ -0,0 +1,36 @@
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger("apps.metrics")
+
+_lock = threading.Lock()
+_counters: Counter[str] = Counter()
+
+
+def increment(name, value=1):
+    """
+    Add value to an in-process counter and log it for log-based metrics.
+    """
+    with _lock:
+        _counters[name] += value
+        total = _counters[name]
+    logger.info("metric %s +%s (total=%s)", name, value, total)
+
+
+def get_count(name):
+    with _lock:
+        return _counters[name]
+
+
+def snapshot():
+    """
+    Return a copy of all counters.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination in the order of the view: its OrderingFilter, else its
+    `ordering` attribute. Pages are read with `WHERE <first field> > <cursor>`,
+    so no COUNT(*) and no OFFSET scan over the pages before.
+
+    The cursor only filters on the first ordering field: rows sharing the
+    cursor's value are stepped over with an OFFSET, so pages of a widely
+    shared value get slower the deeper they are. The primary key is added
+    to the ordering so that rows sharing a value keep a stable order across
+    pages.
+    """
+
+    ordering = "-pk"
+
+    def get_ordering(self, request, queryset, view):
+        self.ordering = getattr(view, "ordering", None) or self.ordering
+        ordering = super().get_ordering(request, queryset, view)
+
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            direction = "-" if ordering[0].startswith("-") else ""
+            ordering = (*ordering, f"{direction}id")
+        return ordering
@@ -0,0 +1,136 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types neither library encodes natively (Decimal, lazy strings, querysets,
+# timedelta...) are converted like DRF's JSONRenderer does
+encode_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson: same media type and output for API
+    data, several times faster on large pages.
+
+    Datetimes (with Z for UTC) and UUIDs are encoded natively, without the
+    per-object callback of the json module. Any indent pretty prints with 2
+    spaces, the only one orjson has.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        # Validation errors of list items are keyed by index, like json
+        # turn the keys into strings
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            option |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=encode_default, option=option)
+
+        # Keep the output a strict JavaScript subset, like JSONRenderer
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack for clients sending Accept: application/msgpack (or
+    ?format=msgpack): the JSON data in a smaller binary encoding.
+    Datetimes and decimals are strings as in JSON.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+def export_default(obj):
+    """
+    encode_default for exports: decimals as exact strings, like the API's
+    DecimalFields, rather than floats.
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return encode_default(obj)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Rows of an export as CSV. render() is for the error responses of the
+    view, rows are streamed with render_header() and render_rows().
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        columns = list(data)
+        return self.render_header(columns) + self.render_rows(columns, [data.values()])
+
+    def render_header(self, columns):
+        return self.render_rows(columns, [columns])
+
+    def render_rows(self, columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [
+                export_default(value) if isinstance(value, datetime) else value
+                for value in row
+            ]
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Rows of an export as newline delimited JSON objects, see CSVRenderer.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return self.render_object(data)
+
+    def render_header(self, columns):
+        return b""
+
+    def render_rows(self, columns, rows):
+        return b"".join(
+            self.render_object(dict(zip(columns, row, strict=True))) for row in rows
+        )
+
+    def render_object(self, data):
+        return (
+            orjson.dumps(
+                data,
+                default=export_default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+            + b"\n"
+        )
@@ -0,0 +1,72 @@
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.common import metrics
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL error codes worth retrying the whole transaction for
+RETRYABLE_SQLSTATES = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock_detected",
+}
+
+
+class TransactionConflict(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many concurrent requests. Please try again."
+    default_code = "transaction_conflict"
+
+
+def retryable_reason(exc):
+    """
+    Return the conflict name if exc is a deadlock or serialization failure.
+    """
+    sqlstate = getattr(exc.__cause__, "sqlstate", None)
+    return RETRYABLE_SQLSTATES.get(sqlstate)
+
+
+def atomic_with_retry(func, *args, metric, **kwargs):
+    """
+    Run func inside transaction.atomic() and retry it on deadlocks and
+    serialization failures, sleeping with full jitter between attempts.
+
+    Retries are only possible when this opens the outermost transaction.
+    Emits "<metric>.retry.<reason>" and "<metric>.conflict" counters.
+    """
+    attempts = settings.TRANSACTION_RETRY_ATTEMPTS
+    base_delay = settings.TRANSACTION_RETRY_BASE_DELAY
+
+    # Locks taken by an outer transaction would still be held on retry
+    if connection.in_atomic_block:
+        attempts = 1
+
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as exc:
+            reason = retryable_reason(exc)
+            if reason is None:
+                raise
+
+            metrics.increment(f"{metric}.retry.{reason}")
+            if attempt == attempts:
+                metrics.increment(f"{metric}.conflict")
+                raise TransactionConflict() from exc
+
+            delay = random.uniform(0, base_delay * 2 ** (attempt - 1))
+            logger.warning(
+                "%s: %s on attempt %s, retrying in %.3fs",
+                metric,
+                reason,
+                attempt,
+                delay,
+            )
+            time.sleep(delay)
@@ -0,0 +1,54 @@
+from adrf.generics import GenericAPIView
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404
+from rest_framework.response import Response
+
+from apps.common.pagination import KeysetPagination
+
+
+class AsyncListAPIView(GenericAPIView):
+    """
+    List view served on the event loop.
+
+    Filter backends only build the query, the one-query keyset page is read
+    in a worker thread and the serializer works on loaded rows. The queryset
+    must select_related/prefetch_related everything the serializer reads.
+    """
+
+    pagination_class = KeysetPagination
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+
+class AsyncRetrieveAPIView(GenericAPIView):
+    """
+    Detail view served on the event loop, see AsyncListAPIView.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except ObjectDoesNotExist, TypeError, ValueError:
+            raise Http404 from None
+
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,137 @@
+import hashlib
+import time
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.common.conditional import not_modified
+
+LIST_VERSION_KEY = "events:list:version"
+
+
+def event_version_key(event_id):
+    return f"events:{event_id}:version"
+
+
+def new_versions(keys):
+    """
+    Start the versions missing from the cache (never set or evicted) at the
+    current time, so they can't come back to a number used before.
+    """
+    start = time.time_ns()
+    for key in keys:
+        cache.add(key, start, timeout=None)
+    return cache.get_many(keys)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not in the cache, the next read starts a new version
+        pass
+
+
+def invalidate_event(event_id, listing=False):
+    """
+    Drop the cached responses of an event, and of the event list when
+    listing is set, once the current transaction commits. Dropping them
+    earlier would let a concurrent read cache the old rows again.
+    """
+    keys = [event_version_key(event_id)]
+    if listing:
+        keys.append(LIST_VERSION_KEY)
+
+    def bump():
+        for key in keys:
+            bump_version(key)
+
+    transaction.on_commit(bump)
+
+
+def response_cache_key(request, version_keys):
+    """
+    Key of the response to request under the current versions,
+    or None when the request isn't served from the shared cache.
+    """
+    if request.method != "GET" or request.user.is_authenticated:
+        return None
+
+    versions = cache.get_many(version_keys)
+    if len(versions) < len(version_keys):
+        versions = new_versions(version_keys)
+
+    version = ".".join(str(versions[key]) for key in version_keys)
+    path = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False)
+    return (
+        f"events:response:{version}:{request.accepted_renderer.format}:"
+        f"{path.hexdigest()}"
+    )
+
+
+def lookup_response(request, version_keys):
+    """
+    Return (key, cached response), both None when the request isn't cached
+    (version_keys is None for requests that can't name a cached event).
+    """
+    key = version_keys and response_cache_key(request, version_keys)
+    return key, key and cache.get(key)
+
+
+def cache_response(timeout_setting, event_kwarg=None):
+    """
+    Serve anonymous GETs of a view method from the shared cache, keyed by the
+    full query string and the version of the event named by the event_kwarg
+    URL argument, or of the event list without one.
+
+    Entries are dropped by bumping the version (see invalidate_event) and
+    expire after timeout_setting seconds either way. A cached response
+    answers conditional GETs with its own ETag and Last-Modified.
+    """
+
+    def get_version_keys(view):
+        if event_kwarg is None:
+            return [LIST_VERSION_KEY]
+        try:
+            # "05" must not get a version of its own, saving event 5 won't bump it
+            return [event_version_key(int(view.kwargs[event_kwarg]))]
+        except ValueError:
+            return None
+
+    def store(response, key):
+        # Stored once rendered, an unrendered response can't be pickled
+        if key and response.status_code == 200:
+            timeout = getattr(settings, timeout_setting)
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered, timeout)
+            )
+        return response
+
+    def decorator(method):
+        if iscoroutinefunction(method):
+
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                key, response = await sync_to_async(lookup_response)(
+                    request, get_version_keys(view)
+                )
+                if response is None:
+                    return store(await method(view, request, *args, **kwargs), key)
+                return not_modified(request, response) or response
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key, response = lookup_response(request, get_version_keys(view))
+            if response is None:
+                return store(method(view, request, *args, **kwargs), key)
+            return not_modified(request, response) or response
+
+        return wrapper
+
+    return decorator
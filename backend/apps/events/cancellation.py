@@ -0,0 +1,162 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingItem
+from apps.bookings.reservations import release_booked_tickets
+from apps.common import metrics
+from apps.common.choices import (
+    HOLDING_BOOKING_STATUSES,
+    BookingStatus,
+    CancellationStatus,
+)
+
+from .models import EventCancellation, TicketType
+
+logger = logging.getLogger(__name__)
+
+
+def start_event_cancellation(event):
+    """
+    Stop sales of a cancelled event and cancel its bookings in the background,
+    or right away when EVENT_CANCELLATION_IN_BACKGROUND is off.
+    Return the EventCancellation reporting the progress.
+    """
+    # No new bookings from here on
+    TicketType.objects.filter(event=event).update(
+        is_active=False, updated_at=timezone.now()
+    )
+
+    cancellation, _ = EventCancellation.objects.update_or_create(
+        event=event,
+        defaults={
+            "status": CancellationStatus.PENDING,
+            "bookings_total": Booking.objects.filter(
+                event=event, status__in=HOLDING_BOOKING_STATUSES
+            ).count(),
+            "bookings_cancelled": 0,
+            "last_booking_id": 0,
+            "started_at": timezone.now(),
+            "finished_at": None,
+        },
+    )
+
+    if settings.EVENT_CANCELLATION_IN_BACKGROUND:
+        # The job must see the cancelled event
+        transaction.on_commit(lambda: run_in_background(cancellation.pk))
+    else:
+        run_cancellation(cancellation.pk)
+    return cancellation
+
+
+def cancel_bookings_chunk(cancellation_id, chunk_size):
+    """
+    Cancel the next chunk_size bookings after the job's keyset cursor and
+    release their tickets. Must be called inside transaction.atomic().
+    Return True when no bookings are left.
+    """
+    # Runners of the same job (e.g. a resumed one) take turns
+    cancellation = EventCancellation.objects.select_for_update().get(pk=cancellation_id)
+    if cancellation.status == CancellationStatus.DONE:
+        return True
+
+    # Locked, so a concurrent cancel or the expiry sweeper can't release them too
+    booking_ids = list(
+        Booking.objects.filter(
+            event_id=cancellation.event_id,
+            status__in=HOLDING_BOOKING_STATUSES,
+            pk__gt=cancellation.last_booking_id,
+        )
+        .order_by("pk")
+        .select_for_update()
+        .values_list("pk", flat=True)[:chunk_size]
+    )
+
+    now = timezone.now()
+    if booking_ids:
+        Booking.objects.filter(pk__in=booking_ids).update(
+            status=BookingStatus.CANCELLED, cancelled_at=now, updated_at=now
+        )
+        release_booked_tickets(
+            BookingItem.objects.filter(booking_id__in=booking_ids), now
+        )
+
+        cancellation.last_booking_id = booking_ids[-1]
+        cancellation.bookings_cancelled += len(booking_ids)
+
+    done = len(booking_ids) < chunk_size
+    if done:
+        cancellation.status = CancellationStatus.DONE
+        cancellation.finished_at = now
+    else:
+        cancellation.status = CancellationStatus.RUNNING
+    cancellation.save()
+
+    return done
+
+
+def run_cancellation(cancellation_id, chunk_size=None):
+    """
+    Cancel all bookings of the job, one transaction per chunk.
+    Picks up after the last finished chunk, so a failed job can be run again.
+    """
+    chunk_size = chunk_size or settings.EVENT_CANCELLATION_CHUNK_SIZE
+
+    try:
+        while True:
+            with transaction.atomic():
+                if cancel_bookings_chunk(cancellation_id, chunk_size):
+                    break
+    except Exception:
+        EventCancellation.objects.filter(pk=cancellation_id).update(
+            status=CancellationStatus.FAILED
+        )
+        metrics.increment("events.cancellation.failed")
+        raise
+
+    metrics.increment("events.cancellation.done")
+
+
+_threads = set()
+_threads_lock = threading.Lock()
+
+
+def run_in_background(cancellation_id):
+    """
+    Start the job in a thread of this process. Not a daemon, so a graceful
+    shutdown lets it finish. A job stopped anyway is resumed from its cursor
+    by resume_event_cancellations, which the sweeper service runs.
+    """
+    thread = threading.Thread(
+        target=run_cancellation_thread,
+        args=(cancellation_id,),
+        name=f"event-cancellation-{cancellation_id}",
+    )
+    with _threads_lock:
+        _threads.add(thread)
+    thread.start()
+
+
+def run_cancellation_thread(cancellation_id):
+    try:
+        run_cancellation(cancellation_id)
+    except Exception:
+        # Left as failed for resume_event_cancellations
+        logger.exception("Event cancellation %s failed", cancellation_id)
+    finally:
+        connection.close()
+        with _threads_lock:
+            _threads.discard(threading.current_thread())
+
+
+def wait_for_cancellations():
+    """
+    Wait for all background cancellations of this process to finish.
+    """
+    with _threads_lock:
+        threads = list(_threads)
+    for thread in threads:
+        thread.join()
@@ -7,6 +7,9 @@ class EventMessages:
     END_TIME_IS_PAST = "End time cannot be in the past."
     END_TIME_SHOULD_BE_AFTER_START = "End time must be after start time."
     INVALID_STATUS_ON_CREATE = f"Only '{EventStatus.UPCOMING}' events can be created."
+    CAPACITY_BELOW_TICKETS_SOLD = "Capacity cannot be less than tickets already sold."
+    INVALID_EXPAND = "Cannot expand: {names}. Expandable: {expandable}."
+    STATS_SINCE_AFTER_UNTIL = "since must be before until."
 
 
 class TicketTypeMessages:
@@ -0,0 +1,23 @@
+from rest_framework import filters
+
+
+class EventSearchFilter(filters.SearchFilter):
+    """
+    ?search= through Event.objects.search: ranked full-text search with
+    prefix matching, and trigram matching of names for typos.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.search(" ".join(self.get_search_terms(request)))
+
+
+class EventOrderingFilter(filters.OrderingFilter):
+    """
+    Most relevant events first while searching, unless ?ordering= is given.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        searching = "rank" in queryset.query.annotations
+        if searching and not request.query_params.get(self.ordering_param):
+            return ["-rank"]
+        return super().get_ordering(request, queryset, view)
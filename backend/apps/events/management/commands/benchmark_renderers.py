@@ -0,0 +1,82 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.parsers import MessagePackParser, ORJSONParser
+from apps.common.renderers import MessagePackRenderer, ORJSONRenderer
+from apps.events.models import Event
+from apps.events.serializers import EventSerializer
+
+# (name, renderer, parser), the first one is the baseline
+CODECS = [
+    ("json (DRF)", JSONRenderer(), JSONParser()),
+    ("orjson", ORJSONRenderer(), ORJSONParser()),
+    ("msgpack", MessagePackRenderer(), MessagePackParser()),
+]
+
+
+def best_time(repeat, function, *args):
+    """
+    Fastest of repeat calls of function(*args), in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def parse(parser, body):
+    return parser.parse(io.BytesIO(body))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time rendering and parsing an event list page with the DRF JSON "
+        "renderer and the orjson and MessagePack codecs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=100,
+            help="Events on the page (default: 100).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Runs per codec, the fastest is reported (default: 50).",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.with_ticket_summary().select_related("organizer")[
+            : options["events"]
+        ]
+        # Serialized once, only the codecs are timed
+        data = EventSerializer(events, many=True).data
+        if not data:
+            raise CommandError("No events to render, create some first.")
+
+        self.stdout.write(
+            f"{len(data)} events, best of {options['repeat']} runs\n"
+            f"{'codec':<12}{'bytes':>10}{'render ms':>12}{'parse ms':>12}"
+            f"{'speedup':>10}"
+        )
+
+        baseline = None
+        for name, renderer, parser in CODECS:
+            body = renderer.render(data)
+            render_ms = best_time(options["repeat"], renderer.render, data)
+            parse_ms = best_time(options["repeat"], parse, parser, body)
+            baseline = baseline or render_ms
+
+            self.stdout.write(
+                f"{name:<12}{len(body):>10}{render_ms:>12.3f}{parse_ms:>12.3f}"
+                f"{baseline / render_ms:>9.1f}x"
+            )
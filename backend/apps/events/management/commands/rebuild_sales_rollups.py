@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event
+from apps.events.rollups import rebuild_sales
+
+
+class Command(BaseCommand):
+    help = "Recompute the sales rollups of events from their booking items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_ids",
+            nargs="*",
+            type=int,
+            help="Only rebuild these events (default: all events).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Booking items read per round trip.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.order_by("pk")
+        if options["event_ids"]:
+            events = events.filter(pk__in=options["event_ids"])
+
+        # One transaction per event, bookings of the others go on meanwhile
+        event_ids = list(events.values_list("pk", flat=True))
+        for event_id in event_ids:
+            rebuild_sales(event_id, chunk_size=options["chunk_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the sales of {len(event_ids)} event(s).")
+        )
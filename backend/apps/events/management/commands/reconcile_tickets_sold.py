@@ -0,0 +1,113 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.bookings.models import BookingItem
+from apps.common.choices import HOLDING_BOOKING_STATUSES
+from apps.events.models import Event, EventCounterShard, shard_tickets_sold
+
+
+def booked_quantity():
+    """
+    Subquery of tickets held by pending and confirmed bookings of the outer event.
+    """
+    return Coalesce(
+        Subquery(
+            BookingItem.objects.filter(
+                booking__event=OuterRef("pk"),
+                booking__status__in=HOLDING_BOOKING_STATUSES,
+            )
+            .values("booking__event")
+            .annotate(total=Sum("quantity"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def reconcile_event(event_id):
+    """
+    Set the tickets sold of an event to its booked quantity, folding the
+    counter shards into the event row. Return True when it had drifted.
+
+    The shards are locked in index order, then the event row, the order of
+    release_booked_tickets(), so a booking counting on a shard or a release
+    committing meanwhile is either waited for or left out of both readings.
+    Shards created after the lock aren't folded and keep their tickets.
+    """
+    with transaction.atomic():
+        shards = dict(
+            EventCounterShard.objects.select_for_update()
+            .filter(event_id=event_id)
+            .order_by("index")
+            .values_list("pk", "tickets_sold")
+        )
+        # One statement, so both readings see the same committed bookings
+        event = (
+            Event.objects.select_for_update()
+            .annotate(
+                counted=F("tickets_sold") + shard_tickets_sold(),
+                expected=booked_quantity(),
+            )
+            .get(pk=event_id)
+        )
+        drift = event.expected - event.counted
+        if not drift:
+            return False
+
+        Event.objects.filter(pk=event_id).update(
+            tickets_sold=F("tickets_sold") + sum(shards.values()) + drift,
+            updated_at=timezone.now(),
+        )
+        EventCounterShard.objects.filter(pk__in=shards).delete()
+        return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Event.tickets_sold from booking items, folding the event "
+        "counter shards into it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_ids",
+            nargs="*",
+            type=int,
+            help="Only reconcile these events (default: all events).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted events without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["event_ids"]:
+            events = events.filter(pk__in=options["event_ids"])
+
+        drifted = events.annotate(
+            counted=F("tickets_sold") + shard_tickets_sold(),
+            expected=booked_quantity(),
+        ).filter(~Q(counted=F("expected")))
+
+        for event in drifted:
+            self.stdout.write(
+                f"Event {event.pk}: tickets_sold={event.counted}, "
+                f"expected={event.expected}"
+            )
+
+        if options["dry_run"]:
+            return
+
+        # One event per transaction, under the locks of its counters
+        updated = sum(
+            reconcile_event(event_id)
+            for event_id in drifted.values_list("pk", flat=True)
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {updated} event(s)."))
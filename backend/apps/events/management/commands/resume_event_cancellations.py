@@ -0,0 +1,36 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.common.choices import CancellationStatus
+from apps.events.cancellation import run_cancellation
+from apps.events.models import EventCancellation
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Finish event cancellations interrupted by a restart or a failure."
+
+    def handle(self, *args, **options):
+        unfinished = list(
+            EventCancellation.objects.exclude(
+                status=CancellationStatus.DONE
+            ).values_list("pk", flat=True)
+        )
+
+        # Jobs still running in a web process take turns with this one
+        failed = 0
+        for cancellation_id in unfinished:
+            try:
+                run_cancellation(cancellation_id)
+            except Exception:
+                # Left as failed for the next run, the other jobs go on
+                logger.exception("Event cancellation %s failed", cancellation_id)
+                failed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Finished {len(unfinished) - failed} cancellation(s).")
+        )
+        if failed:
+            self.stderr.write(self.style.ERROR(f"{failed} cancellation(s) failed."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.models import TicketType
+from apps.events.sharding import disable_sharding, enable_sharding
+
+
+class Command(BaseCommand):
+    help = "Split a ticket type's stock over N shard rows (0 merges them back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ticket_type_id", type=int)
+        parser.add_argument("shards", type=int, help="Number of shards, 0 to merge.")
+
+    def handle(self, *args, **options):
+        try:
+            ticket_type = TicketType.objects.get(pk=options["ticket_type_id"])
+        except TicketType.DoesNotExist:
+            raise CommandError("Ticket type does not exist.") from None
+
+        shards = options["shards"]
+        if shards < 0:
+            raise CommandError("Number of shards cannot be negative.")
+
+        if shards:
+            enable_sharding(ticket_type, shards)
+            self.stdout.write(
+                self.style.SUCCESS(f"Split {ticket_type} over {shards} shard(s).")
+            )
+        else:
+            disable_sharding(ticket_type)
+            self.stdout.write(self.style.SUCCESS(f"Merged shards of {ticket_type}."))
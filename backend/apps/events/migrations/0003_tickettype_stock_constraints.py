@@ -0,0 +1,26 @@
+# Generated by Django 6.1.2 on 2026-10-17 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_alter_event_description_alter_tickettype_description"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="tickettype",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("quantity_available__gte", 0)),
+                name="ticket_type_quantity_available_non_negative",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tickettype",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("quantity_sold__gte", 0)),
+                name="ticket_type_quantity_sold_non_negative",
+            ),
+        ),
+    ]
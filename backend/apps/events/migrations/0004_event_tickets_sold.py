@@ -0,0 +1,46 @@
+# Generated by Django 6.1.2 on 2026-10-17 17:56
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_tickets_sold(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    BookingItem = apps.get_model("bookings", "BookingItem")
+
+    sold = (
+        BookingItem.objects.filter(booking__event=OuterRef("pk"))
+        .exclude(booking__status="cancelled")
+        .values("booking__event")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    Event.objects.update(
+        tickets_sold=Coalesce(Subquery(sold, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_tickettype_stock_constraints"),
+        ("bookings", "0002_booking_cancelled_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_tickets_sold, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="event",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("tickets_sold__lte", models.F("total_capacity"))),
+                name="event_tickets_sold_within_capacity",
+            ),
+        ),
+    ]
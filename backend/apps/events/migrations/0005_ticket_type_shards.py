@@ -0,0 +1,60 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_event_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tickettype",
+            name="shard_count",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="TicketTypeShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveSmallIntegerField()),
+                ("quantity_available", models.PositiveIntegerField(default=0)),
+                ("quantity_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "ticket_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shards",
+                        to="events.tickettype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["index"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ticket_type", "index"),
+                        name="unique_shard_index_per_ticket_type",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("quantity_available__gte", 0)),
+                        name="ticket_type_shard_quantity_available_non_negative",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("quantity_sold__gte", 0)),
+                        name="ticket_type_shard_quantity_sold_non_negative",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:04
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_ticket_type_shards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="admission_rate",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
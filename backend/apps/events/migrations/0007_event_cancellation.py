@@ -0,0 +1,54 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_waiting_room"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventCancellation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("bookings_total", models.PositiveIntegerField(default=0)),
+                ("bookings_cancelled", models.PositiveIntegerField(default=0)),
+                ("last_booking_id", models.PositiveBigIntegerField(default=0)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cancellation",
+                        to="events.event",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0007_event_cancellation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["start_time", "id"], name="event_start_time_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.1.2 on 2026-10-17 18:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_event_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["status", "start_time", "id"],
+                name="event_status_start_time_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["location", "start_time", "id"], name="event_location_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tickettype",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["event", "price"],
+                name="ticket_type_active_price_idx",
+            ),
+        ),
+    ]
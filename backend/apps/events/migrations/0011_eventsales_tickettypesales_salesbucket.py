@@ -0,0 +1,130 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventSales",
+            fields=[
+                ("bookings", models.PositiveIntegerField(default=0)),
+                ("bookings_cancelled", models.PositiveIntegerField(default=0)),
+                ("tickets_booked", models.PositiveIntegerField(default=0)),
+                ("tickets_cancelled", models.PositiveIntegerField(default=0)),
+                (
+                    "gross_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "cancelled_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sales",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="TicketTypeSales",
+            fields=[
+                ("bookings", models.PositiveIntegerField(default=0)),
+                ("bookings_cancelled", models.PositiveIntegerField(default=0)),
+                ("tickets_booked", models.PositiveIntegerField(default=0)),
+                ("tickets_cancelled", models.PositiveIntegerField(default=0)),
+                (
+                    "gross_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "cancelled_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "ticket_type",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sales",
+                        serialize=False,
+                        to="events.tickettype",
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ticket_type_sales",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="SalesBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bookings", models.PositiveIntegerField(default=0)),
+                ("bookings_cancelled", models.PositiveIntegerField(default=0)),
+                ("tickets_booked", models.PositiveIntegerField(default=0)),
+                ("tickets_cancelled", models.PositiveIntegerField(default=0)),
+                (
+                    "gross_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "cancelled_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")], max_length=4
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_buckets",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "granularity", "start"),
+                        name="unique_sales_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.1.2 on 2026-10-17 20:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0011_eventsales_tickettypesales_salesbucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventCounterShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveSmallIntegerField()),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="counter_shards",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["index"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "index"),
+                        name="unique_counter_shard_index_per_event",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("tickets_sold__gte", 0)),
+                        name="event_counter_shard_tickets_sold_non_negative",
+                    ),
+                ],
+            },
+        ),
+    ]
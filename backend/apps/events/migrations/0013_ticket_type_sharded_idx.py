@@ -0,0 +1,20 @@
+# Generated by Django 6.1.2 on 2026-10-17 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_event_counter_shards"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tickettype",
+            index=models.Index(
+                condition=models.Q(("shard_count__gt", 0)),
+                fields=["id"],
+                name="ticket_type_sharded_idx",
+            ),
+        ),
+    ]
@@ -1,11 +1,123 @@
+import re
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
 from django.core.validators import MinLengthValidator, MinValueValidator
 from django.db import models
+from django.db.models import Case, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThanOrEqual, IsNull
+from django.utils import timezone
 
-from apps.common.choices import EventStatus
+from apps.common.choices import CancellationStatus, EventStatus, SalesGranularity
 
 User = get_user_model()
 
+# Text search configuration of Event.search_vector
+SEARCH_CONFIG = "english"
+
+
+def shard_tickets_sold():
+    """
+    Subquery of the tickets sold counted on the counter shards of the outer
+    event.
+    """
+    return Coalesce(
+        Subquery(
+            EventCounterShard.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(total=Sum("tickets_sold"))
+            .values("total"),
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+class EventQuerySet(models.QuerySet):
+    def with_tickets_sold(self):
+        """
+        Annotate the tickets sold counted on counter shards, for
+        Event.total_tickets_sold.
+        """
+        return self.annotate(shard_tickets_sold=shard_tickets_sold())
+
+    def with_ticket_summary(self):
+        """
+        Annotate the price range of the active ticket types and is_sold_out,
+        computed by subqueries in the same SELECT.
+        """
+        active = TicketType.objects.filter(event=OuterRef("pk"), is_active=True)
+        in_stock = active.filter(
+            Q(quantity_available__gt=0) | Q(shards__quantity_available__gt=0)
+        )
+        return self.annotate(
+            min_price=Subquery(active.order_by("price").values("price")[:1]),
+            max_price=Subquery(active.order_by("-price").values("price")[:1]),
+            # No capacity left, or every ticket type on sale ran out. LIMIT 1
+            # subqueries rather than EXISTS, which PostgreSQL may plan as a
+            # hash of all ticket types, however few events are on the page.
+            is_sold_out=Case(
+                When(
+                    GreaterThanOrEqual(
+                        F("tickets_sold") + shard_tickets_sold(), F("total_capacity")
+                    ),
+                    then=Value(True),
+                ),
+                When(
+                    Q(min_price__isnull=False)
+                    & IsNull(Subquery(in_stock.values("pk")[:1]), True),
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+    def search(self, text):
+        """
+        Events matching every word of text, each as a prefix, in the name or
+        description, annotated with their relevance as rank.
+
+        Names within a typo of text match too (pg_trgm word similarity), ranked
+        below every full-text match. Both conditions are served by GIN indexes.
+        """
+        words = re.findall(r"[^\W_]+", text)
+        if not words:
+            return self
+
+        text = " ".join(words)
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        return self.filter(
+            Q(search_vector=query) | Q(name__trigram_word_similar=text)
+        ).annotate(
+            rank=Cast(
+                Case(
+                    # Normalized to [0, 1), so full-text matches come first
+                    When(
+                        search_vector=query,
+                        then=1
+                        + SearchRank(F("search_vector"), query, normalization=32),
+                    ),
+                    default=TrigramWordSimilarity(text, "name"),
+                ),
+                # Exact in cursors, ts_rank() returns a real
+                models.FloatField(),
+            )
+        )
+
 
 class Event(models.Model):
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="events")
@@ -15,25 +127,117 @@ class Event(models.Model):
     end_time = models.DateTimeField(blank=True, null=True)
     location = models.CharField(max_length=255)
     total_capacity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    # Denormalized sum of booked tickets, adjusted atomically with F() expressions.
+    # Bookings that don't claim capacity count on EventCounterShard rows instead.
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
     status = models.CharField(
         max_length=10, choices=EventStatus, default=EventStatus.UPCOMING
     )
+    # Maintained by PostgreSQL on every write, name weighs more than description
+    search_vector = models.GeneratedField(
+        expression=SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    # Booking attempts per second let through the waiting room (null = no queue)
+    admission_rate = models.PositiveIntegerField(
+        null=True, blank=True, validators=[MinValueValidator(1)]
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         ordering = ["start_time"]  # Default ordering by date
+        indexes = [
+            # Keyset pages of the event list: ORDER BY start_time, id
+            models.Index(fields=["start_time", "id"], name="event_start_time_id_idx"),
+            # ?status= and ?location= lists, in the same order
+            models.Index(
+                fields=["status", "start_time", "id"],
+                name="event_status_start_time_idx",
+            ),
+            models.Index(
+                fields=["location", "start_time", "id"],
+                name="event_location_start_idx",
+            ),
+            # ?search=: full-text matches, and names within a typo
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            GinIndex(
+                fields=["name"], opclasses=["gin_trgm_ops"], name="event_name_trgm_idx"
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(tickets_sold__lte=models.F("total_capacity")),
+                name="event_tickets_sold_within_capacity",
+            )
+        ]
 
     def __str__(self):
         return self.name
 
     @property
     def total_tickets_sold(self):
-        try:
-            return sum(tt.quantity_sold for tt in self.ticket_types.all())  # type: ignore[attr-defined]
-        except Exception as e:
-            print(f"Error fetching ticket_types: {e}")
-            return 0
+        """
+        Tickets sold, on the event row and its counter shards. The shards are
+        annotated by EventQuerySet.with_tickets_sold() or read here.
+        """
+        on_shards = getattr(self, "shard_tickets_sold", None)
+        if on_shards is None:
+            on_shards = (
+                self.counter_shards.aggregate(total=Sum("tickets_sold"))["total"] or 0
+            )
+        return self.tickets_sold + on_shards
+
+    @property
+    def tickets_remaining(self):
+        return self.total_capacity - self.total_tickets_sold
+
+
+class EventCounterShard(models.Model):
+    """
+    Sub-counter holding part of an event's tickets sold.
+    Bookings of events whose ticket stock fits in their capacity count their
+    tickets here rather than on the event row (see
+    apps.bookings.reservations.claim_event_capacity).
+    """
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="counter_shards"
+    )
+    index = models.PositiveSmallIntegerField()
+    tickets_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("event", "index"),
+                name="unique_counter_shard_index_per_event",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(tickets_sold__gte=0),
+                name="event_counter_shard_tickets_sold_non_negative",
+            ),
+        ]
+        ordering = ["index"]
+
+    def __str__(self):
+        return f"{self.event} - counter shard {self.index}"
+
+
+class TicketTypeQuerySet(models.QuerySet):
+    def with_shard_totals(self):
+        """
+        Annotate the stock of sharded ticket types, summed over their shards
+        by TicketTypeSerializer.
+        """
+        return self.annotate(
+            shard_quantity_available=Sum("shards__quantity_available"),
+            shard_quantity_sold=Sum("shards__quantity_sold"),
+        )
 
 
 class TicketType(models.Model):
@@ -50,9 +254,13 @@ class TicketType(models.Model):
     quantity_available = models.PositiveIntegerField()
     quantity_sold = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    # Number of TicketTypeShard rows holding the stock (0 = not sharded)
+    shard_count = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TicketTypeQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -61,9 +269,169 @@ class TicketType(models.Model):
                     "name",
                 ),
                 name="unique_ticket_type_name_per_event",
-            )
+            ),
+            # Last line of defense for guarded stock updates
+            models.CheckConstraint(
+                condition=models.Q(quantity_available__gte=0),
+                name="ticket_type_quantity_available_non_negative",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(quantity_sold__gte=0),
+                name="ticket_type_quantity_sold_non_negative",
+            ),
         ]  # A event cannot have two ticket types with the same name
+        indexes = [
+            # Price range of the ticket types on sale (EventQuerySet.with_ticket_summary)
+            models.Index(
+                fields=["event", "price"],
+                condition=models.Q(is_active=True),
+                name="ticket_type_active_price_idx",
+            ),
+            # The few sharded ticket types, looked up when bookings are released
+            models.Index(
+                fields=["id"],
+                condition=models.Q(shard_count__gt=0),
+                name="ticket_type_sharded_idx",
+            ),
+        ]
         ordering = ["price"]  # Default ordering by price
 
     def __str__(self):
         return f"{self.event.name} - {self.name}"
+
+
+class TicketTypeShard(models.Model):
+    """
+    Sub-counter holding part of a sharded ticket type's stock.
+    Spreads row lock contention of a hot ticket type over several rows.
+    """
+
+    ticket_type = models.ForeignKey(
+        TicketType, on_delete=models.CASCADE, related_name="shards"
+    )
+    index = models.PositiveSmallIntegerField()
+    quantity_available = models.PositiveIntegerField(default=0)
+    quantity_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("ticket_type", "index"),
+                name="unique_shard_index_per_ticket_type",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(quantity_available__gte=0),
+                name="ticket_type_shard_quantity_available_non_negative",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(quantity_sold__gte=0),
+                name="ticket_type_shard_quantity_sold_non_negative",
+            ),
+        ]
+        ordering = ["index"]
+
+    def __str__(self):
+        return f"{self.ticket_type} - shard {self.index}"
+
+
+class EventCancellation(models.Model):
+    """
+    Progress of cancelling the bookings of a cancelled event in the background.
+    """
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, related_name="cancellation"
+    )
+    status = models.CharField(
+        max_length=10, choices=CancellationStatus, default=CancellationStatus.PENDING
+    )
+    bookings_total = models.PositiveIntegerField(default=0)
+    bookings_cancelled = models.PositiveIntegerField(default=0)
+    # Keyset cursor: bookings up to this id are done
+    last_booking_id = models.PositiveBigIntegerField(default=0)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Cancellation of {self.event} ({self.status})"
+
+
+class SalesTotals(models.Model):
+    """
+    Counters of a sales rollup, kept up to date by apps.events.rollups in
+    the transactions that book and release tickets. Booked counts every
+    booking made, held or not since: booked minus cancelled is what's sold.
+    """
+
+    bookings = models.PositiveIntegerField(default=0)
+    bookings_cancelled = models.PositiveIntegerField(default=0)
+    tickets_booked = models.PositiveIntegerField(default=0)
+    tickets_cancelled = models.PositiveIntegerField(default=0)
+    gross_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cancelled_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def tickets_sold(self):
+        return self.tickets_booked - self.tickets_cancelled
+
+    @property
+    def net_revenue(self):
+        return self.gross_revenue - self.cancelled_revenue
+
+
+class EventSales(SalesTotals):
+    """
+    Sales rollup of an event.
+    """
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="sales"
+    )
+
+    def __str__(self):
+        return f"Sales of {self.event_id}"
+
+
+class TicketTypeSales(SalesTotals):
+    """
+    Sales rollup of a ticket type. Bookings count those with the ticket type.
+    """
+
+    ticket_type = models.OneToOneField(
+        TicketType, on_delete=models.CASCADE, primary_key=True, related_name="sales"
+    )
+    # Ticket type rollups of an event are read together
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="ticket_type_sales"
+    )
+
+    def __str__(self):
+        return f"Sales of ticket type {self.ticket_type_id}"
+
+
+class SalesBucket(SalesTotals):
+    """
+    Sales rollup of an event over an hour or a day (UTC). Bookings count in
+    the bucket they were made in, cancellations in the one they happened in.
+    """
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="sales_buckets"
+    )
+    granularity = models.CharField(max_length=4, choices=SalesGranularity)
+    start = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            # Also serves the timeline: WHERE event AND granularity ORDER BY start
+            models.UniqueConstraint(
+                fields=("event", "granularity", "start"),
+                name="unique_sales_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Sales of {self.event_id} per {self.granularity} at {self.start}"
@@ -0,0 +1,204 @@
+from collections import Counter, defaultdict
+from datetime import UTC
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Coalesce
+
+from apps.bookings.models import BookingItem
+from apps.common.choices import HOLDING_BOOKING_STATUSES, SalesGranularity
+
+from .models import Event, EventSales, SalesBucket, TicketTypeSales
+
+BOOKED_COUNTERS = ("bookings", "tickets_booked", "gross_revenue")
+CANCELLED_COUNTERS = ("bookings_cancelled", "tickets_cancelled", "cancelled_revenue")
+SALES_COUNTERS = BOOKED_COUNTERS + CANCELLED_COUNTERS
+
+
+def bucket_start(moment, granularity):
+    """
+    Start of the UTC hour or day of moment.
+    """
+    moment = moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    if granularity == SalesGranularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def increment_rows(model, unique_fields, rows):
+    """
+    Add the SALES_COUNTERS of rows to the model's rows with the same
+    unique_fields, inserting the missing ones, in one INSERT ... ON CONFLICT
+    DO UPDATE. Rows are locked in the order given.
+    """
+    if not rows:
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    fields = list(rows[0])
+    row_sql = f"({', '.join(['%s'] * len(fields))})"
+    increments = ", ".join(
+        f"{quote(name)} = {table}.{quote(name)} + EXCLUDED.{quote(name)}"
+        for name in SALES_COUNTERS
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(map(quote, fields))}) "
+            f"VALUES {', '.join([row_sql] * len(rows))} "
+            f"ON CONFLICT ({', '.join(map(quote, unique_fields))}) "
+            f"DO UPDATE SET {increments}",
+            [row[name] for row in rows for name in fields],
+        )
+
+
+class SalesDeltas:
+    """
+    Counters to add to the event, ticket type and hour and day rollups,
+    collected from booking item rows. Rows must come grouped by booking,
+    each booking is counted once per rollup row.
+    """
+
+    def __init__(self):
+        self.events = defaultdict(Counter)
+        self.ticket_types = defaultdict(Counter)
+        self.buckets = defaultdict(Counter)
+        # Rollup row -> booking counted last
+        self.last_booking = {}
+
+    def add(self, booking_id, event_id, ticket_type_id, quantity, price, at, cancelled):
+        """
+        Add a booking item booked, or cancelled when cancelled is set, at
+        the datetime at.
+        """
+        bookings, tickets, revenue = (
+            CANCELLED_COUNTERS if cancelled else BOOKED_COUNTERS
+        )
+
+        keys = [
+            ("events", (event_id,)),
+            ("ticket_types", (ticket_type_id, event_id)),
+            *(
+                ("buckets", (event_id, granularity, bucket_start(at, granularity)))
+                for granularity in SalesGranularity.values
+            ),
+        ]
+        for rollup, key in keys:
+            counters = getattr(self, rollup)[key]
+            counters[tickets] += quantity
+            counters[revenue] += quantity * price
+            if self.last_booking.get((rollup, key, bookings)) != booking_id:
+                self.last_booking[rollup, key, bookings] = booking_id
+                counters[bookings] += 1
+
+    def save(self):
+        """
+        Write the counters, locking rollup rows in the same order in every
+        transaction: events, ticket types, then buckets, each by key.
+        """
+
+        def rows(rollup, key_fields):
+            return [
+                {
+                    **dict(zip(key_fields, key, strict=True)),
+                    **{name: counters[name] for name in SALES_COUNTERS},
+                }
+                for key, counters in sorted(rollup.items())
+            ]
+
+        increment_rows(EventSales, ["event_id"], rows(self.events, ["event_id"]))
+        increment_rows(
+            TicketTypeSales,
+            ["ticket_type_id"],
+            rows(self.ticket_types, ["ticket_type_id", "event_id"]),
+        )
+        increment_rows(
+            SalesBucket,
+            ["event_id", "granularity", "start"],
+            rows(self.buckets, ["event_id", "granularity", "start"]),
+        )
+
+
+def record_booked(booking_items):
+    """
+    Add booking items just written, with their booking, to the rollups.
+    Must be called in the transaction writing them.
+    """
+    deltas = SalesDeltas()
+    for item in booking_items:
+        booking = item.booking
+        deltas.add(
+            booking.pk,
+            booking.event_id,
+            item.ticket_type_id,
+            item.quantity,
+            item.price_at_booking,
+            booking.created_at,
+            cancelled=False,
+        )
+    deltas.save()
+
+
+def record_released(booking_items, at):
+    """
+    Add a queryset of booking items whose tickets are being released
+    (cancelled or expired bookings) to the rollups, as cancelled at the
+    datetime at. Must be called in the transaction releasing them.
+    """
+    deltas = SalesDeltas()
+    for row in booking_items.order_by("booking_id").values_list(
+        "booking_id",
+        "booking__event_id",
+        "ticket_type_id",
+        "quantity",
+        "price_at_booking",
+    ):
+        deltas.add(*row, at, cancelled=True)
+    deltas.save()
+
+
+def rebuild_sales(event_id, chunk_size=2000):
+    """
+    Recompute the rollups of an event from its booking items: each is booked
+    when its booking was made and, when the booking no longer holds tickets,
+    cancelled when it was cancelled or expired. The event row is locked so no
+    booking or release of the event runs meanwhile.
+    """
+    with transaction.atomic():
+        Event.objects.select_for_update().filter(pk=event_id).exists()
+
+        EventSales.objects.filter(event_id=event_id).delete()
+        TicketTypeSales.objects.filter(event_id=event_id).delete()
+        SalesBucket.objects.filter(event_id=event_id).delete()
+
+        rows = (
+            BookingItem.objects.filter(booking__event_id=event_id)
+            .annotate(
+                released=ExpressionWrapper(
+                    ~Q(booking__status__in=HOLDING_BOOKING_STATUSES),
+                    output_field=BooleanField(),
+                ),
+                released_at=Coalesce("booking__cancelled_at", "booking__updated_at"),
+            )
+            .order_by("booking_id")
+            .values_list(
+                "booking_id",
+                "ticket_type_id",
+                "quantity",
+                "price_at_booking",
+                "booking__created_at",
+                "released",
+                "released_at",
+            )
+        )
+
+        deltas = SalesDeltas()
+        for row in rows.iterator(chunk_size=chunk_size):
+            booking_id, ticket_type_id, quantity, price, created_at = row[:5]
+            item = (booking_id, event_id, ticket_type_id, quantity, price)
+            deltas.add(*item, created_at, cancelled=False)
+            released, released_at = row[5:]
+            if released:
+                deltas.add(*item, released_at, cancelled=True)
+        deltas.save()
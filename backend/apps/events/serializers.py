@@ -1,15 +1,40 @@
+from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import serializers
 
-from apps.common.choices import EventStatus
+from apps.common.choices import EventStatus, SalesGranularity
+from apps.common.fieldsets import SparseFieldsetSerializerMixin
 from apps.events.constants import EventMessages, TicketTypeMessages
 
-from .models import Event, TicketType
+from .models import (
+    Event,
+    EventCancellation,
+    EventSales,
+    SalesBucket,
+    TicketType,
+    TicketTypeSales,
+)
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # Organizer is auto-assigned from logged-in user
     organizer = serializers.ReadOnlyField(source="organizer.username")
+    # With the counter shards annotated by Event.objects.with_tickets_sold()
+    tickets_sold = serializers.IntegerField(source="total_tickets_sold", read_only=True)
+    tickets_remaining = serializers.ReadOnlyField()
+    # Annotated by Event.objects.with_ticket_summary()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+    max_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+    is_sold_out = serializers.BooleanField(read_only=True)
+
+    sparse_dependencies = {
+        "tickets_sold": ["tickets_sold"],
+        "tickets_remaining": ["total_capacity", "tickets_sold"],
+    }
 
     class Meta:
         model = Event
@@ -22,11 +47,32 @@ class EventSerializer(serializers.ModelSerializer):
             "start_time",
             "end_time",
             "total_capacity",
+            "tickets_sold",
+            "tickets_remaining",
+            "min_price",
+            "max_price",
+            "is_sold_out",
+            "admission_rate",
             "status",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "organizer", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "organizer",
+            "tickets_sold",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if "ticket_types" in self.context.get("expand", ()):
+            # Active ticket types, prefetched by EventQuerysetMixin
+            fields["ticket_types"] = TicketTypeSerializer(
+                source="active_ticket_types", many=True, read_only=True
+            )
+        return fields
 
     def validate_start_time(self, value):
         if value < timezone.now():
@@ -38,6 +84,11 @@ class EventSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(EventMessages.END_TIME_IS_PAST)
         return value
 
+    def validate_total_capacity(self, value):
+        if self.instance and value < self.instance.total_tickets_sold:
+            raise serializers.ValidationError(EventMessages.CAPACITY_BELOW_TICKETS_SOLD)
+        return value
+
     def validate_status(self, value):
         # Only allow 'upcoming' status on create
         if self.instance is None and value != EventStatus.UPCOMING:
@@ -55,8 +106,24 @@ class EventSerializer(serializers.ModelSerializer):
 
         return data
 
+    def update(self, instance, validated_data):
+        """
+        Only write the changed columns.
+        A full save() would overwrite tickets_sold with a stale value.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+
+class TicketTypeSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Sharded stock is added by to_representation
+    sparse_dependencies = {
+        "quantity_available": ["shard_count"],
+        "quantity_sold": ["shard_count"],
+    }
 
-class TicketTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = TicketType
         fields = [
@@ -72,6 +139,33 @@ class TicketTypeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "event", "created_at", "updated_at"]
 
+    def to_representation(self, instance):
+        """
+        Report the stock of sharded ticket types as the sum of their shards.
+        """
+        data = super().to_representation(instance)
+
+        # Left out by ?fields=/?omit=, shard_count may not be loaded either
+        if "quantity_available" not in data and "quantity_sold" not in data:
+            return data
+
+        if instance.shard_count:
+            if hasattr(instance, "shard_quantity_available"):
+                available = instance.shard_quantity_available
+                sold = instance.shard_quantity_sold
+            else:
+                totals = instance.shards.aggregate(
+                    available=Sum("quantity_available"), sold=Sum("quantity_sold")
+                )
+                available, sold = totals["available"], totals["sold"]
+
+            if "quantity_available" in data:
+                data["quantity_available"] += available or 0
+            if "quantity_sold" in data:
+                data["quantity_sold"] += sold or 0
+
+        return data
+
     def validate_name(self, value):
         event = self.context.get("event")
 
@@ -90,3 +184,70 @@ class TicketTypeSerializer(serializers.ModelSerializer):
                 TicketTypeMessages.INVALID_AVAILABILITY_ON_CREATE
             )
         return value
+
+
+class EventCancellationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventCancellation
+        fields = [
+            "status",
+            "bookings_total",
+            "bookings_cancelled",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class SalesTotalsSerializer(serializers.ModelSerializer):
+    """
+    Counters of a sales rollup, with what's left after cancellations.
+    """
+
+    tickets_sold = serializers.IntegerField(read_only=True)
+    net_revenue = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = EventSales
+        fields = [
+            "bookings",
+            "bookings_cancelled",
+            "tickets_booked",
+            "tickets_cancelled",
+            "tickets_sold",
+            "gross_revenue",
+            "cancelled_revenue",
+            "net_revenue",
+        ]
+
+
+class TicketTypeSalesSerializer(SalesTotalsSerializer):
+    name = serializers.CharField(source="ticket_type.name", read_only=True)
+
+    class Meta(SalesTotalsSerializer.Meta):
+        model = TicketTypeSales
+        fields = ["ticket_type_id", "name", *SalesTotalsSerializer.Meta.fields]
+
+
+class SalesBucketSerializer(SalesTotalsSerializer):
+    class Meta(SalesTotalsSerializer.Meta):
+        model = SalesBucket
+        fields = ["start", *SalesTotalsSerializer.Meta.fields]
+
+
+class EventStatsQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the event stats: the timeline's bucket size and range.
+    """
+
+    granularity = serializers.ChoiceField(
+        choices=SalesGranularity.choices, default=SalesGranularity.DAY
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if "since" in data and "until" in data and data["since"] >= data["until"]:
+            raise serializers.ValidationError(EventMessages.STATS_SINCE_AFTER_UNTIL)
+        return data
@@ -0,0 +1,175 @@
+import random
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, F, Sum
+from django.utils import timezone
+
+from .models import EventCounterShard, TicketType, TicketTypeShard
+
+AVAILABLE = "quantity_available"
+SOLD = "quantity_sold"
+
+
+def enable_sharding(ticket_type, shard_count):
+    """
+    Split the available stock of a ticket type over shard_count shard rows.
+    Re-sharding first folds existing shards back into the ticket type.
+    """
+    with transaction.atomic():
+        disable_sharding(ticket_type)
+
+        ticket_type = TicketType.objects.select_for_update().get(pk=ticket_type.pk)
+        per_shard, remainder = divmod(ticket_type.quantity_available, shard_count)
+
+        TicketTypeShard.objects.bulk_create(
+            TicketTypeShard(
+                ticket_type=ticket_type,
+                index=index,
+                quantity_available=per_shard + (1 if index < remainder else 0),
+            )
+            for index in range(shard_count)
+        )
+
+        # Stock now lives in the shards
+        TicketType.objects.filter(pk=ticket_type.pk).update(
+            quantity_available=0, shard_count=shard_count, updated_at=timezone.now()
+        )
+
+
+def disable_sharding(ticket_type):
+    """
+    Fold all shards back into the ticket type row and delete them.
+    """
+    with transaction.atomic():
+        TicketType.objects.select_for_update().get(pk=ticket_type.pk)
+        shards = TicketTypeShard.objects.select_for_update().filter(
+            ticket_type=ticket_type
+        )
+        totals = shards.aggregate(available=Sum(AVAILABLE), sold=Sum(SOLD))
+
+        TicketType.objects.filter(pk=ticket_type.pk).update(
+            quantity_available=F(AVAILABLE) + (totals["available"] or 0),
+            quantity_sold=F(SOLD) + (totals["sold"] or 0),
+            shard_count=0,
+            updated_at=timezone.now(),
+        )
+        shards.delete()
+
+
+def move_shard_stock(ticket_type, quantity, source, target, *guards):
+    """
+    Move quantity from the source to the target column of the shards, when
+    the guards hold. Return False when the shards don't hold enough in the
+    source column. Must be called inside transaction.atomic().
+
+    Tries one guarded UPDATE on each shard, starting from a random one, so
+    concurrent bookings land on different rows. When no single shard holds
+    enough, locks all shards in index order and takes the quantity greedily.
+    """
+    # Guards on other tables are subqueries, a join would have the UPDATE
+    # check the stock on a snapshot instead of the row it writes
+    shards = TicketTypeShard.objects.filter(*guards, ticket_type_id=ticket_type.pk)
+    changes = {source: F(source) - quantity, target: F(target) + quantity}
+
+    start = random.randrange(ticket_type.shard_count)
+    for offset in range(ticket_type.shard_count):
+        index = (start + offset) % ticket_type.shard_count
+        guard = {"index": index, f"{source}__gte": quantity}
+        if shards.filter(**guard).update(**changes):
+            return True
+
+    # Shards are draining, combine what is left
+    locked = list(shards.select_for_update().order_by("index"))
+    if sum(getattr(shard, source) for shard in locked) < quantity:
+        return False
+
+    drain_shard_stock(locked, quantity, source, target)
+    return True
+
+
+def drain_shard_stock(locked, quantity, source, target):
+    """
+    Move up to quantity from the source to the target column of the locked
+    shards, in their order. Return the part they didn't hold.
+    """
+    remaining = quantity
+    for shard in locked:
+        take = min(remaining, getattr(shard, source))
+        if take:
+            TicketTypeShard.objects.filter(pk=shard.pk).update(
+                **{source: F(source) - take, target: F(target) + take}
+            )
+            remaining -= take
+        if not remaining:
+            break
+    return remaining
+
+
+def claim_shard_stock(ticket_type, quantity):
+    # Deactivating the ticket type, e.g. by cancelling its event, stops sales
+    return move_shard_stock(
+        ticket_type,
+        quantity,
+        AVAILABLE,
+        SOLD,
+        Exists(TicketType.objects.filter(pk=ticket_type.pk, is_active=True)),
+    )
+
+
+def release_shard_stock(ticket_type, quantity):
+    """
+    Give quantity sold tickets back to the shards.
+    Must be called inside transaction.atomic().
+
+    Tickets sold before sharding was enabled are counted on the ticket type
+    row: the shards give back what they sold, the rest is taken off the row
+    and made available on the first shard.
+    """
+    if move_shard_stock(ticket_type, quantity, source=SOLD, target=AVAILABLE):
+        return
+
+    shards = TicketTypeShard.objects.filter(ticket_type_id=ticket_type.pk)
+    locked = list(shards.select_for_update().order_by("index"))
+    remainder = drain_shard_stock(locked, quantity, source=SOLD, target=AVAILABLE)
+
+    TicketType.objects.filter(pk=ticket_type.pk).update(
+        quantity_sold=F(SOLD) - remainder, updated_at=timezone.now()
+    )
+    shards.filter(index=0).update(quantity_available=F(AVAILABLE) + remainder)
+
+
+def count_tickets_sold(event_id, quantity):
+    """
+    Add quantity to a randomly chosen counter shard of the event, creating
+    it on first use, with one INSERT ... ON CONFLICT DO UPDATE.
+    """
+    quote = connection.ops.quote_name
+    table = quote(EventCounterShard._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (event_id, {quote('index')}, tickets_sold) "
+            "VALUES (%s, %s, %s) "
+            f"ON CONFLICT (event_id, {quote('index')}) "
+            f"DO UPDATE SET tickets_sold = {table}.tickets_sold + EXCLUDED.tickets_sold",
+            [event_id, random.randrange(settings.EVENT_COUNTER_SHARDS), quantity],
+        )
+
+
+def uncount_tickets_sold(event_id, quantity):
+    """
+    Take up to quantity off the event's counter shards, locked in index order.
+    Return the part they didn't hold, counted on the event row.
+    Must be called inside transaction.atomic().
+    """
+    shards = EventCounterShard.objects.filter(event_id=event_id)
+    remaining = quantity
+    for shard in (
+        shards.select_for_update().filter(tickets_sold__gt=0).order_by("index")
+    ):
+        take = min(remaining, shard.tickets_sold)
+        shards.filter(pk=shard.pk).update(tickets_sold=F("tickets_sold") - take)
+        remaining -= take
+        if not remaining:
+            break
+    return remaining
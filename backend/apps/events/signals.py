@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_event
+from .models import Event, TicketType
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_saved_event(instance, **kwargs):
+    invalidate_event(instance.pk, listing=True)
+
+
+@receiver([post_save, post_delete], sender=TicketType)
+def invalidate_ticket_type_event(instance, **kwargs):
+    # Prices and the sold-out flag are listed with the event, its updated_at
+    # validates them for conditional GETs
+    Event.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
+    invalidate_event(instance.event_id, listing=True)
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from inspect import iscoroutinefunction
+
+import pytest
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.common.choices import EventStatus
+from apps.events.models import Event
+
+# Resolved per test, the async_views fixture reloads the URL conf
+LIST_URL = "events:event-list"
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("async_views")]
+
+
+def test_event_list_is_async():
+    assert iscoroutinefunction(resolve(reverse(LIST_URL)).func)
+
+
+def test_get_event_list(api_client, event_factory):
+    later = event_factory(start_time=timezone.now() + timedelta(days=2))
+    sooner = event_factory(start_time=timezone.now() + timedelta(days=1))
+
+    response = api_client.get(reverse(LIST_URL))
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["id"] for result in response.data["results"]] == [
+        sooner.id,
+        later.id,
+    ]
+    assert response.data["results"][0]["organizer"] == sooner.organizer.username
+
+
+def test_filter_search_and_order_event_list(api_client, event_factory):
+    event_factory(name="Jazz night", total_capacity=50)
+    big = event_factory(name="Jazz festival", total_capacity=500)
+    event_factory(name="Jazz brunch", status=EventStatus.CANCELLED)
+    event_factory(name="Rock night")
+
+    response = api_client.get(
+        reverse(LIST_URL),
+        {
+            "search": "jazz",
+            "status": EventStatus.UPCOMING,
+            "ordering": "-total_capacity",
+        },
+    )
+    assert len(response.data["results"]) == 2
+    assert response.data["results"][0]["id"] == big.id
+
+
+def test_event_list_expands_ticket_types(api_client, event_factory):
+    event_factory(with_ticket_types=2)
+
+    response = api_client.get(reverse(LIST_URL), {"expand": "ticket_types"})
+    assert len(response.data["results"][0]["ticket_types"]) == 2
+
+
+def test_event_list_fields(api_client, event_factory):
+    event = event_factory()
+
+    response = api_client.get(reverse(LIST_URL), {"fields": "name,organizer"})
+    assert response.data["results"] == [
+        {"name": event.name, "organizer": event.organizer.username}
+    ]
+
+
+def test_anonymous_event_list_is_cached(
+    api_client, event_factory, django_assert_num_queries
+):
+    event_factory()
+    first = api_client.get(reverse(LIST_URL))
+
+    with django_assert_num_queries(0):
+        second = api_client.get(reverse(LIST_URL))
+    assert second.content == first.content
+
+
+def test_event_list_conditional_get(organizer_client, event_factory):
+    event_factory()
+    response = organizer_client.get(reverse(LIST_URL))
+
+    revalidated = organizer_client.get(
+        reverse(LIST_URL), headers={"If-None-Match": response["ETag"]}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_organizer_creates_event(organizer_client):
+    start = timezone.now() + timedelta(days=14)
+    payload = {
+        "name": "New Concert",
+        "start_time": start,
+        "end_time": start + timedelta(hours=2),
+        "location": "Stadium",
+        "total_capacity": 5000,
+    }
+
+    response = organizer_client.post(reverse(LIST_URL), payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert Event.objects.get().organizer == organizer_client.user
+
+
+def test_anonymous_user_cannot_create_event(api_client):
+    response = api_client.post(reverse(LIST_URL), {"name": "Concert"}, format="json")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
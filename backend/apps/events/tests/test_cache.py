@@ -0,0 +1,191 @@
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.common.choices import EventStatus
+
+LIST_URL = "events:event-list"
+DETAIL_URL = "events:event-detail"
+TICKET_TYPE_LIST = "events:event-ticket-types-list"
+BOOKING_CREATE_URL = "bookings:booking-create"
+BOOKING_CANCEL_URL = "bookings:booking-cancel"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def anonymous_client(api_client_factory):
+    return api_client_factory()
+
+
+@pytest.fixture
+def event(event_factory):
+    return event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+
+
+def ticket_types_url(event):
+    return reverse(TICKET_TYPE_LIST, kwargs={"event_pk": event.id})
+
+
+def available(client, event):
+    response = client.get(ticket_types_url(event))
+    assert response.status_code == status.HTTP_200_OK
+    return response.data["results"][0]["quantity_available"]
+
+
+def book(client, event):
+    """
+    Book 2 tickets of the event, return the booking reference.
+    """
+    ticket_type = event.ticket_types.get()
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 2}],
+    }
+    response = client.post(reverse(BOOKING_CREATE_URL), payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.data["booking_reference"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        lambda event: reverse(LIST_URL),
+        lambda event: reverse(DETAIL_URL, kwargs={"pk": event.id}),
+        ticket_types_url,
+    ],
+    ids=["list", "detail", "ticket-types"],
+)
+def test_anonymous_reads_are_served_from_cache(
+    anonymous_client, event, url, django_assert_num_queries
+):
+    first = anonymous_client.get(url(event))
+
+    with django_assert_num_queries(0):
+        second = anonymous_client.get(url(event))
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert second["Content-Type"] == "application/json"
+
+
+def test_cache_is_keyed_by_query_string(anonymous_client, event_factory):
+    event_factory(status=EventStatus.CANCELLED)
+    event_factory()
+
+    response = anonymous_client.get(reverse(LIST_URL))
+    assert len(response.data["results"]) == 2
+
+    response = anonymous_client.get(
+        reverse(LIST_URL), {"status": EventStatus.CANCELLED}
+    )
+    assert len(response.data["results"]) == 1
+
+
+def test_authenticated_reads_are_not_cached(
+    attendee_client, event, django_assert_num_queries
+):
+    attendee_client.get(reverse(LIST_URL))
+
+    # ETag validators and the page
+    with django_assert_num_queries(2):
+        attendee_client.get(reverse(LIST_URL))
+
+
+def test_errors_are_not_cached(anonymous_client, event_factory):
+    response = anonymous_client.get(reverse(DETAIL_URL, kwargs={"pk": 1_000_000}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    event_factory(id=1_000_000)
+    response = anonymous_client.get(reverse(DETAIL_URL, kwargs={"pk": 1_000_000}))
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_saving_event_drops_list_and_detail(
+    anonymous_client, event, django_capture_on_commit_callbacks
+):
+    detail_url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    anonymous_client.get(reverse(LIST_URL))
+    anonymous_client.get(detail_url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        event.name = "Renamed"
+        event.save()
+
+    response = anonymous_client.get(reverse(LIST_URL))
+    assert response.data["results"][0]["name"] == "Renamed"
+    assert anonymous_client.get(detail_url).data["name"] == "Renamed"
+
+
+def test_saving_ticket_type_drops_event_reads(
+    anonymous_client, event, ticket_type_factory, django_capture_on_commit_callbacks
+):
+    anonymous_client.get(reverse(LIST_URL))
+    anonymous_client.get(ticket_types_url(event))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ticket_type_factory(event=event, price=1)
+
+    response = anonymous_client.get(reverse(LIST_URL))
+    assert response.data["results"][0]["min_price"] == "1.00"
+    assert anonymous_client.get(ticket_types_url(event)).data["count"] == 2
+
+
+def test_booking_drops_ticket_types_once_committed(
+    anonymous_client, attendee_client, event, django_capture_on_commit_callbacks
+):
+    assert available(anonymous_client, event) == 10
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        book(attendee_client, event)
+
+        # Not committed yet, the cached stock stays
+        assert available(anonymous_client, event) == 10
+
+    for callback in callbacks:
+        callback()
+    assert available(anonymous_client, event) == 8
+
+
+def test_cancelled_booking_drops_ticket_types(
+    anonymous_client, attendee_client, event, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        reference = book(attendee_client, event)
+    assert available(anonymous_client, event) == 8
+
+    url = reverse(BOOKING_CANCEL_URL, kwargs={"booking_reference": reference})
+    with django_capture_on_commit_callbacks(execute=True):
+        response = attendee_client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    assert available(anonymous_client, event) == 10
+
+
+def test_bookings_leave_list_pages_until_timeout(
+    mocker,
+    settings,
+    anonymous_client,
+    attendee_client,
+    event,
+    django_capture_on_commit_callbacks,
+):
+    anonymous_client.get(reverse(LIST_URL))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        book(attendee_client, event)
+
+    response = anonymous_client.get(reverse(LIST_URL))
+    assert response.data["results"][0]["tickets_sold"] == 0
+
+    # The local-memory cache after the list timeout
+    later = time.time() + settings.EVENT_LIST_CACHE_TIMEOUT + 1
+    mocker.patch(
+        "django.core.cache.backends.locmem.time", **{"time.return_value": later}
+    )
+    response = anonymous_client.get(reverse(LIST_URL))
+    assert response.data["results"][0]["tickets_sold"] == 2
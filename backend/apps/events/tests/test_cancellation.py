@@ -0,0 +1,215 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.bookings.models import Booking
+from apps.bookings.reservations import release_booked_tickets
+from apps.common.choices import BookingStatus, CancellationStatus, EventStatus
+from apps.events.cancellation import (
+    cancel_bookings_chunk,
+    run_cancellation,
+    start_event_cancellation,
+    wait_for_cancellations,
+)
+from apps.events.constants import EventMessages
+from apps.events.models import Event, EventCancellation, TicketType
+
+DETAIL_URL = "events:event-detail"
+CANCELLATION_URL = "events:event-cancellation"
+
+
+@pytest.fixture
+def booked_event(event_factory, ticket_type_factory, booking_factory):
+    """
+    Event with 5 bookings of 2 tickets each, plus one already cancelled.
+    """
+
+    def _create(**kwargs):
+        event = event_factory(total_capacity=100, **kwargs)
+        ticket_type = ticket_type_factory(
+            event=event, quantity_available=10, quantity_sold=10
+        )
+        for status_ in [BookingStatus.PENDING] + [BookingStatus.CONFIRMED] * 4:
+            booking = booking_factory(event=event, status=status_)
+            booking.items.create(
+                ticket_type=ticket_type, quantity=2, price_at_booking=ticket_type.price
+            )
+        Event.objects.filter(pk=event.pk).update(tickets_sold=10)
+        booking_factory(event=event, status=BookingStatus.CANCELLED)
+        return event
+
+    return _create
+
+
+def assert_cancelled(event):
+    assert not Booking.objects.filter(
+        event=event, status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED]
+    ).exists()
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 0
+
+    ticket_type = TicketType.objects.get(event=event)
+    assert (ticket_type.quantity_available, ticket_type.quantity_sold) == (20, 0)
+    assert not ticket_type.is_active
+
+
+def cancel_event(client, event):
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    return client.patch(url, {"status": EventStatus.CANCELLED}, format="json")
+
+
+# === Cancelling through the API ===
+@pytest.mark.django_db
+def test_event_cancel_cancels_bookings(organizer_client, booked_event):
+    event = booked_event(organizer=organizer_client.user)
+
+    response = cancel_event(organizer_client, event)
+    assert response.status_code == status.HTTP_200_OK
+    assert_cancelled(event)
+
+    response = organizer_client.get(reverse(CANCELLATION_URL, kwargs={"pk": event.id}))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == CancellationStatus.DONE
+    assert response.data["bookings_total"] == 5
+    assert response.data["bookings_cancelled"] == 5
+    assert response.data["finished_at"] is not None
+
+
+@pytest.mark.django_db
+def test_progress_only_for_event_organizer(organizer_client, booked_event):
+    event = booked_event()
+    start_event_cancellation(event)
+
+    response = organizer_client.get(reverse(CANCELLATION_URL, kwargs={"pk": event.id}))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["detail"] == EventMessages.NOT_EVENT_OWNER
+
+
+@pytest.mark.django_db
+def test_progress_of_event_not_cancelled(organizer_client, event_factory):
+    event = event_factory(organizer=organizer_client.user)
+
+    response = organizer_client.get(reverse(CANCELLATION_URL, kwargs={"pk": event.id}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# === Chunked job ===
+@pytest.mark.django_db
+def test_job_cancels_in_chunks(settings, booked_event):
+    settings.EVENT_CANCELLATION_CHUNK_SIZE = 2
+    event = booked_event()
+
+    cancellation = start_event_cancellation(event)
+
+    cancellation.refresh_from_db()
+    assert cancellation.status == CancellationStatus.DONE
+    assert cancellation.bookings_cancelled == 5
+    assert cancellation.last_booking_id == (
+        Booking.objects.filter(event=event).exclude(cancelled_at=None).latest("pk").pk
+    )
+    assert_cancelled(event)
+
+
+@pytest.mark.django_db
+def test_chunk_query_count_does_not_grow_with_bookings(
+    settings, booked_event, booking_factory
+):
+    settings.EVENT_CANCELLATION_IN_BACKGROUND = True
+    settings.EVENT_CANCELLATION_CHUNK_SIZE = 100
+
+    def chunk_queries(event):
+        # Not run: on_commit callbacks don't fire inside the test transaction
+        cancellation = start_event_cancellation(event)
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                cancel_bookings_chunk(cancellation.pk, 100)
+        return len(context.captured_queries)
+
+    small = booked_event()
+    Booking.objects.filter(event=small).exclude(status=BookingStatus.PENDING).delete()
+
+    assert chunk_queries(small) == chunk_queries(booked_event())
+
+
+@pytest.mark.django_db
+def test_failed_job_is_resumed(mocker, settings, booked_event):
+    settings.EVENT_CANCELLATION_CHUNK_SIZE = 2
+    event = booked_event()
+
+    mocker.patch(
+        "apps.events.cancellation.release_booked_tickets",
+        side_effect=[None, RuntimeError("connection lost")],
+    )
+    with pytest.raises(RuntimeError):
+        start_event_cancellation(event)
+
+    cancellation = EventCancellation.objects.get(event=event)
+    assert cancellation.status == CancellationStatus.FAILED
+    assert cancellation.bookings_cancelled == 2
+
+    mocker.stopall()
+
+    out = StringIO()
+    call_command("resume_event_cancellations", stdout=out)
+    assert "Finished 1 cancellation(s)." in out.getvalue()
+
+    cancellation.refresh_from_db()
+    assert cancellation.status == CancellationStatus.DONE
+    assert cancellation.bookings_cancelled == 5
+
+
+@pytest.mark.django_db
+def test_resume_goes_on_after_a_failed_job(mocker, booked_event):
+    failing = EventCancellation.objects.create(event=booked_event())
+    other = EventCancellation.objects.create(event=booked_event())
+
+    def flaky_release(booking_items, now):
+        if booking_items.filter(booking__event=failing.event_id).exists():
+            raise RuntimeError("connection lost")
+        return release_booked_tickets(booking_items, now)
+
+    mocker.patch("apps.events.cancellation.release_booked_tickets", flaky_release)
+
+    out, err = StringIO(), StringIO()
+    call_command("resume_event_cancellations", stdout=out, stderr=err)
+    assert "Finished 1 cancellation(s)." in out.getvalue()
+    assert "1 cancellation(s) failed." in err.getvalue()
+
+    failing.refresh_from_db()
+    other.refresh_from_db()
+    assert failing.status == CancellationStatus.FAILED
+    assert other.status == CancellationStatus.DONE
+
+
+@pytest.mark.django_db
+def test_job_skips_bookings_cancelled_meanwhile(booked_event):
+    event = booked_event()
+    cancellation = EventCancellation.objects.create(event=event, bookings_total=5)
+
+    # Cancelled by its attendee before the job got to it
+    Booking.objects.filter(event=event, status=BookingStatus.PENDING).update(
+        status=BookingStatus.CANCELLED
+    )
+    run_cancellation(cancellation.pk)
+
+    cancellation.refresh_from_db()
+    assert cancellation.bookings_cancelled == 4
+
+
+# === Background thread ===
+@pytest.mark.django_db(transaction=True)
+def test_event_cancel_runs_in_background(settings, organizer_client, booked_event):
+    settings.EVENT_CANCELLATION_IN_BACKGROUND = True
+    settings.EVENT_CANCELLATION_CHUNK_SIZE = 2
+    event = booked_event(organizer=organizer_client.user)
+
+    response = cancel_event(organizer_client, event)
+    assert response.status_code == status.HTTP_200_OK
+
+    wait_for_cancellations()
+    assert_cancelled(event)
+    assert EventCancellation.objects.get(event=event).status == CancellationStatus.DONE
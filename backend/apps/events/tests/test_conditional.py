@@ -0,0 +1,157 @@
+import pytest
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from apps.common.choices import EventStatus
+from apps.events.models import Event
+
+LIST_URL = "events:event-list"
+DETAIL_URL = "events:event-detail"
+TICKET_TYPE_LIST = "events:event-ticket-types-list"
+BOOKING_CREATE_URL = "bookings:booking-create"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def event(event_factory):
+    return event_factory(
+        total_capacity=100, with_ticket_types=[{"quantity_available": 10}]
+    )
+
+
+def detail_url(event):
+    return reverse(DETAIL_URL, kwargs={"pk": event.id})
+
+
+def ticket_types_url(event):
+    return reverse(TICKET_TYPE_LIST, kwargs={"event_pk": event.id})
+
+
+def book(client, event, django_capture_on_commit_callbacks):
+    ticket_type = event.ticket_types.get()
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 2}],
+    }
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(reverse(BOOKING_CREATE_URL), payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def revalidate(client, url, response):
+    return client.get(url, headers={"If-None-Match": response["ETag"]})
+
+
+@pytest.mark.parametrize(
+    "url",
+    [lambda event: reverse(LIST_URL), detail_url, ticket_types_url],
+    ids=["list", "detail", "ticket-types"],
+)
+def test_matching_etag_is_answered_without_serializing(
+    organizer_client, event, url, django_assert_num_queries
+):
+    response = organizer_client.get(url(event))
+    assert response.status_code == status.HTTP_200_OK
+    assert not response["ETag"].startswith("W/")
+
+    # Only the validators are read
+    with django_assert_num_queries(1):
+        revalidated = revalidate(organizer_client, url(event), response)
+
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert revalidated.content == b""
+    assert revalidated["ETag"] == response["ETag"]
+
+
+def test_cached_response_answers_etag_without_queries(
+    api_client, event, django_assert_num_queries
+):
+    response = api_client.get(reverse(LIST_URL))
+
+    with django_assert_num_queries(0):
+        revalidated = revalidate(api_client, reverse(LIST_URL), response)
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_etag_depends_on_query_string(organizer_client, event):
+    response = organizer_client.get(reverse(LIST_URL))
+
+    revalidated = organizer_client.get(
+        reverse(LIST_URL),
+        {"status": EventStatus.UPCOMING},
+        headers={"If-None-Match": response["ETag"]},
+    )
+    assert revalidated.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize(
+    "url",
+    [lambda event: reverse(LIST_URL), detail_url, ticket_types_url],
+    ids=["list", "detail", "ticket-types"],
+)
+def test_booking_changes_etag(
+    organizer_client,
+    attendee_factory,
+    api_client_factory,
+    event,
+    url,
+    django_capture_on_commit_callbacks,
+):
+    response = organizer_client.get(url(event))
+
+    attendee = api_client_factory()
+    attendee.force_authenticate(attendee_factory())
+    book(attendee, event, django_capture_on_commit_callbacks)
+
+    revalidated = revalidate(organizer_client, url(event), response)
+    assert revalidated.status_code == status.HTTP_200_OK
+    assert revalidated["ETag"] != response["ETag"]
+
+
+def test_list_etag_changes_with_older_rows(organizer_client, event_factory):
+    first = event_factory()
+    event_factory()
+    response = organizer_client.get(reverse(LIST_URL))
+
+    # Not the latest updated_at, nor a new row
+    Event.objects.filter(pk=first.pk).update(
+        name="Renamed", updated_at=first.updated_at.replace(microsecond=1)
+    )
+
+    revalidated = revalidate(organizer_client, reverse(LIST_URL), response)
+    assert revalidated.status_code == status.HTTP_200_OK
+
+
+def test_new_ticket_type_changes_event_etag(
+    organizer_client, event, ticket_type_factory
+):
+    response = organizer_client.get(detail_url(event))
+
+    ticket_type_factory(event=event, price=1)
+
+    revalidated = revalidate(organizer_client, detail_url(event), response)
+    assert revalidated.status_code == status.HTTP_200_OK
+    assert revalidated.data["min_price"] == "1.00"
+
+
+def test_detail_is_answered_by_last_modified(organizer_client, event):
+    response = organizer_client.get(detail_url(event))
+    assert response["Last-Modified"] == http_date(event.updated_at.timestamp())
+
+    revalidated = organizer_client.get(
+        detail_url(event),
+        headers={"If-Modified-Since": response["Last-Modified"]},
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # The list covers rows that may be deleted, it has no Last-Modified
+    assert "Last-Modified" not in organizer_client.get(reverse(LIST_URL))
+
+
+@pytest.mark.parametrize("pk", [1_000_000, "abc"])
+def test_missing_event_has_no_validators(organizer_client, pk):
+    response = organizer_client.get(reverse(DETAIL_URL, kwargs={"pk": pk}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "ETag" not in response
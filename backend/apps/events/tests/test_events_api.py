@@ -1,4 +1,5 @@
 from datetime import timedelta
+from decimal import Decimal
 
 import pytest
 from django.urls import reverse_lazy
@@ -6,7 +7,8 @@ from django.utils import timezone
 from rest_framework import status
 
 from apps.common.choices import BookingStatus, EventStatus
-from apps.events.models import Event
+from apps.events.models import Event, TicketType
+from apps.events.sharding import enable_sharding
 
 LIST_URL = reverse_lazy("events:event-list")
 DETAIL_URL = "events:event-detail"
@@ -200,6 +202,12 @@ def test_event_status_cancel_will_cancel_bookings(organizer_client, booking_fact
     booking = booking_factory(event__organizer=organizer, with_items=3)
     event = booking.event
 
+    # The items' tickets count as sold, so cancelling can give them back
+    for item in booking.items.all():
+        TicketType.objects.filter(pk=item.ticket_type_id).update(
+            quantity_sold=item.quantity
+        )
+
     assert booking.status == BookingStatus.CONFIRMED
 
     url = reverse_lazy(DETAIL_URL, kwargs={"pk": event.id})
@@ -211,6 +219,115 @@ def test_event_status_cancel_will_cancel_bookings(organizer_client, booking_fact
     assert booking.cancelled_at is not None
 
 
+# === Test Ticket Summary ===
+def test_event_list_includes_ticket_summary(api_client, event_factory):
+    event = event_factory(
+        total_capacity=10,
+        with_ticket_types=[
+            {"price": Decimal("20.00"), "quantity_available": 5},
+            {"price": Decimal("50.00"), "quantity_available": 0},
+            {"price": Decimal("5.00"), "is_active": False},
+        ],
+    )
+
+    response = api_client.get(LIST_URL)
+    result = response.data["results"][0]
+
+    assert result["organizer"] == event.organizer.username
+    assert result["tickets_remaining"] == 10
+    assert (result["min_price"], result["max_price"]) == ("20.00", "50.00")
+    assert result["is_sold_out"] is False
+
+
+@pytest.mark.parametrize(
+    ("tickets_sold", "ticket_types", "sold_out"),
+    [
+        (10, [{"quantity_available": 5}], True),
+        (0, [{"quantity_available": 0}, {"quantity_available": 0}], True),
+        (0, [{"quantity_available": 0}, {"quantity_available": 1}], False),
+        (0, [{"quantity_available": 5, "is_active": False}], False),
+        (0, [], False),
+    ],
+)
+def test_event_is_sold_out(
+    tickets_sold, ticket_types, sold_out, api_client, event_factory
+):
+    event = event_factory(total_capacity=10, with_ticket_types=ticket_types)
+    Event.objects.filter(pk=event.pk).update(tickets_sold=tickets_sold)
+
+    response = api_client.get(reverse_lazy(DETAIL_URL, kwargs={"pk": event.id}))
+    assert response.data["is_sold_out"] is sold_out
+
+
+def test_sharded_stock_is_not_sold_out(api_client, event_factory):
+    event = event_factory(total_capacity=10, with_ticket_types=1)
+    enable_sharding(event.ticket_types.get(), 2)
+
+    response = api_client.get(reverse_lazy(DETAIL_URL, kwargs={"pk": event.id}))
+    assert response.data["is_sold_out"] is False
+
+
+def test_event_list_query_count(api_client, event_factory, django_assert_num_queries):
+    for _ in range(5):
+        event_factory(with_ticket_types=3)
+
+    # The page's ETag validators, then the page with organizer and ticket
+    # summary in the same SELECT
+    with django_assert_num_queries(2):
+        response = api_client.get(LIST_URL)
+    assert len(response.data["results"]) == 5
+
+
+def test_create_event_responds_with_ticket_summary(organizer_client):
+    response = organizer_client.post(LIST_URL, DUMMY_EVENT_DATA, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["min_price"] is None
+    assert response.data["is_sold_out"] is False
+
+
+# === Test ?expand= ===
+def test_event_expands_active_ticket_types(api_client, event_factory):
+    event = event_factory(
+        with_ticket_types=[
+            {"name": "VIP", "quantity_available": 5},
+            {"name": "Standard", "quantity_available": 10},
+            {"name": "Staff", "is_active": False},
+        ],
+    )
+    enable_sharding(event.ticket_types.get(name="Standard"), 2)
+    url = reverse_lazy(DETAIL_URL, kwargs={"pk": event.id})
+
+    response = api_client.get(url, {"expand": "ticket_types"})
+    assert response.status_code == status.HTTP_200_OK
+    ticket_types = response.data["ticket_types"]
+    assert [tt["name"] for tt in ticket_types] == ["VIP", "Standard"]
+    # Sharded stock summed like on /ticket-types/
+    assert ticket_types[1]["quantity_available"] == 10
+
+    assert "ticket_types" not in api_client.get(url).data
+
+
+def test_event_list_expand_query_count(
+    api_client, event_factory, django_assert_num_queries
+):
+    for _ in range(5):
+        event_factory(with_ticket_types=3)
+
+    # Validators, the page, and the ticket types of all its events
+    with django_assert_num_queries(3):
+        response = api_client.get(LIST_URL, {"expand": "ticket_types"})
+    assert [len(result["ticket_types"]) for result in response.data["results"]] == [
+        3
+    ] * 5
+
+
+def test_event_expand_rejects_unknown_names(api_client):
+    response = api_client.get(LIST_URL, {"expand": "ticket_types,organizer"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "organizer" in response.data["expand"]
+
+
 # === Test Event Delete Views ===
 def test_organizer_can_delete_their_event(organizer_client, event_factory):
     """
@@ -226,6 +343,60 @@ def test_organizer_can_delete_their_event(organizer_client, event_factory):
     assert not Event.objects.filter(id=event.id).exists()
 
 
+class TestEventPagination:
+    def list_all(self, client, params=None):
+        """
+        Follow the next links, return the ids of every page.
+        """
+        pages = []
+        response = client.get(LIST_URL, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            pages.append([result["id"] for result in response.data["results"]])
+            if response.data["next"] is None:
+                return pages
+            response = client.get(response.data["next"])
+
+    def test_pages_follow_start_time_then_id(self, api_client, event_factory):
+        start = timezone.now() + timedelta(days=1)
+        # More events at the same time than fit on a page
+        events = [event_factory(start_time=start) for _ in range(12)]
+        events.append(event_factory(start_time=start - timedelta(hours=1)))
+
+        pages = self.list_all(api_client)
+
+        assert [len(page) for page in pages] == [10, 3]
+        assert sum(pages, []) == [events[-1].id] + [event.id for event in events[:-1]]
+
+    def test_pages_keep_filters_and_ordering(self, api_client, event_factory):
+        for capacity in range(100, 1300, 100):
+            event_factory(name="Jazz", total_capacity=capacity)
+        event_factory(name="Rock", total_capacity=5000)
+
+        pages = self.list_all(
+            api_client, {"search": "jazz", "ordering": "-total_capacity"}
+        )
+
+        capacities = [Event.objects.get(pk=pk).total_capacity for pk in sum(pages, [])]
+        assert capacities == list(range(1200, 0, -100))
+
+    def test_previous_link_returns_to_first_page(self, api_client, event_factory):
+        for _ in range(11):
+            event_factory()
+
+        first = api_client.get(LIST_URL)
+        second = api_client.get(first.data["next"])
+        assert first.data["previous"] is None
+        assert "count" not in second.data
+
+        back = api_client.get(second.data["previous"])
+        assert back.data["results"] == first.data["results"]
+
+    def test_invalid_cursor(self, api_client):
+        response = api_client.get(LIST_URL, {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 class TestEventFiltering:
     def test_filter_events_by_filterset(self, api_client, event_factory):
         """
@@ -0,0 +1,133 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.events.sharding import enable_sharding
+
+LIST_URL = "events:event-list"
+DETAIL_URL = "events:event-detail"
+TICKET_TYPE_LIST = "events:event-ticket-types-list"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def event(event_factory):
+    return event_factory(
+        with_ticket_types=[
+            {"name": "VIP", "quantity_available": 5},
+            {"name": "Standard", "quantity_available": 10},
+        ]
+    )
+
+
+def page_query(client, url, params):
+    """
+    GET url, return the response and the SQL of its last query (the page).
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    return response, context.captured_queries[-1]["sql"]
+
+
+def test_event_list_fields(organizer_client, event):
+    response, sql = page_query(
+        organizer_client, reverse(LIST_URL), {"fields": "id,name,tickets_remaining"}
+    )
+
+    result = response.data["results"][0]
+    assert result == {
+        "id": event.id,
+        "name": event.name,
+        "tickets_remaining": event.total_capacity - event.tickets_sold,
+    }
+    # No description, organizer join nor ticket summary subqueries
+    assert '"description"' not in sql
+    assert "JOIN" not in sql
+    assert '"events_tickettype"' not in sql
+
+
+def test_event_detail_omit(organizer_client, event):
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    response, sql = page_query(organizer_client, url, {"omit": "description"})
+
+    assert "description" not in response.data
+    assert response.data["organizer"] == event.organizer.username
+    assert response.data["min_price"] is not None
+    assert '"description"' not in sql
+
+
+def test_event_fields_keep_cursor_ordering(organizer_client, event_factory):
+    events = [event_factory() for _ in range(12)]
+
+    response = organizer_client.get(
+        reverse(LIST_URL), {"fields": "name", "ordering": "-total_capacity"}
+    )
+    second = organizer_client.get(response.data["next"])
+
+    names = [
+        result["name"] for page in (response, second) for result in page.data["results"]
+    ]
+    ordered = sorted(events, key=lambda event: (-event.total_capacity, -event.id))
+    assert names == [event.name for event in ordered]
+
+
+def test_event_expand_prefetch_is_dropped_when_omitted(
+    organizer_client, event, django_assert_num_queries
+):
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    params = {"expand": "ticket_types"}
+
+    # Validators and the event, no ticket types
+    with django_assert_num_queries(2):
+        response = organizer_client.get(url, {**params, "omit": "ticket_types"})
+    assert "ticket_types" not in response.data
+
+    response = organizer_client.get(url, {**params, "fields": "id,ticket_types"})
+    assert set(response.data) == {"id", "ticket_types"}
+    # Nested serializers keep all their fields
+    assert "description" in response.data["ticket_types"][0]
+
+
+def test_ticket_type_fields_skip_shard_totals(organizer_client, event):
+    enable_sharding(event.ticket_types.get(name="Standard"), 2)
+    url = reverse(TICKET_TYPE_LIST, kwargs={"event_pk": event.id})
+
+    response, sql = page_query(organizer_client, url, {"fields": "name,price"})
+    assert response.data["results"][0].keys() == {"name", "price"}
+    assert "shard" not in sql
+
+    # The sharded stock is still summed when asked for
+    response = organizer_client.get(url, {"fields": "name,quantity_available"})
+    assert response.data["results"][1] == {
+        "name": "Standard",
+        "quantity_available": 10,
+    }
+
+
+def test_fieldsets_are_part_of_the_cache_key(api_client, event):
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    api_client.get(url, {"fields": "id"})
+
+    assert "name" in api_client.get(url).data
+
+
+@pytest.mark.parametrize("param", ["fields", "omit"])
+def test_unknown_fields_are_rejected(organizer_client, param):
+    response = organizer_client.get(reverse(LIST_URL), {param: "name,password"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "password" in response.data["fields"]
+
+
+def test_fieldsets_do_not_apply_to_writes(organizer_client, event_factory):
+    event = event_factory(organizer=organizer_client.user)
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+    response = organizer_client.patch(
+        f"{url}?fields=id", {"name": "Renamed"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["name"] == "Renamed"
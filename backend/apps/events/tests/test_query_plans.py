@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.common.choices import EventStatus
+from apps.events.cancellation import cancel_bookings_chunk, start_event_cancellation
+
+LIST_URL = "events:event-list"
+DETAIL_URL = "events:event-detail"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    ("params", "index"),
+    [
+        ({}, "event_start_time_id_idx"),
+        ({"status": EventStatus.CANCELLED}, "event_status_start_time_idx"),
+        ({"location": "City 7"}, "event_location_start_idx"),
+        (
+            {"status": EventStatus.CANCELLED, "ordering": "-start_time"},
+            "event_status_start_time_idx",
+        ),
+        ({"search": "jazz 424"}, "event_search_vector_idx"),
+        ({"search": "evnt 424"}, "event_name_trgm_idx"),
+        ({"expand": "ticket_types"}, "event_start_time_id_idx"),
+    ],
+    ids=[
+        "default",
+        "status",
+        "location",
+        "status-desc",
+        "search",
+        "search-typo",
+        "expand",
+    ],
+)
+def test_event_list_uses_indexes(
+    api_client, production_volumes, explain_queries, params, index
+):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse(LIST_URL), params)
+    assert response.data["results"]
+
+    plans = explain_queries(context.captured_queries)
+    assert index in plans
+    # Price range and sold-out subqueries
+    assert "ticket_type_active_price_idx" in plans
+
+
+def test_event_list_next_page_uses_indexes(
+    api_client, production_volumes, explain_queries
+):
+    first = api_client.get(reverse(LIST_URL), {"status": EventStatus.CANCELLED})
+
+    with CaptureQueriesContext(connection) as context:
+        api_client.get(first.data["next"])
+
+    assert "event_status_start_time_idx" in explain_queries(context.captured_queries)
+
+
+def test_event_detail_uses_indexes(api_client, production_volumes, explain_queries):
+    url = reverse(DETAIL_URL, kwargs={"pk": production_volumes["event"].pk})
+
+    with CaptureQueriesContext(connection) as context:
+        api_client.get(url)
+
+    explain_queries(context.captured_queries)
+
+
+def test_event_cancellation_uses_indexes(production_volumes, explain_queries):
+    with CaptureQueriesContext(connection) as context:
+        cancellation = start_event_cancellation(production_volumes["event"])
+        with transaction.atomic():
+            cancel_bookings_chunk(cancellation.pk, 100)
+
+    assert "booking_event_holding_idx" in explain_queries(context.captured_queries)
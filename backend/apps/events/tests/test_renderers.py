@@ -0,0 +1,100 @@
+import json
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+from io import StringIO
+
+import msgpack
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.renderers import MessagePackRenderer, ORJSONRenderer
+
+LIST_URL = "events:event-list"
+DETAIL_URL = "events:event-detail"
+BOOKING_CREATE_URL = "bookings:booking-create"
+
+
+DATA = {
+    "booking_reference": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "created_at": datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=UTC),
+    "total_price": Decimal("19.90"),
+    "name": "Café   night",
+    "items": [{"quantity": 2}],
+}
+
+
+def test_orjson_renders_like_drf():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    # Errors of list items are keyed by index
+    errors = {"items": {0: {"quantity": ["Invalid"]}}}
+    assert ORJSONRenderer().render(errors) == JSONRenderer().render(errors)
+
+
+def test_orjson_indent():
+    rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+    assert rendered == b'{\n  "a": 1\n}'
+
+
+def test_messagepack_encodes_like_json():
+    rendered = msgpack.unpackb(MessagePackRenderer().render(DATA))
+    assert rendered == json.loads(JSONRenderer().render(DATA))
+
+
+@pytest.mark.django_db
+def test_event_is_served_as_messagepack(api_client, event_factory):
+    event = event_factory()
+    url = reverse(DETAIL_URL, kwargs={"pk": event.id})
+
+    response = api_client.get(url, headers={"Accept": "application/msgpack"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == api_client.get(url).json()
+
+
+@pytest.mark.django_db
+def test_booking_created_from_messagepack(attendee_client, event_factory):
+    event = event_factory(with_ticket_types=[{"quantity_available": 10}])
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": event.ticket_types.get().id, "quantity": 2}],
+    }
+
+    response = attendee_client.post(
+        reverse(BOOKING_CREATE_URL),
+        msgpack.packb(payload),
+        content_type="application/msgpack",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert uuid.UUID(response.json()["booking_reference"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("content_type", "body"),
+    [("application/json", b'{"event_id": '), ("application/msgpack", b"\xc1")],
+    ids=["json", "msgpack"],
+)
+def test_malformed_body_is_rejected(attendee_client, content_type, body):
+    response = attendee_client.post(
+        reverse(BOOKING_CREATE_URL), body, content_type=content_type
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "parse error" in response.json()["detail"]
+
+
+@pytest.mark.django_db
+def test_benchmark_renderers(event_factory):
+    event_factory(with_ticket_types=2)
+    out = StringIO()
+
+    call_command("benchmark_renderers", "--repeat", "2", stdout=out)
+
+    report = out.getvalue()
+    assert "1 events" in report
+    for codec in ("json (DRF)", "orjson", "msgpack"):
+        assert codec in report
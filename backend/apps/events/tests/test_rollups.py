@@ -0,0 +1,297 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.holds import expire_holds_batch
+from apps.bookings.models import Booking
+from apps.common.choices import SalesGranularity
+from apps.events.constants import EventMessages
+from apps.events.models import EventSales, SalesBucket, TicketTypeSales
+from apps.events.rollups import SALES_COUNTERS, bucket_start
+
+CREATE_URL = "bookings:booking-create"
+BULK_URL = "bookings:booking-bulk"
+CANCEL_URL = "bookings:booking-cancel"
+STATS_URL = "events:event-stats"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def event(event_factory):
+    return event_factory(
+        total_capacity=100,
+        with_ticket_types=[
+            {"price": Decimal("10.00"), "quantity_available": 50},
+            {"price": Decimal("25.50"), "quantity_available": 50},
+        ],
+    )
+
+
+@pytest.fixture
+def tickets(event):
+    return list(event.ticket_types.order_by("pk"))
+
+
+def book(client, event, *quantities):
+    response = client.post(
+        reverse(CREATE_URL),
+        {
+            "event_id": event.id,
+            "items": [
+                {"ticket_type_id": ticket.id, "quantity": quantity}
+                for ticket, quantity in zip(
+                    event.ticket_types.order_by("pk"), quantities, strict=False
+                )
+                if quantity
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    return Booking.objects.get(booking_reference=response.data["booking_reference"])
+
+
+def counters(rollup):
+    return {name: getattr(rollup, name) for name in SALES_COUNTERS}
+
+
+def snapshot(event):
+    """
+    Every rollup row of an event, comparable across rebuilds.
+    """
+    return (
+        counters(EventSales.objects.get(event=event)),
+        {
+            row.ticket_type_id: counters(row)
+            for row in TicketTypeSales.objects.filter(event=event)
+        },
+        {
+            (row.granularity, row.start): counters(row)
+            for row in SalesBucket.objects.filter(event=event)
+        },
+    )
+
+
+def test_bucket_start():
+    moment = datetime(2026, 3, 14, 15, 9, 26, 535, tzinfo=UTC)
+    assert bucket_start(moment, SalesGranularity.HOUR) == datetime(
+        2026, 3, 14, 15, tzinfo=UTC
+    )
+    assert bucket_start(moment, SalesGranularity.DAY) == datetime(
+        2026, 3, 14, tzinfo=UTC
+    )
+
+
+def test_booking_adds_to_rollups(attendee_client, event, tickets):
+    book(attendee_client, event, 2, 1)
+    booking = book(attendee_client, event, 1)
+
+    sales = EventSales.objects.get(event=event)
+    assert (sales.bookings, sales.tickets_booked) == (2, 4)
+    assert sales.gross_revenue == Decimal("55.50")
+    assert (sales.bookings_cancelled, sales.tickets_sold) == (0, 4)
+
+    first, second = (TicketTypeSales.objects.get(ticket_type=tt) for tt in tickets)
+    assert (first.bookings, first.tickets_booked, first.gross_revenue) == (
+        2,
+        3,
+        Decimal("30.00"),
+    )
+    assert (second.bookings, second.tickets_booked, second.gross_revenue) == (
+        1,
+        1,
+        Decimal("25.50"),
+    )
+
+    for granularity in SalesGranularity.values:
+        bucket = SalesBucket.objects.get(event=event, granularity=granularity)
+        assert bucket.start == bucket_start(booking.created_at, granularity)
+        assert counters(bucket) == counters(sales)
+
+
+def test_cancel_and_expiry_add_to_cancelled(attendee_client, event):
+    cancelled = book(attendee_client, event, 2, 1)
+    expired = book(attendee_client, event, 1)
+    book(attendee_client, event, 0, 2)
+
+    response = attendee_client.put(
+        reverse(CANCEL_URL, kwargs={"booking_reference": cancelled.booking_reference})
+    )
+    assert response.status_code == status.HTTP_200_OK
+    Booking.objects.filter(pk=expired.pk).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    assert expire_holds_batch(timezone.now(), 10) == 1
+
+    sales = EventSales.objects.get(event=event)
+    assert (sales.bookings, sales.bookings_cancelled) == (3, 2)
+    assert (sales.tickets_booked, sales.tickets_cancelled) == (6, 4)
+    assert sales.tickets_sold == 2
+    assert sales.net_revenue == Decimal("51.00")
+
+
+def test_bulk_booking_adds_to_rollups(organizer_client, event, tickets):
+    event.organizer = organizer_client.user
+    event.save()
+
+    response = organizer_client.post(
+        reverse(BULK_URL),
+        {
+            "event_id": event.id,
+            "orders": [
+                {"items": [{"ticket_type_id": tickets[0].id, "quantity": 1}]},
+                {
+                    "items": [
+                        {"ticket_type_id": tickets[0].id, "quantity": 2},
+                        {"ticket_type_id": tickets[1].id, "quantity": 2},
+                    ]
+                },
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+
+    sales = EventSales.objects.get(event=event)
+    assert (sales.bookings, sales.tickets_booked) == (2, 5)
+    assert sales.gross_revenue == Decimal("81.00")
+    assert TicketTypeSales.objects.get(ticket_type=tickets[0]).bookings == 2
+
+
+def test_rebuild_matches_incremental_rollups(attendee_client, event):
+    cancelled = book(attendee_client, event, 2, 1)
+    book(attendee_client, event, 1)
+    book(attendee_client, event, 0, 3)
+    attendee_client.put(
+        reverse(CANCEL_URL, kwargs={"booking_reference": cancelled.booking_reference})
+    )
+    incremental = snapshot(event)
+
+    # Drifted and missing rows are replaced, in reads of one item at a time
+    EventSales.objects.filter(event=event).update(bookings=100)
+    SalesBucket.objects.filter(event=event).delete()
+    call_command("rebuild_sales_rollups", event.id, chunk_size=1, stdout=StringIO())
+
+    assert snapshot(event) == incremental
+
+
+def test_rebuild_buckets_by_booking_time(attendee_client, event):
+    booking = book(attendee_client, event, 1)
+    made_at = booking.created_at - timedelta(days=2)
+    Booking.objects.filter(pk=booking.pk).update(created_at=made_at)
+
+    call_command("rebuild_sales_rollups", stdout=StringIO())
+
+    (bucket,) = SalesBucket.objects.filter(
+        event=event, granularity=SalesGranularity.DAY
+    )
+    assert bucket.start == bucket_start(made_at, SalesGranularity.DAY)
+
+
+def test_rebuild_of_bookings_made_before_rollups(attendee_client, event):
+    book(attendee_client, event, 2, 1)
+    cancelled = book(attendee_client, event, 1)
+    attendee_client.put(
+        reverse(CANCEL_URL, kwargs={"booking_reference": cancelled.booking_reference})
+    )
+    incremental = snapshot(event)
+
+    for model in (EventSales, TicketTypeSales, SalesBucket):
+        model.objects.all().delete()
+    call_command("rebuild_sales_rollups", stdout=StringIO())
+
+    assert snapshot(event) == incremental
+
+
+# === Stats endpoint ===
+def stats_url(event):
+    return reverse(STATS_URL, kwargs={"pk": event.id})
+
+
+def test_stats(organizer_client, api_client_factory, attendee_factory, event_factory):
+    event = event_factory(
+        organizer=organizer_client.user,
+        total_capacity=100,
+        with_ticket_types=[{"price": Decimal("10.00"), "quantity_available": 50}],
+    )
+    attendee_client = api_client_factory()
+    attendee_client.force_authenticate(attendee_factory())
+    booking = book(attendee_client, event, 3)
+
+    response = organizer_client.get(stats_url(event))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["granularity"] == SalesGranularity.DAY
+    assert response.data["totals"]["tickets_sold"] == 3
+    assert response.data["totals"]["net_revenue"] == "30.00"
+
+    (ticket_type,) = response.data["ticket_types"]
+    assert ticket_type["name"] == event.ticket_types.get().name
+    assert ticket_type["tickets_booked"] == 3
+
+    hour = bucket_start(booking.created_at, SalesGranularity.HOUR)
+    response = organizer_client.get(
+        stats_url(event), {"granularity": "hour", "since": hour.isoformat()}
+    )
+    (bucket,) = response.data["timeline"]
+    assert bucket["start"] == hour.isoformat().replace("+00:00", "Z")
+    assert bucket["bookings"] == 1
+
+    response = organizer_client.get(
+        stats_url(event), {"granularity": "hour", "until": hour.isoformat()}
+    )
+    assert response.data["timeline"] == []
+
+
+def test_stats_of_event_without_bookings(organizer_client, event_factory):
+    event = event_factory(organizer=organizer_client.user)
+
+    response = organizer_client.get(stats_url(event))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["totals"]["bookings"] == 0
+    assert response.data["totals"]["gross_revenue"] == "0.00"
+    assert response.data["ticket_types"] == []
+    assert response.data["timeline"] == []
+
+
+def test_stats_query_count(
+    organizer_client, event_factory, booking_factory, django_assert_num_queries
+):
+    event = event_factory(organizer=organizer_client.user)
+
+    # Event, totals, ticket types, timeline: whatever the number of bookings
+    for bookings in (1, 10):
+        for _ in range(bookings):
+            booking_factory(event=event, with_items=1)
+        call_command("rebuild_sales_rollups", event.id, stdout=StringIO())
+
+        with django_assert_num_queries(4):
+            response = organizer_client.get(stats_url(event), {"granularity": "hour"})
+        assert response.data["totals"]["bookings"] == Booking.objects.count()
+
+
+def test_invalid_stats_params(organizer_client, event_factory):
+    event = event_factory(organizer=organizer_client.user)
+
+    response = organizer_client.get(stats_url(event), {"granularity": "week"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "granularity" in response.data
+
+    response = organizer_client.get(
+        stats_url(event),
+        {"since": "2026-01-02T00:00:00Z", "until": "2026-01-01T00:00:00Z"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["non_field_errors"] == [EventMessages.STATS_SINCE_AFTER_UNTIL]
+
+
+def test_stats_only_for_event_organizer(organizer_client, event_factory):
+    response = organizer_client.get(stats_url(event_factory()))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["detail"] == EventMessages.NOT_EVENT_OWNER
@@ -0,0 +1,93 @@
+import pytest
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from apps.common.choices import EventStatus
+from apps.events.models import Event
+
+LIST_URL = reverse_lazy("events:event-list")
+
+pytestmark = pytest.mark.django_db
+
+
+def search(client, text, **params):
+    response = client.get(LIST_URL, {"search": text, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return [result["name"] for result in response.data["results"]]
+
+
+@pytest.fixture
+def catalogue(event_factory):
+    for name, description in [
+        ("Jazz Night", "Live quartet"),
+        ("Summer Festival", "Rock and jazz bands all weekend"),
+        ("Rock Concert", "Guitars"),
+    ]:
+        event_factory(name=name, description=description)
+
+
+def test_search_ranks_name_above_description(api_client, catalogue):
+    assert search(api_client, "jazz") == ["Jazz Night", "Summer Festival"]
+
+
+def test_search_matches_prefixes(api_client, catalogue):
+    assert search(api_client, "fest") == ["Summer Festival"]
+    assert search(api_client, "conc gui") == ["Rock Concert"]
+
+
+def test_search_matches_all_words(api_client, catalogue):
+    assert search(api_client, "jazz rock") == ["Summer Festival"]
+
+
+def test_search_matches_stemmed_words(api_client, catalogue):
+    assert search(api_client, "concerts") == ["Rock Concert"]
+
+
+def test_search_falls_back_to_similar_names(api_client, catalogue):
+    # Typo: no full-text match, the name is within pg_trgm word similarity
+    assert search(api_client, "festivl") == ["Summer Festival"]
+
+
+def test_similar_names_rank_below_full_text_matches(api_client, event_factory):
+    event_factory(name="Fastival Night", description="")
+    event_factory(name="Summer Festival", description="")
+
+    assert search(api_client, "festival") == ["Summer Festival", "Fastival Night"]
+
+
+def test_search_ignores_query_syntax(api_client, catalogue):
+    assert search(api_client, "jazz:* | !rock & (") == ["Summer Festival"]
+    assert len(search(api_client, "!&|")) == 3
+
+
+def test_search_with_filters_and_ordering(api_client, event_factory):
+    event_factory(name="Jazz brunch", total_capacity=100)
+    event_factory(name="Jazz festival", total_capacity=500)
+    event_factory(name="Jazz night", status=EventStatus.CANCELLED)
+
+    names = search(
+        api_client, "jazz", status=EventStatus.UPCOMING, ordering="-total_capacity"
+    )
+    assert names == ["Jazz festival", "Jazz brunch"]
+
+
+def test_search_results_are_cursor_paginated(api_client, event_factory):
+    events = [event_factory(name="Jazz Night", description="") for _ in range(12)]
+
+    response = api_client.get(LIST_URL, {"search": "jazz"})
+    second = api_client.get(response.data["next"])
+
+    # Same rank, ties broken on id
+    ids = [
+        result["id"] for page in (response, second) for result in page.data["results"]
+    ]
+    assert ids == [event.id for event in reversed(events)]
+    assert second.data["next"] is None
+
+
+def test_search_vector_follows_updates(event_factory):
+    event = event_factory(name="Jazz Night", description="")
+    Event.objects.filter(pk=event.pk).update(name="Blues Night")
+
+    assert not Event.objects.search("jazz").exists()
+    assert Event.objects.search("blues").get() == event
@@ -0,0 +1,222 @@
+import threading
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from apps.bookings.models import Booking
+from apps.bookings.tests.utils import threaded_booking
+from apps.events.models import TicketType
+from apps.events.sharding import (
+    claim_shard_stock,
+    disable_sharding,
+    enable_sharding,
+    release_shard_stock,
+)
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+CANCEL_BASE = "bookings:booking-cancel"
+TICKET_TYPE_LIST = "events:event-ticket-types-list"
+
+
+def shard_stock(ticket_type):
+    return [shard.quantity_available for shard in ticket_type.shards.all()]
+
+
+@pytest.mark.django_db
+def test_enable_sharding_splits_available_stock(ticket_type_factory):
+    ticket_type = ticket_type_factory(quantity_available=10)
+
+    enable_sharding(ticket_type, 4)
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.shard_count == 4
+    assert ticket_type.quantity_available == 0
+    assert shard_stock(ticket_type) == [3, 3, 2, 2]
+
+
+@pytest.mark.django_db
+def test_disable_sharding_merges_stock_back(ticket_type_factory):
+    ticket_type = ticket_type_factory(quantity_available=10, quantity_sold=2)
+    enable_sharding(ticket_type, 3)
+    ticket_type.shards.filter(index=0).update(quantity_available=1, quantity_sold=3)
+
+    disable_sharding(ticket_type)
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.shard_count == 0
+    assert ticket_type.quantity_available == 1 + 3 + 3
+    assert ticket_type.quantity_sold == 2 + 3
+    assert not ticket_type.shards.exists()
+
+
+@pytest.mark.django_db
+def test_shard_command(ticket_type_factory):
+    ticket_type = ticket_type_factory(quantity_available=8)
+
+    call_command("shard_ticket_type", ticket_type.id, 2, stdout=None)
+    ticket_type.refresh_from_db()
+    assert shard_stock(ticket_type) == [4, 4]
+
+    call_command("shard_ticket_type", ticket_type.id, 0, stdout=None)
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 8
+
+
+@pytest.mark.django_db
+def test_ticket_type_list_sums_shards(api_client, ticket_type_factory):
+    ticket_type = ticket_type_factory(quantity_available=10, quantity_sold=1)
+    enable_sharding(ticket_type, 4)
+    ticket_type.shards.filter(index=1).update(quantity_available=1, quantity_sold=2)
+
+    url = reverse_lazy(TICKET_TYPE_LIST, kwargs={"event_pk": ticket_type.event_id})
+    response = api_client.get(url)
+
+    result = response.data["results"][0]
+    assert result["quantity_available"] == 3 + 1 + 2 + 2
+    assert result["quantity_sold"] == 1 + 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("engine", ["locking", "conditional"])
+def test_booking_claims_from_shards(
+    engine, settings, attendee_client, event_factory, ticket_type_factory
+):
+    settings.BOOKING_RESERVATION_ENGINE = engine
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=12)
+    enable_sharding(ticket_type, 3)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 3}],
+    }
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # One shard was drawn down, the ticket type row is untouched
+    assert sorted(shard_stock(ticket_type)) == [1, 4, 4]
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_available == 0
+    assert ticket_type.quantity_sold == 0
+
+
+@pytest.mark.django_db
+def test_booking_combines_draining_shards(
+    attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=6)
+    enable_sharding(ticket_type, 3)
+
+    # No single shard holds 5 tickets
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 5}],
+    }
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert sum(shard_stock(ticket_type)) == 1
+
+    payload["items"][0]["quantity"] = 2
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert f"Not enough tickets for: {ticket_type.name}." in response.data
+
+
+@pytest.mark.django_db
+def test_deactivated_ticket_type_stops_shard_claims(ticket_type_factory):
+    ticket_type = ticket_type_factory(quantity_available=6)
+    enable_sharding(ticket_type, 3)
+    ticket_type.refresh_from_db()
+
+    # Read before its event was cancelled
+    TicketType.objects.filter(pk=ticket_type.pk).update(is_active=False)
+
+    with transaction.atomic():
+        # One shard holds 2, the combined path holds 6
+        assert not claim_shard_stock(ticket_type, 1)
+        assert not claim_shard_stock(ticket_type, 5)
+    assert shard_stock(ticket_type) == [2, 2, 2]
+
+
+@pytest.mark.django_db
+def test_cancel_restocks_shards(attendee_client, event_factory, ticket_type_factory):
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=8)
+    enable_sharding(ticket_type, 2)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 3}],
+    }
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    reference = response.data["booking_reference"]
+
+    url = reverse_lazy(CANCEL_BASE, kwargs={"booking_reference": reference})
+    response = attendee_client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    assert shard_stock(ticket_type) == [4, 4]
+    assert [shard.quantity_sold for shard in ticket_type.shards.all()] == [0, 0]
+
+
+@pytest.mark.django_db
+def test_release_splits_sales_before_and_after_sharding(
+    attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=100)
+    # 2 tickets sold before sharding stay counted on the ticket type row
+    ticket_type = ticket_type_factory(
+        event=event, quantity_available=8, quantity_sold=2
+    )
+    enable_sharding(ticket_type, 2)
+
+    payload = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 3}],
+    }
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    ticket_type.refresh_from_db()
+    with transaction.atomic():
+        release_shard_stock(ticket_type, 2 + 3)
+
+    ticket_type.refresh_from_db()
+    assert ticket_type.quantity_sold == 0
+    assert [shard.quantity_sold for shard in ticket_type.shards.all()] == [0, 0]
+    assert sum(shard_stock(ticket_type)) == 10
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_bookings_never_oversell_shards(
+    attendee_factory, event_factory, ticket_type_factory, api_client
+):
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=10)
+    enable_sharding(ticket_type, 4)
+
+    data = {
+        "event_id": event.id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": 2}],
+    }
+
+    results = {}
+    threads = [
+        threading.Thread(
+            target=threaded_booking,
+            args=(attendee_factory(), data, f"user{i}", results, api_client),
+        )
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert list(results.values()).count("success") == 5
+    assert Booking.objects.count() == 5
+    assert sum(shard_stock(ticket_type)) == 0
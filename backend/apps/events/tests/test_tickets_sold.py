@@ -0,0 +1,274 @@
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from apps.bookings.constants import BookingMessages
+from apps.common.choices import BookingStatus, EventStatus
+from apps.events.constants import EventMessages
+from apps.events.models import Event, EventCounterShard, TicketType
+from apps.events.sharding import count_tickets_sold
+
+CREATE_URL = reverse_lazy("bookings:booking-create")
+CANCEL_BASE = "bookings:booking-cancel"
+DETAIL_URL = "events:event-detail"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("engine", ["locking", "conditional"])
+def test_booking_increments_tickets_sold(
+    engine, settings, attendee_client, event_factory, ticket_type_factory
+):
+    settings.BOOKING_RESERVATION_ENGINE = engine
+    event = event_factory(total_capacity=10)
+    standard = ticket_type_factory(event=event, quantity_available=10)
+    vip = ticket_type_factory(event=event, quantity_available=10)
+
+    payload = {
+        "event_id": event.id,
+        "items": [
+            {"ticket_type_id": standard.id, "quantity": 2},
+            {"ticket_type_id": vip.id, "quantity": 3},
+        ],
+    }
+
+    response = attendee_client.post(CREATE_URL, payload, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 5
+    assert event.tickets_remaining == 5
+
+
+@pytest.mark.django_db
+def test_cancel_booking_decrements_tickets_sold(attendee_client, booking_item_factory):
+    item = booking_item_factory(
+        booking__user=attendee_client.user, ticket_type__quantity_sold=3, quantity=3
+    )
+    event = item.booking.event
+    event.refresh_from_db()
+    assert event.tickets_sold == 3
+
+    url = reverse_lazy(
+        CANCEL_BASE, kwargs={"booking_reference": item.booking.booking_reference}
+    )
+    response = attendee_client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 0
+
+
+@pytest.mark.django_db
+def test_event_cancel_releases_tickets_sold(organizer_client, booking_factory):
+    booking = booking_factory(event__organizer=organizer_client.user, with_items=2)
+    event = booking.event
+
+    # The items' tickets count as sold, so cancelling can give them back
+    for item in booking.items.all():
+        TicketType.objects.filter(pk=item.ticket_type_id).update(
+            quantity_sold=item.quantity
+        )
+
+    url = reverse_lazy(DETAIL_URL, kwargs={"pk": event.id})
+    response = organizer_client.patch(
+        url, {"status": EventStatus.CANCELLED}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 0
+
+
+@pytest.mark.django_db
+def test_capacity_cannot_drop_below_tickets_sold(
+    organizer_client, booking_item_factory
+):
+    item = booking_item_factory(
+        booking__event__organizer=organizer_client.user, quantity=4
+    )
+    event = item.booking.event
+
+    url = reverse_lazy(DETAIL_URL, kwargs={"pk": event.id})
+    response = organizer_client.patch(url, {"total_capacity": 3}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert EventMessages.CAPACITY_BELOW_TICKETS_SOLD in response.data["total_capacity"]
+
+
+@pytest.mark.django_db
+def test_reconcile_tickets_sold(booking_item_factory, booking_factory, event_factory):
+    event = event_factory()
+    booking_item_factory(booking__event=event, quantity=2)
+    booking_item_factory(booking__event=event, quantity=3)
+    booking_item_factory(
+        booking__event=event, booking__status=BookingStatus.CANCELLED, quantity=4
+    )
+    untouched = event_factory()
+
+    event.tickets_sold = 0
+    event.save(update_fields=["tickets_sold"])
+
+    call_command("reconcile_tickets_sold", stdout=None)
+
+    event.refresh_from_db()
+    untouched.refresh_from_db()
+    assert event.tickets_sold == 5
+    assert untouched.tickets_sold == 0
+
+
+# === Counter shards ===
+def book(client, ticket_type, quantity):
+    payload = {
+        "event_id": ticket_type.event_id,
+        "items": [{"ticket_type_id": ticket_type.id, "quantity": quantity}],
+    }
+    return client.post(CREATE_URL, payload, format="json")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("engine", ["locking", "conditional"])
+def test_booking_within_stock_counts_on_counter_shard(
+    engine, settings, attendee_client, event_factory, ticket_type_factory
+):
+    """
+    Ticket stock fits in the capacity: the event row isn't written.
+    """
+    settings.BOOKING_RESERVATION_ENGINE = engine
+    event = event_factory(total_capacity=100)
+    ticket_type = ticket_type_factory(event=event, quantity_available=20)
+
+    with CaptureQueriesContext(connection) as context:
+        response = book(attendee_client, ticket_type, 3)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "events_event"')
+    ]
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 0
+    assert event.total_tickets_sold == 3
+
+    response = attendee_client.get(reverse_lazy(DETAIL_URL, kwargs={"pk": event.id}))
+    assert (response.data["tickets_sold"], response.data["tickets_remaining"]) == (
+        3,
+        97,
+    )
+
+
+@pytest.mark.django_db
+def test_capacity_claim_counts_counter_shards(
+    attendee_client, event_factory, ticket_type_factory
+):
+    event = event_factory(total_capacity=10)
+    ticket_type = ticket_type_factory(event=event, quantity_available=20)
+    EventCounterShard.objects.create(event=event, index=0, tickets_sold=8)
+
+    response = book(attendee_client, ticket_type, 3)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert BookingMessages.QUANTITY_EXCEED_CAPACITY in response.data
+
+    response = book(attendee_client, ticket_type, 2)
+    assert response.status_code == status.HTTP_201_CREATED
+    event.refresh_from_db()
+    assert (event.tickets_sold, event.total_tickets_sold) == (2, 10)
+
+
+@pytest.mark.django_db
+def test_release_takes_counter_shards_then_event_row(
+    attendee_client, booking_item_factory
+):
+    item = booking_item_factory(
+        booking__user=attendee_client.user, ticket_type__quantity_sold=5, quantity=5
+    )
+    event = item.booking.event
+    # 3 of the tickets counted on the row, 2 on a shard
+    Event.objects.filter(pk=event.pk).update(tickets_sold=3)
+    EventCounterShard.objects.create(event=event, index=0, tickets_sold=2)
+
+    url = reverse_lazy(
+        CANCEL_BASE, kwargs={"booking_reference": item.booking.booking_reference}
+    )
+    response = attendee_client.put(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 0
+    assert EventCounterShard.objects.get(event=event).tickets_sold == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_folds_counter_shards(booking_item_factory):
+    item = booking_item_factory(quantity=4)
+    event = item.booking.event
+    Event.objects.filter(pk=event.pk).update(tickets_sold=1)
+    EventCounterShard.objects.create(event=event, index=0, tickets_sold=3)
+
+    # In line: nothing to fix
+    call_command("reconcile_tickets_sold", event.id, stdout=StringIO())
+    assert EventCounterShard.objects.filter(event=event).exists()
+
+    EventCounterShard.objects.filter(event=event).update(tickets_sold=5)
+    call_command("reconcile_tickets_sold", event.id, stdout=StringIO())
+
+    event.refresh_from_db()
+    assert event.tickets_sold == 4
+    assert not EventCounterShard.objects.filter(event=event).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reconcile_waits_for_booking_counting_on_shard(
+    settings, booking_factory, booking_item_factory
+):
+    """
+    A booking commits its counter shard while reconcile_tickets_sold runs:
+    its tickets are neither counted twice nor dropped.
+    """
+    settings.EVENT_COUNTER_SHARDS = 1
+    item = booking_item_factory(quantity=3)
+    event = item.booking.event
+    EventCounterShard.objects.create(event=event, index=0, tickets_sold=3)
+    # Drifted, so reconcile has something to fix
+    Event.objects.filter(pk=event.pk).update(tickets_sold=1)
+
+    counted, proceed = threading.Event(), threading.Event()
+
+    def booking():
+        try:
+            with transaction.atomic():
+                booking = booking_factory(event=event, user=item.booking.user)
+                booking_item_factory(booking=booking, quantity=2)
+                count_tickets_sold(event.pk, 2)
+                counted.set()
+                proceed.wait(timeout=5)
+        finally:
+            connection.close()
+
+    def reconcile():
+        try:
+            call_command("reconcile_tickets_sold", event.id, stdout=StringIO())
+        finally:
+            connection.close()
+
+    booking_thread = threading.Thread(target=booking)
+    booking_thread.start()
+    assert counted.wait(timeout=5)
+
+    reconcile_thread = threading.Thread(target=reconcile)
+    reconcile_thread.start()
+    # Reconcile is waiting for the shard the booking holds
+    reconcile_thread.join(timeout=0.5)
+    assert reconcile_thread.is_alive()
+
+    proceed.set()
+    booking_thread.join()
+    reconcile_thread.join()
+
+    assert Event.objects.get(pk=event.pk).total_tickets_sold == 3 + 2
@@ -1,7 +1,9 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested.routers import NestedDefaultRouter
 
-from .views import EventViewSet, TicketTypeViewSet
+from .views import AsyncEventListView, EventViewSet, TicketTypeViewSet
 
 app_name = "events"
 
@@ -18,3 +20,7 @@ event_router.register(r"ticket-types", TicketTypeViewSet, basename="event-ticket
 
 # Final URL patterns
 urlpatterns = router.urls + event_router.urls
+
+# Async event list under ASGI, ahead of the router's list route
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(0, path("", AsyncEventListView.as_view(), name="event-list"))
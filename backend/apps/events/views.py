@@ -1,19 +1,98 @@
-from django.utils import timezone
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, permissions, viewsets
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
 from apps.accounts.permissions import IsOrganizer
-from apps.bookings.models import Booking
-from apps.common.choices import BookingStatus, EventStatus
+from apps.common.choices import EventStatus
+from apps.common.conditional import (
+    aggregate_validators,
+    conditional_get,
+    object_rows,
+    page_validators,
+)
+from apps.common.fieldsets import SparseFieldsetMixin
+from apps.common.pagination import KeysetPagination
+from apps.common.views import AsyncListAPIView
 from apps.events.constants import EventMessages
 
-from .models import Event, TicketType
+from .cache import cache_response
+from .cancellation import start_event_cancellation
+from .filters import EventOrderingFilter, EventSearchFilter
+from .models import Event, EventCancellation, EventSales, TicketType
 from .permissions import IsOrganizerOrReadOnly
-from .serializers import EventSerializer, TicketTypeSerializer
+from .serializers import (
+    EventCancellationSerializer,
+    EventSerializer,
+    EventStatsQuerySerializer,
+    SalesBucketSerializer,
+    SalesTotalsSerializer,
+    TicketTypeSalesSerializer,
+    TicketTypeSerializer,
+)
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventQuerysetMixin:
+    """
+    Events with the ticket summary annotations, unless ?fields=/?omit= leave
+    out the fields showing them.
+
+    ?expand=ticket_types nests the active ticket types in each event,
+    prefetched with one query for the whole page.
+    """
+
+    expandable = ["ticket_types"]
+
+    def get_expand(self):
+        names = {
+            name
+            for name in self.request.query_params.get("expand", "").split(",")
+            if name
+        }
+        unknown = names.difference(self.expandable)
+        if unknown:
+            raise ValidationError(
+                {
+                    "expand": EventMessages.INVALID_EXPAND.format(
+                        names=", ".join(sorted(unknown)),
+                        expandable=", ".join(self.expandable),
+                    )
+                }
+            )
+        return names
+
+    # Bookings counted on counter shards don't update the event row
+    validator_annotations = ["shard_tickets_sold"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.sparse_fields_need("tickets_sold", "tickets_remaining"):
+            queryset = queryset.with_tickets_sold()
+        if self.sparse_fields_need("min_price", "max_price", "is_sold_out"):
+            queryset = queryset.with_ticket_summary()
+        if "ticket_types" in self.get_expand():
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "ticket_types",
+                    queryset=TicketType.objects.filter(is_active=True)
+                    .with_shard_totals()
+                    .order_by("id"),
+                    to_attr="active_ticket_types",
+                )
+            )
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.get_expand()
+        return context
+
+
+class EventViewSet(SparseFieldsetMixin, EventQuerysetMixin, viewsets.ModelViewSet):
     """
     Handle all the CRUD logic.
 
@@ -24,32 +103,46 @@ class EventViewSet(viewsets.ModelViewSet):
     DELETE /{id}/   - Delete event by ID.
     """
 
-    queryset = Event.objects.all().order_by("created_at")
+    # Organizer and ticket summary come with the events in one statement
+    queryset = Event.objects.select_related("organizer").order_by("created_at")
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOrganizerOrReadOnly]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        EventSearchFilter,
+        EventOrderingFilter,
     ]
 
     # Simple exact-match filters
     filterset_fields = ["status", "location"]
 
-    # Free-text search
-    search_fields = ["name", "description"]
-
     # Allow sorting
     ordering_fields = ["start_time", "total_capacity", "created_at"]
 
     # Default ordering
     ordering = ["start_time"]
 
+    # Keyset pages in the ordering above, ties broken on id
+    pagination_class = KeysetPagination
+
+    # Anonymous reads come from the shared cache, availability on list pages
+    # may be up to EVENT_LIST_CACHE_TIMEOUT seconds old
+    @cache_response("EVENT_LIST_CACHE_TIMEOUT")
+    @conditional_get(page_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response("EVENT_CACHE_TIMEOUT", event_kwarg="pk")
+    @conditional_get(aggregate_validators(object_rows), last_modified=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Called on POST request."""
 
         # Set the organizer to the logged-in user on create
-        serializer.save(organizer=self.request.user)
+        event = serializer.save(organizer=self.request.user)
+        self.reload_summary(serializer, event)
 
     def perform_update(self, serializer):
         # Fetches the current event instance before the update
@@ -63,20 +156,108 @@ class EventViewSet(viewsets.ModelViewSet):
         is_cancelled = updated_event.status == EventStatus.CANCELLED
 
         if is_updated and is_cancelled:
-            now = timezone.now()
-            # Cancel related bookings
-            bookings = list(Booking.objects.filter(event=updated_event))
-            for booking in bookings:
-                booking.status = BookingStatus.CANCELLED
-                booking.cancelled_at = now
-            Booking.objects.bulk_update(bookings, ["status", "cancelled_at"])
+            # Bookings are cancelled in chunks by a background job,
+            # reported by GET /{id}/cancellation/
+            start_event_cancellation(updated_event)
+
+        self.reload_summary(serializer, updated_event)
+
+    def reload_summary(self, serializer, event):
+        """
+        Respond with the ticket summary annotations of the saved event.
+        """
+        serializer.instance = self.get_queryset().get(pk=event.pk)
+
+    @action(detail=True, methods=["get"])
+    def cancellation(self, request, pk=None):
+        """
+        Progress of cancelling the bookings of a cancelled event.
+        """
+        event = self.get_object()
+        if event.organizer != request.user:
+            raise PermissionDenied(EventMessages.NOT_EVENT_OWNER)
+
+        cancellation = get_object_or_404(EventCancellation, event=event)
+        return Response(EventCancellationSerializer(cancellation).data)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Sales of the event from its rollups: totals, per ticket type, and a
+        timeline per ?granularity=hour|day (default day) between ?since= and
+        ?until=. A few index reads whatever the number of bookings.
+        """
+        event = self.get_object()
+        if event.organizer != request.user:
+            raise PermissionDenied(EventMessages.NOT_EVENT_OWNER)
+
+        query = EventStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
 
-            # Deactivate ticket types
-            TicketType.objects.filter(event=updated_event).update(is_active=False)
+        buckets = event.sales_buckets.filter(granularity=params["granularity"])
+        if "since" in params:
+            buckets = buckets.filter(start__gte=params["since"])
+        if "until" in params:
+            buckets = buckets.filter(start__lt=params["until"])
+
+        # No rollup row until the first booking
+        totals = EventSales.objects.filter(event=event).first() or EventSales()
+        ticket_types = event.ticket_type_sales.select_related("ticket_type")
+
+        return Response(
+            {
+                "granularity": params["granularity"],
+                "totals": SalesTotalsSerializer(totals).data,
+                "ticket_types": TicketTypeSalesSerializer(
+                    ticket_types.order_by("ticket_type_id"), many=True
+                ).data,
+                "timeline": SalesBucketSerializer(
+                    buckets.order_by("start"), many=True
+                ).data,
+            }
+        )
+
+
+class AsyncEventListView(
+    SparseFieldsetMixin,
+    EventQuerysetMixin,
+    AsyncListAPIView,
+    mixins.CreateModelMixin,
+):
+    """
+    GET / and POST / of EventViewSet for the ASGI deployment.
+
+    Listing runs on the event loop, creating an event stays a sync write.
+    """
+
+    # The organizer is joined, the serializer can't load it lazily
+    queryset = EventViewSet.queryset
+    serializer_class = EventSerializer
+    permission_classes = EventViewSet.permission_classes
+    filter_backends = EventViewSet.filter_backends
+    filterset_fields = EventViewSet.filterset_fields
+    ordering_fields = EventViewSet.ordering_fields
+    ordering = EventViewSet.ordering
+    pagination_class = EventViewSet.pagination_class
+
+    perform_create = EventViewSet.perform_create
+    reload_summary = EventViewSet.reload_summary
+
+    @cache_response("EVENT_LIST_CACHE_TIMEOUT")
+    @conditional_get(page_validators)
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(self.create)(request, *args, **kwargs)
 
 
 class TicketTypeViewSet(
-    mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
+    SparseFieldsetMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
 ):
     """
     Handle ticket types for an event.
@@ -86,6 +267,8 @@ class TicketTypeViewSet(
 
     serializer_class = TicketTypeSerializer
     permission_classes = [permissions.IsAuthenticated]  # Default fallback
+    # Shard stock isn't on the ticket type rows
+    validator_annotations = ["shard_quantity_available", "shard_quantity_sold"]
 
     def get_permissions(self):
         """
@@ -99,12 +282,20 @@ class TicketTypeViewSet(
             return [permissions.IsAuthenticated(), IsOrganizer()]
         return super().get_permissions()  # fallback to permission_classes
 
+    @cache_response("EVENT_CACHE_TIMEOUT", event_kwarg="event_pk")
+    @conditional_get(aggregate_validators(lambda view: view.get_queryset()))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         """
         Return ticket types for the specific event.
         """
         event_id = self.kwargs.get("event_pk")
-        return TicketType.objects.filter(event_id=event_id).order_by("id")
+        queryset = TicketType.objects.filter(event_id=event_id).order_by("id")
+        if self.sparse_fields_need("quantity_available", "quantity_sold"):
+            queryset = queryset.with_shard_totals()
+        return queryset
 
     def get_serializer_context(self):
         """
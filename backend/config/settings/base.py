@@ -34,6 +34,8 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    # Full-text and trigram search of events
+    "django.contrib.postgres",
     # Third-party
     "rest_framework",
     "rest_framework_simplejwt",
@@ -143,7 +145,8 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     # Sets JWT auth as default method for securing endpoints
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # request.user from the access token's claims, without a user query
+        "apps.accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -152,7 +155,102 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # orjson for JSON, MessagePack for clients asking for application/msgpack
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.common.renderers.ORJSONRenderer",
+        "apps.common.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.common.parsers.ORJSONParser",
+        "apps.common.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Serve booking create/list/detail and the event list with async views.
+# Enable when running under ASGI (config.asgi with uvicorn workers)
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
+
+# Booking reservation engine used by BookingSerializer.create
+# - "locking": lock ticket types and event rows with select_for_update()
+# - "conditional": guarded UPDATE per ticket type, event lock only when needed
+# - "single_writer": one writer thread per event writes bookings in batches
+BOOKING_RESERVATION_ENGINE = config("BOOKING_RESERVATION_ENGINE", default="locking")
+
+# New bookings hold their tickets as pending until confirmed or expired
+BOOKING_HOLD_DURATION = timedelta(minutes=10)
+# Expired holds released per transaction by release_expired_holds
+BOOKING_HOLD_SWEEP_BATCH_SIZE = 500
+
+# Idempotency-Key replays are answered for IDEMPOTENCY_KEY_RETENTION after
+# the booking, then the keys are deleted by purge_idempotency_keys,
+# IDEMPOTENCY_KEY_PURGE_BATCH_SIZE per statement
+IDEMPOTENCY_KEY_RETENTION = timedelta(hours=24)
+IDEMPOTENCY_KEY_PURGE_BATCH_SIZE = 1000
+
+# Counter rows the tickets sold of an event are spread over, when its ticket
+# stock fits in its capacity (see apps.bookings.reservations)
+EVENT_COUNTER_SHARDS = 8
+
+# Cancelling an event cancels its bookings in a background thread,
+# EVENT_CANCELLATION_CHUNK_SIZE bookings per transaction
+EVENT_CANCELLATION_IN_BACKGROUND = True
+EVENT_CANCELLATION_CHUNK_SIZE = 1000
+
+# Orders accepted by one POST /api/bookings/bulk request
+BULK_BOOKING_MAX_ORDERS = 500
+
+# Booking items fetched per server-side cursor round trip, and rendered per
+# chunk, by the bookings export (GET /api/bookings/export/<event_id>)
+BOOKING_EXPORT_CHUNK_SIZE = 2000
+
+# Retry transactions that fail with a deadlock or serialization failure
+TRANSACTION_RETRY_ATTEMPTS = 3
+# Upper bound in seconds of the first jittered back-off, doubled per attempt
+TRANSACTION_RETRY_BASE_DELAY = 0.05
+
+# Single writer engine (see apps.bookings.writer)
+# Seconds a writer collects requests before writing them in one transaction
+BOOKING_WRITER_BATCH_WINDOW = 0.005
+BOOKING_WRITER_MAX_BATCH = 100
+# Seconds a request waits for its batch before giving up with 503
+BOOKING_WRITER_TIMEOUT = 10
+# Seconds without requests before a writer thread stops
+BOOKING_WRITER_IDLE_TIMEOUT = 30
+
+# Queue state of event waiting rooms (see apps.bookings.waiting_room).
+# Must be shared by all worker processes.
+WAITING_ROOM_STORE = config(
+    "WAITING_ROOM_STORE", default="apps.bookings.waiting_room.DatabaseQueueStore"
+)
+# Seconds a queue token stays valid. Queue entries of expired tokens are then
+# deleted by purge_waiting_room_entries, WAITING_ROOM_PURGE_BATCH_SIZE per
+# statement
+WAITING_ROOM_TOKEN_MAX_AGE = 60 * 60
+WAITING_ROOM_PURGE_BATCH_SIZE = 1000
+
+# Shared cache of anonymous event reads (see apps.events.cache).
+# Use a shared backend (Redis, Memcached) when running several processes.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
 }
+# Seconds an event's detail and ticket types stay cached, bookings and
+# changes to the event drop them earlier
+EVENT_CACHE_TIMEOUT = 5 * 60
+# Seconds a page of the event list stays cached. Bookings don't drop list
+# pages, so this bounds how stale their availability may be.
+EVENT_LIST_CACHE_TIMEOUT = 10
+# Seconds a user's token version stays cached. Revocations update the cache
+# right away, with a per-process cache (locmem) other processes see them
+# after at most this long.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
 
 # Configure metadata for /schema/, /swagger/ and /redoc/
 SPECTACULAR_SETTINGS = {
@@ -187,8 +285,8 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
-    "TOKEN_OBTAIN_PAIR_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_OBTAIN_SERIALIZER": "apps.accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.ClaimsTokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "TOKEN_SLIDE_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer",
@@ -5,6 +5,9 @@ DEBUG = False
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 
+# Cancel event bookings inline, so tests see them cancelled after the request
+EVENT_CANCELLATION_IN_BACKGROUND = False
+
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
 # Required for sending emails
@@ -12,3 +15,9 @@ DEFAULT_FROM_EMAIL = "no-reply@mydomain.com"
 
 # Error emails will come here
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
+
+# Reset by the queue_store fixture of the waiting room tests
+WAITING_ROOM_STORE = "apps.bookings.waiting_room.InMemoryQueueStore"
+
+# Cleared before each test by the clear_cache fixture
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
@@ -1,13 +1,56 @@
+import re
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from importlib import reload
+
 import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import F
+from django.db.models.signals import pre_migrate
+from django.dispatch import receiver
+from django.urls import clear_url_caches
+from django.utils import timezone
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
 
+from apps.accounts.models import User
 from apps.accounts.tests.factories import AttendeeFactory, OrganizerFactory, UserFactory
+from apps.bookings.models import Booking, BookingItem
 
 # Import factories
 from apps.bookings.tests.factories import BookingFactory, BookingItemFactory
+from apps.common.choices import (
+    HOLDING_BOOKING_STATUSES,
+    BookingStatus,
+    EventStatus,
+    UserRole,
+)
+from apps.events.models import Event, TicketType
 from apps.events.tests.factories import EventFactory, TicketTypeFactory
 
+
+# === Test database ===
+@receiver(pre_migrate)
+def create_extensions(using, **kwargs):
+    """
+    --nomigrations builds the tables without running the migrations, which
+    create the extensions the indexes use.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Responses cached by one test must not be served to the next.
+    """
+    cache.clear()
+
+
 # === Register the factories as fixtures ===
 # By default, the fixture name will be the lowercase class name
 
@@ -63,6 +106,187 @@ def organizer_client(organizer_factory, api_client):
     return api_client
 
 
+@pytest.fixture
+def async_views(settings):
+    """
+    Route requests to the async views, as with ASYNC_VIEWS=True under ASGI.
+    """
+    import apps.bookings.urls
+    import apps.events.urls
+    import config.urls
+
+    def reload_urls():
+        for module in (apps.bookings.urls, apps.events.urls, config.urls):
+            reload(module)
+        clear_url_caches()
+
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+# === Query plans ===
+GENRES = ["Jazz", "Rock", "Blues", "Techno", "Folk", "Opera", "Soul", "Punk"]
+
+# Tables whose sequential scans grow with the business
+SCANNED_TABLES = [
+    "events_event",
+    "events_tickettype",
+    "bookings_booking",
+    "bookings_bookingitem",
+]
+
+
+@pytest.fixture(scope="module")
+def production_volumes(django_db_setup, django_db_blocker):
+    """
+    Seed, vacuum and analyze a catalogue with production-like distributions,
+    committed for the whole module. Tests must run in a rolled back
+    transaction (not transaction=True), which would flush it.
+    Return a dict with an attendee, an organizer and an event.
+    """
+    now = timezone.now()
+    event_count, booking_count = 5000, 20000
+    event_statuses = [EventStatus.UPCOMING] * 7 + [
+        EventStatus.PAST,
+        EventStatus.SOLD_OUT,
+        EventStatus.CANCELLED,
+    ]
+    booking_statuses = [BookingStatus.CONFIRMED] * 7 + [
+        BookingStatus.PENDING,
+        BookingStatus.CANCELLED,
+        BookingStatus.EXPIRED,
+    ]
+
+    # Booking n holds 2 Standard tickets of event n % event_count. Sold
+    # counters match, so tests can release tickets.
+    def booking_status(n):
+        return booking_statuses[n % len(booking_statuses)]
+
+    sold = Counter(
+        n % event_count
+        for n in range(booking_count)
+        if booking_status(n) in HOLDING_BOOKING_STATUSES
+    )
+
+    with django_db_blocker.unblock():
+        organizers = User.objects.bulk_create(
+            User(username=f"organizer{n}", email=f"o{n}@x.io", role=UserRole.ORGANIZER)
+            for n in range(50)
+        )
+        attendees = User.objects.bulk_create(
+            User(username=f"attendee{n}", email=f"a{n}@x.io", role=UserRole.ATTENDEE)
+            for n in range(1000)
+        )
+        events = Event.objects.bulk_create(
+            Event(
+                organizer=organizers[n % len(organizers)],
+                name=f"Event {n}",
+                description=f"{GENRES[n % len(GENRES)]} night number {n}",
+                start_time=now + timedelta(hours=n),
+                location=f"City {n % 100}",
+                total_capacity=1000,
+                tickets_sold=2 * sold[n],
+                status=event_statuses[n % len(event_statuses)],
+            )
+            for n in range(event_count)
+        )
+        standard_types = TicketType.objects.bulk_create(
+            TicketType(
+                event=event,
+                name="Standard",
+                price=Decimal("20"),
+                quantity_available=500,
+                quantity_sold=2 * sold[n],
+            )
+            for n, event in enumerate(events)
+        )
+        TicketType.objects.bulk_create(
+            TicketType(
+                event=event,
+                name=name,
+                price=Decimal(price),
+                quantity_available=100,
+                is_active=is_active,
+            )
+            for event in events
+            for name, price, is_active in [("VIP", "80", True), ("Staff", "0", False)]
+        )
+        bookings = Booking.objects.bulk_create(
+            Booking(
+                user=attendees[n % len(attendees)],
+                event=events[n % event_count],
+                status=booking_status(n),
+                total_price=Decimal("40"),
+                # Holds, half of them lapsed
+                expires_at=(
+                    now + timedelta(minutes=n % 30 - 15)
+                    if booking_status(n) == BookingStatus.PENDING
+                    else None
+                ),
+            )
+            for n in range(booking_count)
+        )
+        BookingItem.objects.bulk_create(
+            BookingItem(
+                booking=booking,
+                ticket_type=standard_types[n % event_count],
+                quantity=2,
+                price_at_booking=Decimal("20"),
+            )
+            for n, booking in enumerate(bookings)
+        )
+        # A booking a minute over the last two weeks
+        Booking.objects.update(created_at=now - F("id") * timedelta(minutes=1))
+
+        # Vacuumed like production tables: autovacuum flushing the GIN pending
+        # lists halfway through the module would change the plans
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE")
+
+    yield {"attendee": attendees[0], "organizer": organizers[0], "event": events[0]}
+
+    with django_db_blocker.unblock():
+        call_command("flush", interactive=False, verbosity=0)
+
+
+@pytest.fixture
+def explain_queries():
+    """
+    Return a function that EXPLAINs the queries captured by a
+    CaptureQueriesContext, fails on sequential scans of SCANNED_TABLES and
+    returns the plans, for tests to check the indexes they use.
+
+    Plans are made with the planner's own costs on the analyzed
+    production_volumes data, so a query the planner stops serving from its
+    index fails.
+    """
+
+    def _explain(captured_queries):
+        statements = [
+            query["sql"]
+            for query in captured_queries
+            if query["sql"].startswith(("SELECT", "UPDATE", "DELETE"))
+        ]
+        assert statements, "No queries captured"
+
+        plans = []
+        for sql in statements:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {sql}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            for table in SCANNED_TABLES:
+                assert not re.search(rf"Seq Scan on {table}\b", plan), (
+                    f"{sql}\n\n{plan}"
+                )
+            plans.append(plan)
+        return "\n\n".join(plans)
+
+    return _explain
+
+
 # === SimpleJWT Specific Fixtures ===
 # @pytest.fixture
 # def expired_access_token(user_factory):